@@ -0,0 +1,115 @@
+"""
+Benchmark OCR preprocessing, speed versus accuracy on recorded frames
+
+Usage:
+    python benchmark_ocr.py --frames ./frames
+    python benchmark_ocr.py --frames ./frames --labels ./frames/labels.json
+
+Frames are screenshots (png/jpg) saved by device.save_screenshot().
+labels.json maps a file name to the texts expected on it:
+    {"home.png": ["设置", "消息", "1280"]}
+Without labels, the texts found by the baseline config are taken as expected,
+so accuracy is the recall of the baseline result.
+"""
+import argparse
+import json
+import os
+import time
+
+from module.base.utils import load_image
+from module.logger import logger
+from module.ocr.ocr import OCR
+from module.ocr.preprocess import Preprocess
+
+CONFIGS = {
+    'baseline': None,
+    'det_960': Preprocess(det_max_side=960),
+    'det_1280': Preprocess(det_max_side=1280),
+    'upscale_32': Preprocess(min_height=32),
+    'normalize': Preprocess(normalize=True),
+    'binarize': Preprocess(binarize=True),
+    'det_960+upscale_32': Preprocess(det_max_side=960, min_height=32),
+}
+
+
+def load_frames(folder):
+    """
+    Returns:
+        dict: File name to image
+    """
+    files = sorted(f for f in os.listdir(folder) if f.lower().endswith(('.png', '.jpg', '.jpeg')))
+    return {f: load_image(os.path.join(folder, f)) for f in files}
+
+
+def recall(result, expected):
+    """
+    Args:
+        result (OcrResult):
+        expected (list[str]):
+
+    Returns:
+        tuple[int, int]: Found, total
+    """
+    found = sum(1 for text in expected if result.find_one(text) is not None)
+    return found, len(expected)
+
+
+def benchmark(frames, labels=None, rounds=3):
+    """
+    Args:
+        frames (dict): File name to image
+        labels (dict): File name to expected texts, None to use baseline output
+        rounds (int): Timed runs of each frame, the first untimed run warms up
+
+    Returns:
+        list[tuple[str, float, float]]: (config, ms per frame, recall)
+    """
+    rows = []
+    baseline = {}
+    for name, preprocess in CONFIGS.items():
+        ocr = OCR(preprocess=preprocess)
+        cost = 0.
+        found = total = 0
+        for file, image in frames.items():
+            result = ocr.ocr_detail(image)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                ocr.ocr_detail(image)
+            cost += (time.perf_counter() - start) / rounds
+
+            if labels is None:
+                if name == 'baseline':
+                    baseline[file] = result.texts
+                expected = baseline[file]
+            else:
+                expected = labels.get(file, [])
+            f, t = recall(result, expected)
+            found += f
+            total += t
+
+        rows.append((name, cost / max(len(frames), 1) * 1000, found / max(total, 1)))
+        logger.info(f'{name}: {rows[-1][1]:.1f} ms/frame, recall {rows[-1][2]:.1%}')
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark OCR preprocessing')
+    parser.add_argument('--frames', required=True, help='Folder of recorded screenshots')
+    parser.add_argument('--labels', default=None, help='JSON of expected texts per file')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    labels = None
+    if args.labels:
+        with open(args.labels, encoding='utf-8') as f:
+            labels = json.load(f)
+
+    logger.hr(f'OCR preprocessing benchmark, {len(frames)} frames', level=0)
+    OCR.warmup(background=False)
+    rows = benchmark(frames, labels=labels, rounds=args.rounds)
+
+    logger.hr('Result', level=0)
+    logger.info(f'{"config":<22}{"ms/frame":>10}{"recall":>10}')
+    for name, cost, rate in rows:
+        logger.info(f'{name:<22}{cost:>10.1f}{rate:>10.1%}')
@@ -19,6 +19,8 @@ mcp = FastMCP(
 
 # 全局设备实例
 _device: Optional[Any] = None
+# 全局OCR实例，所有OCR工具共享同一个模型
+_ocr: Optional[Any] = None
 
 
 def get_device(serial: str = '127.0.0.1:5565') -> Any:
@@ -30,6 +32,23 @@ def get_device(serial: str = '127.0.0.1:5565') -> Any:
     return _device
 
 
+def get_ocr() -> Any:
+    """获取共享的OCR实例（延迟导入），模型只加载一次"""
+    global _ocr
+    if _ocr is None:
+        from module.ocr.ocr import OCR
+        _ocr = OCR()
+    return _ocr
+
+
+def on_ocr_warmup(future) -> None:
+    """OCR预热完成回调，加载失败时记录警告，其他工具不受影响"""
+    error = future.exception()
+    if error is not None:
+        from module.logger import logger
+        logger.warning(f'OCR模型加载失败，OCR工具不可用: {error}')
+
+
 @mcp.tool()
 def connect_device(serial: str = '127.0.0.1:5565') -> str:
     """
@@ -188,16 +207,13 @@ def ocr_text(serial: str = '127.0.0.1:5565', area: Optional[str] = None) -> str:
         device = get_device(serial)
         device.screenshot()
 
-        from module.ocr.ocr import OCR
-
         ocr_area = None
         if area:
             coords = [int(x.strip()) for x in area.split(',')]
             if len(coords) == 4:
                 ocr_area = tuple(coords)
 
-        ocr = OCR(area=ocr_area)
-        text = ocr.ocr(device.image)
+        text = get_ocr().ocr(device.image, area=ocr_area)
 
         return f"✅ OCR识别结果:\n{text}"
     except Exception as e:
@@ -220,27 +236,16 @@ def ocr_find_text(target_text: str, serial: str = '127.0.0.1:5565') -> str:
         device = get_device(serial)
         device.screenshot()
 
-        from paddleocr import PaddleOCR
-        import numpy as np
+        result = get_ocr().ocr_detail(device.image)
 
-        ocr_model = PaddleOCR(lang='ch', show_log=False)
-        result = ocr_model.ocr(device.image)
-
-        if not result or len(result) == 0:
+        if not result:
             return f"❌ 未在屏幕上找到任何文字"
 
-        page_result = result[0]
-
-        if isinstance(page_result, dict):
-            rec_texts = page_result.get('rec_texts', [])
-            dt_polys = page_result.get('dt_polys', [])
-
-            for i, text in enumerate(rec_texts):
-                if target_text in text or text in target_text:
-                    poly = dt_polys[i]
-                    center_x = int(np.mean([p[0] for p in poly]))
-                    center_y = int(np.mean([p[1] for p in poly]))
-                    return f"✅ 找到文字 '{target_text}'\n中心位置: ({center_x}, {center_y})\n边界框: {poly}"
+        # 模糊匹配：容忍全半角、大小写和OCR易混字符，按置信度和位置排序
+        line = result.match(target_text)
+        if line is not None:
+            center_x, center_y = line.center
+            return f"✅ 找到文字 '{target_text}' (识别为 '{line.text}')\n中心位置: ({center_x}, {center_y})\n边界框: {line.poly.astype(int).tolist()}\n置信度: {line.score:.3f}"
 
         return f"❌ 未找到文字: '{target_text}'"
     except Exception as e:
@@ -263,29 +268,18 @@ def ocr_click_text(target_text: str, serial: str = '127.0.0.1:5565') -> str:
         device = get_device(serial)
         device.screenshot()
 
-        from paddleocr import PaddleOCR
-        import numpy as np
-
-        ocr_model = PaddleOCR(lang='ch', show_log=False)
-        result = ocr_model.ocr(device.image)
+        result = get_ocr().ocr_detail(device.image)
 
-        if not result or len(result) == 0:
+        if not result:
             return f"❌ 未在屏幕上找到任何文字"
 
-        page_result = result[0]
+        # 模糊匹配：容忍全半角、大小写和OCR易混字符，按置信度和位置排序
+        line = result.match(target_text)
+        if line is not None:
+            center_x, center_y = line.center
 
-        if isinstance(page_result, dict):
-            rec_texts = page_result.get('rec_texts', [])
-            dt_polys = page_result.get('dt_polys', [])
-
-            for i, text in enumerate(rec_texts):
-                if target_text in text or text in target_text:
-                    poly = dt_polys[i]
-                    center_x = int(np.mean([p[0] for p in poly]))
-                    center_y = int(np.mean([p[1] for p in poly]))
-
-                    device.click(center_x, center_y)
-                    return f"✅ 已点击文字 '{target_text}'\n位置: ({center_x}, {center_y})"
+            device.click((center_x, center_y))
+            return f"✅ 已点击文字 '{target_text}' (识别为 '{line.text}')\n位置: ({center_x}, {center_y})"
 
         return f"❌ 未找到文字: '{target_text}'"
     except Exception as e:
@@ -372,5 +366,9 @@ if __name__ == "__main__":
     print("按Ctrl+C停止服务器")
     print("=" * 60)
 
+    # 启动时在后台加载OCR模型并预热，不阻塞服务启动
+    # OCR请求在预热完成前到达时等待预热
+    get_ocr().warmup().add_done_callback(on_ocr_warmup)
+
     # 运行HTTP服务器
     mcp.run(transport='sse')
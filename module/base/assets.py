@@ -0,0 +1,165 @@
+"""Precompiled button asset pack, loaded via memory map
+
+All button templates, areas, colors and grayscale pyramids are packed into a
+single .npy file. Worker processes load it with np.load(mmap_mode='r'), so
+pixels are shared through the OS page cache and nothing is decoded on startup.
+
+Pack layout, a 1-D uint8 array:
+    [8 bytes index length][index json][padding][pixel data]
+"""
+import json
+import os
+
+import numpy as np
+
+from module.base.button import Button
+from module.base.template import Template
+from module.logger import logger
+
+
+PACK_ALIGN = 64
+
+
+def _align(offset):
+    return (offset + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
+
+
+def compile_assets(buttons, file):
+    """Pack buttons into an asset pack.
+
+    Args:
+        buttons (list[Button]):
+        file (str): Output file, should end with .npy
+
+    Returns:
+        int: Pack size in bytes.
+
+    Raises:
+        ValueError: If two buttons have the same name, the pack is keyed by name.
+    """
+    names = [button.name for button in buttons]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f'Duplicate button names in asset pack: {duplicates}')
+
+    arrays = []
+    offset = 0
+
+    def add(array):
+        nonlocal offset
+        array = np.ascontiguousarray(array)
+        offset = _align(offset)
+        record = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+        arrays.append((offset, array))
+        offset += array.nbytes
+        return record
+
+    entries = []
+    for button in buttons:
+        entry = {
+            'name': button.name,
+            'area': list(button.area),
+            'color': [int(c) for c in button.color],
+            'button': list(button.button),
+            'search': list(button.search) if button.search is not None else None,
+            'file': button.file,
+            'image': None,
+            'pyramid': [],
+        }
+        if button.file is not None or button.image is not None:
+            template = button.template
+            entry['image'] = add(template.image)
+            entry['pyramid'] = [add(level) for level in template.pyramid]
+        entries.append(entry)
+
+    index = json.dumps({'buttons': entries}, ensure_ascii=False).encode('utf-8')
+    header = 8 + len(index)
+    data_start = _align(header)
+
+    pack = np.zeros(data_start + offset, dtype=np.uint8)
+    pack[:8] = np.frombuffer(np.uint64(len(index)).tobytes(), dtype=np.uint8)
+    pack[8:header] = np.frombuffer(index, dtype=np.uint8)
+    for start, array in arrays:
+        start += data_start
+        pack[start:start + array.nbytes] = array.reshape(-1).view(np.uint8)
+
+    np.save(file, pack)
+    logger.info(f'Compiled {len(entries)} assets into {file}, {pack.nbytes} bytes')
+    return pack.nbytes
+
+
+class AssetPack:
+    def __init__(self, file):
+        """Load an asset pack via memory map.
+
+        Button images and template pyramids are read-only views into the map.
+
+        Args:
+            file (str): Pack file from compile_assets().
+        """
+        self.file = file
+        self.data = np.load(file, mmap_mode='r')
+
+        length = int(np.frombuffer(self.data[:8].tobytes(), dtype=np.uint64)[0])
+        header = 8 + length
+        index = json.loads(self.data[8:header].tobytes().decode('utf-8'))
+        self._data_start = _align(header)
+
+        self.buttons = {}
+        for entry in index['buttons']:
+            button = self._load_button(entry)
+            self.buttons[button.name] = button
+
+    def _view(self, record):
+        start = self._data_start + record['offset']
+        shape = tuple(record['shape'])
+        # Packs compiled before dtype was recorded only hold uint8
+        dtype = np.dtype(record.get('dtype', '|u1'))
+        size = int(np.prod(shape)) * dtype.itemsize
+        return self.data[start:start + size].view(dtype).reshape(shape)
+
+    def _load_button(self, entry):
+        search = tuple(entry['search']) if entry['search'] is not None else None
+        button = Button(
+            area=tuple(entry['area']),
+            color=tuple(entry['color']),
+            button=tuple(entry['button']),
+            file=entry['file'],
+            name=entry['name'],
+            search=search,
+        )
+        if entry['image'] is not None:
+            button.image = self._view(entry['image'])
+            button._template = Template(
+                button.image, name=button.name, pyramid=[self._view(level) for level in entry['pyramid']])
+        return button
+
+    def __getitem__(self, name):
+        return self.buttons[name]
+
+    def __contains__(self, name):
+        return name in self.buttons
+
+    def __iter__(self):
+        return iter(self.buttons.values())
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def __str__(self):
+        return f'AssetPack({os.path.basename(self.file)}, {len(self)} buttons)'
+
+    __repr__ = __str__
+
+
+def load_assets(file):
+    """
+    Args:
+        file (str): Pack file from compile_assets().
+
+    Returns:
+        AssetPack:
+    """
+    pack = AssetPack(file)
+    logger.info(f'Loaded {pack}')
+    return pack
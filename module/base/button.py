@@ -2,10 +2,11 @@
 import os
 import numpy as np
 from module.base.utils import *
+from module.base.template import Template
 
 
 class Button:
-    def __init__(self, area, color=(), button=None, file=None, name=None):
+    def __init__(self, area, color=(), button=None, file=None, name=None, search=None):
         """Initialize a Button instance.
 
         Args:
@@ -18,6 +19,9 @@ class Button:
                             If None, use area as button.
             file (str): Path to template image file.
             name (str): Button name for logging.
+            search (tuple): Area to search the template in.
+                            (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+                            If None, search the whole image.
 
         Examples:
             BUTTON_START = Button(
@@ -31,7 +35,9 @@ class Button:
         self._button = button if button is not None else area
         self.file = file
         self.name = name or self._get_name()
+        self.search = search
         self.image = None
+        self._template = None
 
     def _get_name(self):
         """Get button name from file or use default"""
@@ -62,7 +68,7 @@ class Button:
         """Check if the button appears on the image.
 
         Args:
-            image (np.ndarray): Screenshot.
+            image (np.ndarray, Frame): Screenshot.
             threshold (int): Default to 10.
 
         Returns:
@@ -89,24 +95,135 @@ class Button:
         self.image = crop(image, self.area)
         return self.color
 
+    @property
+    def template(self):
+        """
+        Returns:
+            Template: Template built from `self.image`, rebuilt if image changed.
+        """
+        if self.image is None:
+            self.image = load_image(self.file)
+        if self._template is None or self._template.image is not self.image:
+            self._template = Template(self.image, name=self.name)
+        return self._template
+
     def match_template(self, image, threshold=0.85):
         """Match template on image using OpenCV.
 
         Args:
-            image (np.ndarray): Screenshot.
+            image (np.ndarray, Frame): Screenshot.
             threshold (float): Match threshold, 0-1.
 
         Returns:
             bool: True if template matched.
         """
+        return self.match(image, threshold=threshold) is not None
+
+    def match(self, image, threshold=0.85):
+        """Search template in `search` area, coarse to fine on grayscale pyramids.
+
+        Args:
+            image (np.ndarray, Frame): Screenshot.
+            threshold (float): Match threshold, 0-1.
+
+        Returns:
+            TemplateMatch: Location and score, or None if not matched.
+        """
         if self.file is None:
-            return False
+            return None
 
-        if self.image is None:
-            self.image = load_image(self.file)
+        result = self.template.match(image, area=self.search)
+        if result.score >= threshold:
+            return result
+        return None
+
+
+class ButtonSet:
+    def __init__(self, buttons):
+        """A group of buttons checked against a screenshot in one vectorized pass.
+
+        Args:
+            buttons (list[Button]):
+
+        Examples:
+            PAGE_MAIN = ButtonSet([BUTTON_START, BUTTON_SETTING, BUTTON_MAIL])
+            mask = PAGE_MAIN.appear_on(image)
+        """
+        self.buttons = list(buttons)
+        self.areas = np.array([button.area for button in self.buttons], dtype=int).reshape(-1, 4)
+        self.colors = np.array(
+            [button.color if button.color else (0, 0, 0) for button in self.buttons], dtype=float).reshape(-1, 3)
+        # Buttons without color never appear, same as Button.appear_on()
+        self.has_color = np.array([bool(button.color) for button in self.buttons], dtype=bool)
+
+    def __len__(self):
+        return len(self.buttons)
 
-        import cv2
-        result = cv2.matchTemplate(image, self.image, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    def __iter__(self):
+        return iter(self.buttons)
 
-        return max_val >= threshold
+    def __getitem__(self, item):
+        return self.buttons[item]
+
+    def __str__(self):
+        return f'ButtonSet({", ".join(str(button) for button in self.buttons)})'
+
+    __repr__ = __str__
+
+    def get_colors(self, image):
+        """Get the colors of all button areas.
+
+        Args:
+            image (np.ndarray, Frame): Screenshot.
+
+        Returns:
+            np.ndarray: Shape (n, 3), same values as get_color() on each area.
+        """
+        integral = getattr(image, 'integral', None)
+        if integral is None:
+            integral = integral_image(np.asarray(image))
+
+        h = integral.shape[0] - 1
+        w = integral.shape[1] - 1
+        x1 = np.clip(self.areas[:, 0], 0, w)
+        y1 = np.clip(self.areas[:, 1], 0, h)
+        x2 = np.clip(self.areas[:, 2], 0, w)
+        y2 = np.clip(self.areas[:, 3], 0, h)
+        count = (x2 - x1) * (y2 - y1)
+
+        total = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        total = total[:, :3]
+        colors = np.zeros(total.shape)
+        valid = count > 0
+        colors[valid] = total[valid] / count[valid, np.newaxis]
+        return colors.astype(int)
+
+    def appear_on(self, image, threshold=10):
+        """Check which buttons appear on the image.
+
+        Args:
+            image (np.ndarray, Frame): Screenshot.
+            threshold (int): Default to 10.
+
+        Returns:
+            np.ndarray: Boolean mask, shape (n,).
+        """
+        if not len(self.buttons):
+            return np.zeros(0, dtype=bool)
+        distance = np.linalg.norm(self.get_colors(image) - self.colors, axis=1)
+        return (distance < threshold) & self.has_color
+
+    def first_appear_on(self, image, threshold=10):
+        """
+        Args:
+            image (np.ndarray, Frame): Screenshot.
+            threshold (int): Default to 10.
+
+        Returns:
+            Button: The first button that appears, or None.
+        """
+        mask = self.appear_on(image, threshold=threshold)
+        index = np.flatnonzero(mask)
+        if index.size:
+            return self.buttons[index[0]]
+        return None
@@ -0,0 +1,296 @@
+"""Template matching with cached grayscale pyramids and ROI-restricted search"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from module.base.utils import load_image
+
+
+# Smallest template side kept on the coarse pyramid level
+TEMPLATE_MIN_SIZE = 16
+TEMPLATE_MAX_LEVEL = 2
+# Coarse candidates refined on the full image, so repeated UI elements
+# that look alike when downscaled are all checked
+TEMPLATE_CANDIDATES = 3
+
+
+class TemplateMatch:
+    def __init__(self, score, area):
+        """Best match of a template on an image.
+
+        Args:
+            score (float): TM_CCOEFF_NORMED score, -1 to 1.
+            area (tuple): Matched area on the full image.
+                (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+        """
+        self.score = score
+        self.area = area
+
+    @property
+    def location(self):
+        """
+        Returns:
+            tuple: Upper left (x, y) of the matched area.
+        """
+        return self.area[0], self.area[1]
+
+    @property
+    def center(self):
+        """
+        Returns:
+            tuple: Center (x, y) of the matched area.
+        """
+        return (self.area[0] + self.area[2]) // 2, (self.area[1] + self.area[3]) // 2
+
+    def __str__(self):
+        return f'TemplateMatch(score={round(self.score, 3)}, area={self.area})'
+
+    __repr__ = __str__
+
+
+def to_gray(image):
+    """
+    Args:
+        image (np.ndarray): RGB, RGBA or grayscale image.
+
+    Returns:
+        np.ndarray: Grayscale image.
+    """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(np.ascontiguousarray(image), cv2.COLOR_RGB2GRAY)
+
+
+class GrayPyramid:
+    def __init__(self, image):
+        """Grayscale pyramid of a plain screenshot array, with the same
+        `gray_pyramid(level)` as Frame, so many matches share one conversion.
+
+        Args:
+            image (np.ndarray): Screenshot, RGB, RGBA or grayscale.
+        """
+        self._pyramid = [to_gray(np.asarray(image))]
+
+    def gray_pyramid(self, level):
+        while len(self._pyramid) <= level:
+            self._pyramid.append(cv2.pyrDown(self._pyramid[-1]))
+        return self._pyramid[level]
+
+
+class Template:
+    def __init__(self, image, name='TEMPLATE', pyramid=None):
+        """A template pre-converted to a grayscale pyramid once.
+
+        Args:
+            image (np.ndarray): Template image, RGB, RGBA or grayscale.
+            name (str): Template name for logging.
+            pyramid (list[np.ndarray]): Precomputed grayscale pyramid, such as from an asset pack.
+        """
+        self.image = image
+        self.name = name
+        self.size = (image.shape[1], image.shape[0])
+
+        if pyramid is not None:
+            self.pyramid = list(pyramid)
+            return
+
+        self.pyramid = [to_gray(image)]
+        while len(self.pyramid) <= TEMPLATE_MAX_LEVEL:
+            h, w = self.pyramid[-1].shape
+            if min(h, w) // 2 < TEMPLATE_MIN_SIZE:
+                break
+            self.pyramid.append(cv2.pyrDown(self.pyramid[-1]))
+
+    @classmethod
+    def from_file(cls, file, name=None):
+        image = load_image(file)
+        return cls(image, name=name or file)
+
+    @property
+    def level(self):
+        """Coarsest pyramid level available"""
+        return len(self.pyramid) - 1
+
+    def __str__(self):
+        return f'Template({self.name})'
+
+    __repr__ = __str__
+
+    def match(self, image, area=None, level=None):
+        """Search the template in an area of the image, coarse to fine.
+
+        Results are cached on the frame, so repeated searches for the same
+        template and area on one frame only compute once.
+
+        Args:
+            image (np.ndarray, Frame): Screenshot in RGB.
+            area (tuple): Region of interest to search in, whole image if None.
+                (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+            level (int): Pyramid level of the coarse pass, 0 to disable it.
+                Default to the coarsest level the template allows.
+
+        Returns:
+            TemplateMatch: Best match, score is -1 if template doesn't fit the area.
+        """
+        cache = getattr(image, 'cache', None)
+        key = ('template', self, area, level)
+        if cache is not None and key in cache:
+            return cache[key]
+
+        result = self._match(image, area=area, level=level)
+        if cache is not None:
+            cache[key] = result
+        return result
+
+    def _match(self, image, area=None, level=None):
+        if not hasattr(image, 'gray_pyramid'):
+            image = GrayPyramid(image)
+        gray_pyramid = image.gray_pyramid
+
+        full = gray_pyramid(0)
+        height, width = full.shape
+        if area is None:
+            area = (0, 0, width, height)
+        x1, y1, x2, y2 = area
+        x1, y1 = max(x1, 0), max(y1, 0)
+        x2, y2 = min(x2, width), min(y2, height)
+        tw, th = self.size
+        if x2 - x1 < tw or y2 - y1 < th:
+            return TemplateMatch(-1., (x1, y1, x1 + tw, y1 + th))
+
+        level = self.level if level is None else min(level, self.level)
+        windows = [(x1, y1, x2, y2)]
+        if level > 0:
+            # Coarse pass on the downscaled ROI
+            scale = 2 ** level
+            coarse = gray_pyramid(level)[y1 // scale:y2 // scale, x1 // scale:x2 // scale]
+            template = self.pyramid[level]
+            if coarse.shape[0] >= template.shape[0] and coarse.shape[1] >= template.shape[1]:
+                result = cv2.matchTemplate(coarse, template, cv2.TM_CCOEFF_NORMED)
+                # Fine pass around the coarse candidates only
+                margin = scale * 2
+                windows = []
+                for loc in self._candidates(result, template.shape):
+                    cx = (x1 // scale + loc[0]) * scale
+                    cy = (y1 // scale + loc[1]) * scale
+                    window = (max(cx - margin, x1), max(cy - margin, y1),
+                              min(cx + tw + margin, x2), min(cy + th + margin, y2))
+                    if window[2] - window[0] >= tw and window[3] - window[1] >= th:
+                        windows.append(window)
+                if not windows:
+                    windows = [(x1, y1, x2, y2)]
+
+        best = None
+        for wx1, wy1, wx2, wy2 in windows:
+            result = cv2.matchTemplate(full[wy1:wy2, wx1:wx2], self.pyramid[0], cv2.TM_CCOEFF_NORMED)
+            _, score, _, loc = cv2.minMaxLoc(result)
+            if best is None or score > best.score:
+                x, y = wx1 + loc[0], wy1 + loc[1]
+                best = TemplateMatch(float(score), (x, y, x + tw, y + th))
+        return best
+
+    @staticmethod
+    def _candidates(result, shape, count=TEMPLATE_CANDIDATES):
+        """
+        Args:
+            result (np.ndarray): Coarse matchTemplate scores, modified in place.
+            shape (tuple): (height, width) of the coarse template.
+            count (int): Max candidates.
+
+        Returns:
+            list[tuple]: (x, y) of the best peaks, at least half a template apart.
+        """
+        th, tw = shape[0] // 2, shape[1] // 2
+        candidates = []
+        for _ in range(count):
+            _, score, _, loc = cv2.minMaxLoc(result)
+            if candidates and score <= -1:
+                break
+            candidates.append(loc)
+            # Suppress the peak, so the next candidate is another element
+            x, y = loc
+            result[max(y - th, 0):y + th + 1, max(x - tw, 0):x + tw + 1] = -1
+        return candidates
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def template_pool():
+    """
+    Returns:
+        ThreadPoolExecutor: Shared pool sized to the cores, cv2.matchTemplate
+            releases the GIL so searches run in parallel.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='template')
+        return _pool
+
+
+def _prepare(image, buttons):
+    """Build templates and frame pyramids in the calling thread,
+    so workers only read shared state.
+
+    Returns:
+        list[Template]:
+    """
+    templates = [button.template for button in buttons]
+    if not hasattr(image, 'gray_pyramid'):
+        image = GrayPyramid(image)
+    image.gray_pyramid(max([template.level for template in templates], default=0))
+    return image, templates
+
+
+def match_templates(image, buttons):
+    """Search many templates on a thread pool.
+
+    Args:
+        image (np.ndarray, Frame): Screenshot.
+        buttons (list[Button]): Buttons with template, each searched in its `search` area.
+
+    Returns:
+        list[TemplateMatch]: Best match of each button, in the same order.
+    """
+    image, templates = _prepare(image, buttons)
+    futures = [
+        template_pool().submit(template.match, image, area=button.search)
+        for button, template in zip(buttons, templates)
+    ]
+    return [future.result() for future in futures]
+
+
+def match_first_template(image, buttons, threshold=0.85):
+    """Search many templates on a thread pool, and stop at the first match.
+
+    Searches not yet started are cancelled once any template matches.
+
+    Args:
+        image (np.ndarray, Frame): Screenshot.
+        buttons (list[Button]): Buttons with template.
+        threshold (float): Match threshold, 0-1.
+
+    Returns:
+        tuple[Button, TemplateMatch]: The first button matched and its match, in completion order.
+            None if nothing matched.
+    """
+    image, templates = _prepare(image, buttons)
+    futures = {
+        template_pool().submit(template.match, image, area=button.search): button
+        for button, template in zip(buttons, templates)
+    }
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            if result.score >= threshold:
+                return futures[future], result
+    finally:
+        for future in futures:
+            future.cancel()
+    return None
@@ -92,18 +92,66 @@ def get_color(image, area):
     Get the color of a button area.
 
     Args:
-        image: Screenshot. (np.ndarray)
+        image: Screenshot. (np.ndarray, or Frame which uses its summed-area table)
         area: (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y).
 
     Returns:
         tuple: (r, g, b)
     """
+    integral = getattr(image, 'integral', None)
+    if integral is not None:
+        return get_color_integral(integral, area)
+
     temp = crop(image, area)
     color = cv2.mean(temp)[:3]
     color = tuple(np.array(color).astype(int))
     return color
 
 
+def integral_image(image):
+    """
+    Summed-area table of the first 3 channels, for get_color_integral().
+
+    Sums are int32, half the memory of float64, which holds uint8 images up to 8.4M pixels.
+    Larger images fall back to float64.
+
+    Args:
+        image (np.ndarray): Shape (h, w, channel), uint8.
+
+    Returns:
+        np.ndarray: Shape (h + 1, w + 1, 3)
+    """
+    image = np.ascontiguousarray(image[:, :, :3])
+    sdepth = cv2.CV_32S if image.shape[0] * image.shape[1] * 255 < 2 ** 31 else cv2.CV_64F
+    return cv2.integral(image, sdepth=sdepth)
+
+
+def get_color_integral(integral, area):
+    """
+    Get the color of a button area in constant time.
+
+    Args:
+        integral: Summed-area table of the screenshot, shape (h + 1, w + 1, channel),
+            from integral_image().
+        area: (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y).
+
+    Returns:
+        tuple: (r, g, b)
+    """
+    h = integral.shape[0] - 1
+    w = integral.shape[1] - 1
+    x1, y1, x2, y2 = area
+    # Clip the same way as slicing does
+    x1, x2 = limit_in(x1, 0, w), limit_in(x2, 0, w)
+    y1, y2 = limit_in(y1, 0, h), limit_in(y2, 0, h)
+    count = (x2 - x1) * (y2 - y1)
+    if count <= 0:
+        return 0, 0, 0
+
+    total = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+    return tuple(int(c) for c in total[:3] / count)
+
+
 def color_similar(color1, color2, threshold=10):
     """
     Check if two colors are similar.
@@ -0,0 +1,93 @@
+"""Circuit breaker of device backends"""
+import threading
+import time
+
+from module.logger import logger
+
+
+class CircuitBreaker:
+    """Health of a backend shared by clicks, swipes and screenshots.
+
+    closed: backend is used.
+    open: backend failed `threshold` times in a row and is skipped
+        until `cooldown` seconds have passed.
+    half_open: cooldown passed, a single action probes the backend,
+        success closes the breaker and failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    # Consecutive failures that open the breaker
+    threshold = 3
+    # Seconds an open breaker waits before a probe
+    cooldown = 30.0
+
+    def __init__(self, name, threshold=None, cooldown=None):
+        """
+        Args:
+            name (str): Backend name
+            threshold (int): See CircuitBreaker.threshold
+            cooldown (float): See CircuitBreaker.cooldown
+        """
+        self.name = name
+        if threshold is not None:
+            self.threshold = threshold
+        if cooldown is not None:
+            self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.fail_streak = 0
+        self.success = 0
+        self.failure = 0
+        self.opened_at = 0.
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Check if an action may use this backend now.
+        An allowed action must report back with record_success() or record_failure().
+
+        Returns:
+            bool: True if closed, or if this action is the probe of a cooled down breaker
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.cooldown:
+                logger.info(f'{self.name} circuit half open, probing')
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or another action is probing
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.success += 1
+            self.fail_streak = 0
+            if self.state != self.CLOSED:
+                logger.info(f'{self.name} circuit closed')
+                self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failure += 1
+            self.fail_streak += 1
+            if self.state == self.HALF_OPEN or \
+                    (self.state == self.CLOSED and self.fail_streak >= self.threshold):
+                logger.warning(f'{self.name} circuit open for {self.cooldown}s '
+                               f'after {self.fail_streak} failures')
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+    def to_dict(self):
+        return {
+            'state': self.state,
+            'success': self.success,
+            'failure': self.failure,
+            'fail_streak': self.fail_streak,
+        }
+
+    def __str__(self):
+        return f'CircuitBreaker({self.name}, {self.state}, fail_streak={self.fail_streak})'
+
+    __repr__ = __str__
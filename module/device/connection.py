@@ -1,16 +1,21 @@
 """ADB connection management"""
+import threading
 import time
+import uuid
 from functools import wraps
 
 import uiautomator2 as u2
 from adbutils import AdbClient, AdbDevice
 from adbutils.errors import AdbError
 
+from module.device.breaker import CircuitBreaker
 from module.logger import logger
 from module.exception import *
 
 
 RETRY_TRIES = 3
+# Seconds an exec stream may stay silent, so a stalled `screencap` does not block forever
+EXEC_OUT_TIMEOUT = 10.
 
 
 def retry(func):
@@ -42,7 +47,71 @@ def retry(func):
     return retry_wrapper
 
 
+class ShellSession:
+    def __init__(self, stream):
+        """A long-lived `sh` on the device. Commands are written to its stdin and
+        their output is framed by a unique sentinel line, so short commands
+        like `input tap` skip ADB connection setup.
+
+        Args:
+            stream (socket.socket): Stream of `exec:sh`
+        """
+        self.stream = stream
+        self._buffer = bytearray()
+        self._token = uuid.uuid4().hex[:8]
+        self._count = 0
+
+    def run(self, cmd, timeout=None):
+        """
+        Args:
+            cmd (str): Shell command, run in a subshell, stdin is /dev/null and stderr is merged into stdout
+            timeout (float): Seconds to wait for the command to finish, None to block
+
+        Returns:
+            tuple[str, int]: Output and exit code
+
+        Raises:
+            ConnectionResetError: If the shell exited
+            socket.timeout: If command did not finish in time, the session is then unusable
+        """
+        self._count += 1
+        sentinel = f'__MU_{self._token}_{self._count}__'
+        # Subshell, so `cd`, `export` or `exit` in one command never leak into the next
+        script = f'( {cmd}\n) </dev/null 2>&1; printf "\\n{sentinel} %d\\n" $?\n'
+        marker = f'\n{sentinel} '.encode()
+
+        self.stream.settimeout(timeout)
+        self.stream.sendall(script.encode('utf-8'))
+        start = 0
+        while True:
+            index = self._buffer.find(marker, start)
+            if index >= 0:
+                end = self._buffer.find(b'\n', index + len(marker))
+                if end >= 0:
+                    break
+            # Marker may be split across chunks
+            start = max(len(self._buffer) - len(marker), 0)
+            chunk = self.stream.recv(65536)
+            if not chunk:
+                raise ConnectionResetError('Shell session closed by device')
+            self._buffer += chunk
+
+        output = bytes(self._buffer[:index]).decode('utf-8', errors='replace')
+        code = int(self._buffer[index + len(marker):end])
+        del self._buffer[:end + 1]
+        return output, code
+
+    def close(self):
+        try:
+            self.stream.close()
+        except Exception:
+            pass
+
+
 class Connection:
+    # Backend name to CircuitBreaker, kept across reconnects so a failing backend stays open
+    _breakers = None
+
     def __init__(self, serial='127.0.0.1:5565'):
         """
         Initialize ADB connection
@@ -54,6 +123,11 @@ class Connection:
         self.adb_client = None
         self.adb = None
         self.u2 = None
+        # Persistent shell, opened on first adb_shell() and reset on reconnect
+        self._shell = None
+        self._shell_lock = threading.Lock()
+        # False if device does not take stdin on exec:, adb_shell() then opens a stream per command
+        self.shell_session_available = True
 
         # Connect
         self.adb_connect()
@@ -61,6 +135,7 @@ class Connection:
 
     def adb_connect(self):
         """Connect to ADB device"""
+        self._close_shell()
         try:
             # Initialize ADB client
             self.adb_client = AdbClient(host="127.0.0.1", port=5037)
@@ -95,20 +170,118 @@ class Connection:
             raise
 
     @retry
-    def adb_shell(self, cmd):
-        """Execute ADB shell command
+    def adb_shell(self, cmd, timeout=None):
+        """Execute ADB shell command on the persistent shell session
 
         Args:
             cmd (str, list): Command to execute
+            timeout (float): Seconds to wait for the command, None to block until it finishes.
+                A timed out command is retried, only set it on idempotent commands.
 
         Returns:
             str: Command output
         """
         if isinstance(cmd, list):
             cmd = ' '.join(cmd)
+        return self._adb_shell(cmd, timeout=timeout)
+
+    def _adb_shell(self, cmd, timeout=None):
+        """Run once without retry, for commands that must not run twice
+
+        Args:
+            cmd (str):
+            timeout (float): Seconds to wait for the command, None to block until it finishes
+
+        Returns:
+            str: Command output
+        """
+        if not self.shell_session_available:
+            return self.adb.shell(cmd, timeout=timeout)
 
-        result = self.adb.shell(cmd)
-        return result
+        with self._shell_lock:
+            if self._shell is None:
+                try:
+                    # Handshake is bounded by EXEC_OUT_TIMEOUT, each command then sets its own timeout
+                    self._shell = ShellSession(self._exec_out('sh'))
+                except AdbError as e:
+                    logger.warning(f'Persistent shell unavailable, using one stream per command: {e}')
+                    self.shell_session_available = False
+                    return self.adb.shell(cmd, timeout=timeout)
+            try:
+                output, _ = self._shell.run(cmd, timeout=timeout)
+            except Exception:
+                # Stream state is unknown, open a new session on retry
+                self._shell.close()
+                self._shell = None
+                raise
+        return output.rstrip()
+
+    def breaker(self, name):
+        """
+        Args:
+            name (str): Backend, 'uiautomator2' or 'adb'
+
+        Returns:
+            CircuitBreaker: Shared by clicks, swipes and screenshots on this backend
+        """
+        if self._breakers is None:
+            self._breakers = {}
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name)
+        return breaker
+
+    def breaker_stats(self):
+        """
+        Returns:
+            dict: Backend name to its breaker state and counters
+        """
+        return {name: breaker.to_dict() for name, breaker in (self._breakers or {}).items()}
+
+    def _close_shell(self):
+        with self._shell_lock:
+            if self._shell is not None:
+                self._shell.close()
+                self._shell = None
+
+    @retry
+    def adb_exec_out(self, cmd, timeout=EXEC_OUT_TIMEOUT):
+        """Open a raw exec-out stream, like `adb exec-out <cmd>`
+
+        Unlike `adb_shell`, the output is binary safe and is not buffered,
+        caller reads from the stream and closes it.
+
+        Args:
+            cmd (str, list): Command to execute
+            timeout (float): Seconds a read on the stream may wait, None to block
+
+        Returns:
+            socket.socket: Stream connected to command stdout,
+                reads raise socket.timeout if the command stalls
+        """
+        if isinstance(cmd, list):
+            cmd = ' '.join(cmd)
+        return self._exec_out(cmd, timeout=timeout)
+
+    def _exec_out(self, cmd, timeout=EXEC_OUT_TIMEOUT):
+        """
+        Args:
+            cmd (str):
+            timeout (float): Seconds the handshake and each later read may wait, None to block
+
+        Returns:
+            socket.socket: Stream connected to command stdin and stdout
+        """
+        stream = self.adb_client._connect(timeout=timeout)
+        try:
+            stream.send_command(f'host:transport:{self.serial}')
+            stream.check_okay()
+            stream.send_command(f'exec:{cmd}')
+            stream.check_okay()
+        except Exception:
+            stream.close()
+            raise
+        return stream.conn
 
     def is_connected(self):
         """Check if device is connected"""
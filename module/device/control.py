@@ -1,10 +1,14 @@
 """Device control methods"""
 import time
+from contextlib import contextmanager
+
 import numpy as np
 
 from module.logger import logger
 from module.base.utils import random_rectangle_point, ensure_time
 from module.base.timer import Timer
+from module.device.sendevent import Touchscreen
+from module.device.trajectory import human_trajectory
 
 
 def point2str(x, y):
@@ -15,6 +19,102 @@ def point2str(x, y):
 class Control:
     """Device control methods"""
 
+    # Shell commands collected inside `with batch()`, None if not batching
+    _batch = None
+    # 'uiautomator2', falls back to ADB `input` on failure
+    # 'sendevent', raw events written to the touchscreen, falls back to the above
+    control_method = 'uiautomator2'
+    # Touchscreen found on first sendevent action
+    _touchscreen = None
+    # Generator of swipe paths, set np.random.default_rng(seed) to reproduce them
+    swipe_rng = None
+
+    @property
+    def touchscreen(self):
+        """
+        Returns:
+            Touchscreen: Touch device and axis ranges, discovered once.
+                Orientation is re-read when the last screenshot does not match it,
+                or on every action if there is no screenshot yet.
+        """
+        if self._touchscreen is None:
+            self._touchscreen = Touchscreen.from_device(self.adb_shell)
+            return self._touchscreen
+        image = getattr(self, 'image', None)
+        if image is None or (image.shape[1], image.shape[0]) != self._touchscreen.screen_size:
+            self._touchscreen.refresh_orientation(self.adb_shell)
+        return self._touchscreen
+
+    @contextmanager
+    def batch(self):
+        """Collect clicks, swipes, key events and sleeps, then run them
+        as one shell script in a single round trip.
+
+        Random points and durations are decided when each action is called,
+        so jitter from ensure_time() is kept. Nested batches join the outer one.
+        Nothing is sent if the block raises. The script is sent once without retry,
+        if sending fails the error is raised and some actions may have been applied.
+
+        Examples:
+            with device.batch():
+                for cell in grid:
+                    device.click(cell)
+                    device.sleep((0.1, 0.2))
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+            actions = self._batch
+        finally:
+            self._batch = None
+        self._flush_batch(actions)
+
+    def _flush_batch(self, actions):
+        """Send the script once, it is never retried, since a script that failed
+        halfway may already have run some of its input.
+
+        Args:
+            actions (list[tuple[str, float]]): Shell command and the seconds it takes
+
+        Raises:
+            Exception: If sending failed, actions before the failure may have been applied
+        """
+        if not actions:
+            return
+        logger.info(f'Batch {len(actions)} actions, {sum(cost for _, cost in actions):.3f}s')
+        script = '\n'.join(cmd for cmd, _ in actions)
+        self._adb_shell(script)
+
+    def _dispatch(self, action, uiautomator2, adb):
+        """Run an action on uiautomator2, or straight on ADB while the
+        uiautomator2 circuit is open, so a dead ATX agent costs no HTTP timeout.
+
+        Args:
+            action (str): Name for logging
+            uiautomator2 (callable): Action on uiautomator2
+            adb (callable): Action on ADB, the last resort
+        """
+        breaker = self.breaker('uiautomator2')
+        if breaker.allow():
+            try:
+                uiautomator2()
+                breaker.record_success()
+                return
+            except Exception as e:
+                breaker.record_failure()
+                logger.warning(f'uiautomator2 {action} failed: {e}, trying ADB')
+
+        breaker = self.breaker('adb')
+        try:
+            adb()
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
     def click(self, button, control_name='CLICK'):
         """Click a button or point
 
@@ -41,12 +141,25 @@ class Control:
         x, y = int(x), int(y)
         logger.info(f'Click {point2str(x, y)} @ {name}')
 
+        if self._batch is not None:
+            if self.control_method == 'sendevent':
+                self._batch.append((self.touchscreen.tap(x, y), 0.05))
+            else:
+                self._batch.append((f'input tap {x} {y}', 0.))
+            return
+
         # Execute click
-        try:
-            self._click_uiautomator2(x, y)
-        except Exception as e:
-            logger.warning(f'uiautomator2 click failed: {e}, trying ADB')
-            self._click_adb(x, y)
+        if self.control_method == 'sendevent':
+            try:
+                self._click_sendevent(x, y)
+                return
+            except Exception as e:
+                logger.warning(f'sendevent click failed: {e}, trying uiautomator2')
+        self._dispatch(
+            'click',
+            lambda: self._click_uiautomator2(x, y),
+            lambda: self._click_adb(x, y),
+        )
 
     def _click_uiautomator2(self, x, y):
         """Click using uiautomator2"""
@@ -56,6 +169,10 @@ class Control:
         """Click using ADB input tap"""
         self.adb_shell(f'input tap {x} {y}')
 
+    def _click_sendevent(self, x, y):
+        """Click by writing raw touch events"""
+        self.adb_shell(self.touchscreen.tap(x, y))
+
     def long_click(self, button, duration=1.0, control_name='LONG_CLICK'):
         """Long click a button or point
 
@@ -81,6 +198,17 @@ class Control:
         duration = ensure_time(duration)
         logger.info(f'Long click {point2str(x, y)} @ {name}, duration={duration}s')
 
+        if self.control_method == 'sendevent':
+            script = self.touchscreen.tap(x, y, hold=duration)
+            if self._batch is not None:
+                self._batch.append((script, duration))
+                return
+            try:
+                self.adb_shell(script)
+                return
+            except Exception as e:
+                logger.warning(f'sendevent long click failed: {e}, trying swipe')
+
         # Execute long click using swipe
         self.swipe((x, y), (x, y), duration=duration, name=name)
 
@@ -105,21 +233,69 @@ class Control:
 
         logger.info(f'{name} {point2str(*p1)} -> {point2str(*p2)}, duration={duration}s')
 
-        try:
-            self._swipe_uiautomator2(p1, p2, duration)
-        except Exception as e:
-            logger.warning(f'uiautomator2 swipe failed: {e}, trying ADB')
-            self._swipe_adb(p1, p2, duration)
+        if self._batch is not None:
+            if self.control_method == 'sendevent':
+                self._batch.append((self.touchscreen.swipe(self._swipe_path(p1, p2, duration), duration), duration))
+            else:
+                self._batch.append(
+                    (f'input swipe {p1[0]} {p1[1]} {p2[0]} {p2[1]} {int(duration * 1000)}', duration))
+            return
+
+        if self.control_method == 'sendevent':
+            try:
+                self._swipe_sendevent(p1, p2, duration)
+                return
+            except Exception as e:
+                logger.warning(f'sendevent swipe failed: {e}, trying uiautomator2')
+        self._dispatch(
+            'swipe',
+            lambda: self._swipe_uiautomator2(p1, p2, duration),
+            lambda: self._swipe_adb(p1, p2, duration),
+        )
 
     def _swipe_uiautomator2(self, p1, p2, duration):
-        """Swipe using uiautomator2"""
-        self.u2.swipe(p1[0], p1[1], p2[0], p2[1], duration)
+        """Swipe along a human-like path using uiautomator2, in one request"""
+        # swipe_points() injects int(segment * 200) steps of 5ms per segment,
+        # so segments are whole steps or the truncation makes the swipe faster
+        steps = 2
+        segments = max(int(round(duration * 200 / steps)), 1)
+        points = self._swipe_path(p1, p2, segments * steps / 200, interval=steps / 200)
+        self.u2.swipe_points(points.round().astype(int).tolist(), (steps + 0.5) / 200)
 
     def _swipe_adb(self, p1, p2, duration):
         """Swipe using ADB input swipe"""
         duration_ms = int(duration * 1000)
         self.adb_shell(f'input swipe {p1[0]} {p1[1]} {p2[0]} {p2[1]} {duration_ms}')
 
+    def _swipe_path(self, p1, p2, duration, interval=0.01):
+        """
+        Returns:
+            np.ndarray: Shape (n, 2), human-like path from p1 to p2, one point every `interval` seconds
+        """
+        path = human_trajectory(p1, p2, duration, interval=interval, rng=self.swipe_rng)
+        # A bend near the screen edge must not leave the screen
+        size = self._screen_size()
+        if size is None:
+            return np.clip(path, 0, None)
+        return np.clip(path, 0, np.subtract(size, 1))
+
+    def _screen_size(self):
+        """
+        Returns:
+            tuple: (width, height) in screenshot coordinates, None if unknown
+        """
+        image = getattr(self, 'image', None)
+        if image is not None:
+            return image.shape[1], image.shape[0]
+        if self._touchscreen is not None:
+            return self._touchscreen.screen_size
+        return None
+
+    def _swipe_sendevent(self, p1, p2, duration):
+        """Swipe by writing raw touch events"""
+        script = self.touchscreen.swipe(self._swipe_path(p1, p2, duration), duration)
+        self.adb_shell(script)
+
     def swipe_vector(self, vector, box=(0, 0, 1920, 1080), duration=0.2, name='SWIPE'):
         """Swipe with a vector within a box
 
@@ -158,12 +334,28 @@ class Control:
         """
         self.swipe(p1, p2, duration=duration, name=name)
 
+    def keyevent(self, key, name='KEYEVENT'):
+        """Send a key event
+
+        Args:
+            key (int, str): Key code or name, e.g. 4 or 'KEYCODE_BACK'
+            name (str): Name for logging
+        """
+        logger.info(f'{name} {key}')
+        if self._batch is not None:
+            self._batch.append((f'input keyevent {key}', 0.))
+            return
+        self.adb_shell(f'input keyevent {key}')
+
     def sleep(self, seconds):
-        """Sleep for a specified time
+        """Sleep for a specified time, or queue the sleep on the device inside batch()
 
         Args:
             seconds (float, tuple): Sleep duration or range (min, max)
         """
         seconds = ensure_time(seconds)
         if seconds > 0:
+            if self._batch is not None:
+                self._batch.append((f'sleep {seconds}', seconds))
+                return
             time.sleep(seconds)
@@ -1,10 +1,24 @@
 """Main Device class integrating connection, screenshot, and control"""
+from module.base.button import ButtonSet
 from module.device.connection import Connection
-from module.device.screenshot import Screenshot
+from module.device.screenshot import Frame, Screenshot
 from module.device.control import Control
 from module.logger import logger
 
 
+def _button_set(buttons):
+    """
+    Args:
+        buttons (ButtonSet, list[Button]):
+
+    Returns:
+        ButtonSet:
+    """
+    if isinstance(buttons, ButtonSet):
+        return buttons
+    return ButtonSet(buttons)
+
+
 class Device(Connection, Screenshot, Control):
     """Main device class for mobile automation
 
@@ -14,15 +28,23 @@ class Device(Connection, Screenshot, Control):
     - Control: Touch and swipe controls
     """
 
-    def __init__(self, serial='127.0.0.1:5565'):
+    def __init__(self, serial='127.0.0.1:5565', ocr_warmup=False):
         """
         Initialize device
 
         Args:
             serial (str): Device serial, e.g. '127.0.0.1:5565'
+            ocr_warmup (bool): Load OCR model in background while connecting,
+                readiness is in `self.ocr_ready`
         """
         logger.hr('Device Init', level=0)
 
+        # Start first, model loading overlaps with device connection
+        self.ocr_ready = None
+        if ocr_warmup:
+            from module.ocr.ocr import OCR
+            self.ocr_ready = OCR.warmup()
+
         # Initialize connection
         Connection.__init__(self, serial=serial)
 
@@ -47,7 +69,46 @@ class Device(Connection, Screenshot, Control):
         if self.image is None:
             self.screenshot()
 
-        return button.appear_on(self.image, threshold=threshold)
+        return button.appear_on(self._current_frame(), threshold=threshold)
+
+    def _current_frame(self):
+        """
+        Returns:
+            Frame: Frame of `self.image`, shared by all checks on it
+        """
+        if self.frame is None or self.frame.image is not self.image:
+            self.frame = Frame(self.image, frame_id=self.image_id, timestamp=self.image_time)
+        return self.frame
+
+    def appear_any(self, buttons, threshold=10):
+        """Check buttons in one vectorized pass and get the first that appears
+
+        Args:
+            buttons (ButtonSet, list[Button]):
+            threshold (int): Color similarity threshold
+
+        Returns:
+            Button: The first button that appears, or None
+        """
+        if self.image is None:
+            self.screenshot()
+
+        return _button_set(buttons).first_appear_on(self._current_frame(), threshold=threshold)
+
+    def appear_all(self, buttons, threshold=10):
+        """Check if all buttons appear on screen
+
+        Args:
+            buttons (ButtonSet, list[Button]):
+            threshold (int): Color similarity threshold
+
+        Returns:
+            bool: True if all buttons appear
+        """
+        if self.image is None:
+            self.screenshot()
+
+        return bool(_button_set(buttons).appear_on(self._current_frame(), threshold=threshold).all())
 
     def appear_then_click(self, button, threshold=10, interval=0.5):
         """Check if button appears and click it
@@ -88,6 +149,30 @@ class Device(Connection, Screenshot, Control):
 
         return False
 
+    def wait_until_any_appear(self, buttons, timeout=10, interval=1.0):
+        """Wait until any of the buttons appears, with one screenshot per check
+
+        Args:
+            buttons (ButtonSet, list[Button]):
+            timeout (float): Max wait time in seconds
+            interval (float): Check interval in seconds
+
+        Returns:
+            Button: The first button that appeared, or None if timeout
+        """
+        from module.base.timer import Timer
+
+        buttons = _button_set(buttons)
+        timer = Timer(timeout).start()
+        while not timer.reached():
+            self.screenshot()
+            button = self.appear_any(buttons)
+            if button is not None:
+                return button
+            self.sleep(interval)
+
+        return None
+
     def wait_until_appear_then_click(self, button, timeout=10, interval=1.0):
         """Wait until button appears and click it
 
@@ -1,26 +1,349 @@
 """Screenshot methods"""
 import io
+import struct
+import threading
 import time
+from collections import deque
+from functools import cached_property
+
+import cv2
 import numpy as np
 from PIL import Image
 
+from module.base.utils import get_color_integral, integral_image
 from module.logger import logger
 from module.exception import ScreenshotError
 
 
+# `screencap` raw header: width, height, pixel format
+RAW_HEADER_SIZE = 12
+# RGBA_8888, RGBX_8888
+RAW_PIXEL_FORMATS = (1, 2)
+
+
+def _recv_into(stream, buffer):
+    """Receive from socket until buffer is full or stream closed
+
+    Args:
+        stream (socket.socket):
+        buffer (bytearray):
+
+    Returns:
+        int: Bytes received
+    """
+    view = memoryview(buffer)
+    received = 0
+    while received < len(buffer):
+        n = stream.recv_into(view[received:])
+        if not n:
+            break
+        received += n
+    return received
+
+
+def _recv_exactly(stream, buffer):
+    """Receive until buffer is full
+
+    Raises:
+        ScreenshotError: If stream closed early
+    """
+    received = _recv_into(stream, buffer)
+    if received < len(buffer):
+        raise ScreenshotError(f'Stream closed after {received}/{len(buffer)} bytes')
+    return bytes(buffer)
+
+
+class Frame:
+    """A screenshot with lazily memoized derived views.
+
+    Derived representations are computed on first access and cached on the
+    frame, so checking dozens of buttons on the same frame converts once.
+    """
+
+    def __init__(self, image, frame_id=0, timestamp=0., color='RGB'):
+        """
+        Args:
+            image (np.ndarray): Pixels, shape (height, width, channel)
+            frame_id (int): Sequence number of the screenshot
+            timestamp (float): Capture time
+            color (str): Channel order, 'RGB' or 'BGR'
+        """
+        self.image = image
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self.color = color
+        # Per-frame results of consumers, such as template matches
+        self.cache = {}
+        self._pyramid = [image]
+        self._gray_pyramid = []
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def size(self):
+        """
+        Returns:
+            tuple: (width, height)
+        """
+        return self.image.shape[1], self.image.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None:
+            return self.image.astype(dtype)
+        return self.image
+
+    def __getitem__(self, item):
+        return self.image[item]
+
+    def crop(self, area):
+        """
+        Args:
+            area: (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y).
+
+        Returns:
+            np.ndarray: View of the area, not copied.
+        """
+        x1, y1, x2, y2 = area
+        return self.image[y1:y2, x1:x2]
+
+    @cached_property
+    def rgb(self):
+        """Pixels in RGB order without alpha channel"""
+        image = self.image[:, :, :3]
+        if self.color == 'BGR':
+            image = image[:, :, ::-1]
+        return np.ascontiguousarray(image)
+
+    @cached_property
+    def gray(self):
+        return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY)
+
+    @cached_property
+    def hsv(self):
+        return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2HSV)
+
+    @cached_property
+    def integral(self):
+        """Summed-area table of the first 3 channels in `color` order,
+        shape (height + 1, width + 1, 3)
+        """
+        return integral_image(self.image)
+
+    def get_color(self, area):
+        """Mean color of an area in O(1), see `get_color_integral`
+
+        Returns:
+            tuple: (r, g, b)
+        """
+        return get_color_integral(self.integral, area)
+
+    @property
+    def half(self):
+        return self.pyramid(1)
+
+    def pyramid(self, level):
+        """
+        Args:
+            level (int): 0 for the original image, each level halves the size
+
+        Returns:
+            np.ndarray:
+        """
+        while len(self._pyramid) <= level:
+            self._pyramid.append(cv2.pyrDown(self._pyramid[-1]))
+        return self._pyramid[level]
+
+    def gray_pyramid(self, level):
+        """Same as `pyramid` but on `gray`"""
+        if not self._gray_pyramid:
+            self._gray_pyramid.append(self.gray)
+        while len(self._gray_pyramid) <= level:
+            self._gray_pyramid.append(cv2.pyrDown(self._gray_pyramid[-1]))
+        return self._gray_pyramid[level]
+
+    def __str__(self):
+        return f'Frame(id={self.frame_id}, size={self.size})'
+
+    __repr__ = __str__
+
+
+class ScreenshotBackend:
+    """Success rate and rolling latency of a screenshot method"""
+
+    # Seconds before a demoted backend is probed again, doubled on each failure
+    backoff_base = 2.0
+    backoff_max = 120.0
+    # Seconds before a healthy backend is measured again
+    probe_interval = 30.0
+
+    def __init__(self, name, method, transport='adb', window=50):
+        """
+        Args:
+            name (str): Backend name
+            method (str): Name of the Screenshot method, which returns
+                np.ndarray or None
+            transport (str): 'uiautomator2' or 'adb', whose circuit breaker is shared with control
+            window (int): Amount of latency samples kept
+        """
+        self.name = name
+        self.method = method
+        self.transport = transport
+        self.latency = deque(maxlen=window)
+        self.success = 0
+        self.failure = 0
+        self.fail_streak = 0
+        self.demoted_until = 0.
+        self.last_used = 0.
+
+    @property
+    def total(self):
+        return self.success + self.failure
+
+    @property
+    def success_rate(self):
+        return self.success / self.total if self.total else 0.
+
+    @property
+    def p50(self):
+        return float(np.percentile(self.latency, 50)) if self.latency else None
+
+    @property
+    def p95(self):
+        return float(np.percentile(self.latency, 95)) if self.latency else None
+
+    def demoted(self, now=None):
+        """Check if backend is demoted and not yet due for a probe"""
+        now = time.time() if now is None else now
+        return self.demoted_until > now
+
+    def probe_due(self, now=None):
+        """Check if backend should be tried on this frame regardless of rank,
+        either never measured, demoted with backoff expired, or stale
+        """
+        now = time.time() if now is None else now
+        if self.demoted_until:
+            return self.demoted_until <= now
+        return now - self.last_used > self.probe_interval
+
+    def record_success(self, latency):
+        self.latency.append(latency)
+        self.success += 1
+        self.fail_streak = 0
+        self.demoted_until = 0.
+        self.last_used = time.time()
+
+    def record_failure(self):
+        self.failure += 1
+        self.fail_streak += 1
+        backoff = min(self.backoff_base * 2 ** (self.fail_streak - 1), self.backoff_max)
+        self.last_used = time.time()
+        self.demoted_until = self.last_used + backoff
+
+    def to_dict(self):
+        return {
+            'success': self.success,
+            'failure': self.failure,
+            'success_rate': round(self.success_rate, 3),
+            'p50': self.p50,
+            'p95': self.p95,
+            'demoted': self.demoted(),
+        }
+
+    def __str__(self):
+        p50 = f'{self.p50 * 1000:.1f}ms' if self.latency else '-'
+        return f'ScreenshotBackend({self.name}, p50={p50}, success={self.success}/{self.total})'
+
+    __repr__ = __str__
+
+
 class Screenshot:
     """Screenshot management"""
 
     _screenshot_interval = 0.3
     _screenshot_last = 0
+    _screenshot_backends = None
+    # Backend used on the last successful screenshot
+    screenshot_backend = None
     image = None
+    # `image` wrapped with its derived views
+    frame = None
+    # Capture time and sequence number of `image`
+    image_time = 0.
+    image_id = 0
+
+    # Continuous capture
+    capture_timeout = 10.
+    _capture_thread = None
+    _capture_stop = None
+    _capture_condition = None
+    _capture_latest = None
+    # Last exception of the capture thread, None after a successful capture
+    _capture_error = None
+
+    # (name, method, transport), in default priority order
+    SCREENSHOT_METHODS = [
+        ('uiautomator2', '_screenshot_uiautomator2', 'uiautomator2'),
+        ('uiautomator2_raw', '_screenshot_uiautomator2_raw', 'uiautomator2'),
+        ('adb_raw', '_screenshot_adb_raw', 'adb'),
+        ('adb', '_screenshot_adb', 'adb'),
+    ]
+
+    @property
+    def screenshot_backends(self):
+        """
+        Returns:
+            dict[str, ScreenshotBackend]:
+        """
+        if self._screenshot_backends is None:
+            self._screenshot_backends = {
+                name: ScreenshotBackend(name, method, transport)
+                for name, method, transport in self.SCREENSHOT_METHODS}
+        return self._screenshot_backends
+
+    def screenshot_stats(self):
+        """
+        Returns:
+            dict: Backend name to its stats, in routing order
+        """
+        return {backend.name: backend.to_dict() for backend in self._screenshot_route()}
+
+    def _screenshot_route(self):
+        """Order backends for the next screenshot.
+
+        Backends due for a probe go first, then healthy ones by p50 latency,
+        then demoted ones as a last resort.
+
+        Returns:
+            list[ScreenshotBackend]:
+        """
+        now = time.time()
+        backends = list(self.screenshot_backends.values())
+        probe = [b for b in backends if b.probe_due(now)]
+        healthy = [b for b in backends if not b.demoted(now) and b not in probe]
+        healthy.sort(key=lambda b: b.p50 if b.latency else float('inf'))
+        demoted = [b for b in backends if b.demoted(now)]
+        # Probe at most one backend per frame
+        return probe[:1] + healthy + probe[1:] + demoted
 
-    def screenshot(self):
+    def screenshot(self, max_staleness=None):
         """Take a screenshot
 
+        If continuous capture is running, return the latest frame from the
+        capture thread instead of capturing.
+
+        Args:
+            max_staleness (float): Only in continuous capture mode.
+                Wait until the latest frame is captured within this many seconds.
+                If None, return the latest frame whatever its age.
+
         Returns:
             np.ndarray: Screenshot image
         """
+        if self.capturing:
+            return self._screenshot_latest(max_staleness)
+
         # Rate limiting
         now = time.time()
         if now - self._screenshot_last < self._screenshot_interval:
@@ -28,27 +351,161 @@ class Screenshot:
 
         self._screenshot_last = time.time()
 
-        # Try different screenshot methods
-        try:
-            # Method 1: uiautomator2 screenshot
-            image = self._screenshot_uiautomator2()
+        image = self._screenshot_capture()
+        self.image_id += 1
+        self.image_time = self._screenshot_last
+        self.image = image
+        self.frame = Frame(image, frame_id=self.image_id, timestamp=self.image_time)
+        return image
+
+    def _screenshot_capture(self):
+        """Capture once, routing to the fastest healthy backend.
+        Backends whose transport circuit is open are skipped,
+        and only tried if all others failed.
+
+        Returns:
+            np.ndarray: Screenshot image
+
+        Raises:
+            ScreenshotError: If all backends failed
+        """
+        skipped = []
+        for backend in self._screenshot_route():
+            if not self.breaker(backend.transport).allow():
+                skipped.append(backend)
+                continue
+            image = self._screenshot_try(backend)
             if image is not None:
-                self.image = image
                 return image
-        except Exception as e:
-            logger.warning(f'uiautomator2 screenshot failed: {e}')
 
-        try:
-            # Method 2: ADB screenshot
-            image = self._screenshot_adb()
+        for backend in skipped:
+            image = self._screenshot_try(backend)
             if image is not None:
-                self.image = image
                 return image
-        except Exception as e:
-            logger.warning(f'ADB screenshot failed: {e}')
 
         raise ScreenshotError('All screenshot methods failed')
 
+    def _screenshot_try(self, backend):
+        """
+        Args:
+            backend (ScreenshotBackend):
+
+        Returns:
+            np.ndarray: Screenshot image, or None if failed
+        """
+        breaker = self.breaker(backend.transport)
+        start = time.perf_counter()
+        try:
+            image = getattr(self, backend.method)()
+        except Exception as e:
+            logger.warning(f'{backend.name} screenshot failed: {e}')
+            image = None
+
+        if image is None:
+            backend.record_failure()
+            breaker.record_failure()
+            return None
+
+        backend.record_success(time.perf_counter() - start)
+        breaker.record_success()
+        if self.screenshot_backend != backend.name:
+            logger.debug(f'Screenshot backend: {backend.name}')
+            self.screenshot_backend = backend.name
+        return image
+
+    @property
+    def capturing(self):
+        """Check if continuous capture is running"""
+        return self._capture_thread is not None and self._capture_thread.is_alive()
+
+    def start_capture(self, interval=0.):
+        """Start continuous capture on a background thread.
+
+        The thread keeps the latest frame slot filled, so `screenshot()`
+        returns immediately and detection overlaps with capture.
+
+        Args:
+            interval (float): Minimum seconds between two captures.
+                Default to 0, capture as fast as the backend allows.
+        """
+        if self.capturing:
+            return
+        self._capture_stop = threading.Event()
+        self._capture_condition = threading.Condition()
+        self._capture_latest = None
+        self._capture_error = None
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, args=(interval, self._capture_stop),
+            name='screenshot-capture', daemon=True)
+        self._capture_thread.start()
+        logger.info('Continuous capture started')
+
+    def stop_capture(self):
+        """Stop continuous capture and wait for the thread to exit"""
+        if self._capture_thread is None:
+            return
+        self._capture_stop.set()
+        self._capture_thread.join()
+        self._capture_thread = None
+        if self._capture_latest is not None:
+            self.image_id = max(self.image_id, self._capture_latest.frame_id)
+        logger.info('Continuous capture stopped')
+
+    def _capture_loop(self, interval, stop):
+        frame_id = self.image_id
+        while not stop.is_set():
+            start = time.time()
+            try:
+                image = self._screenshot_capture()
+            except Exception as e:
+                # Any error must keep the thread alive, consumers get it on timeout
+                logger.warning(f'Continuous capture failed: {e!r}')
+                self._capture_error = e
+                stop.wait(1.)
+                continue
+
+            self._capture_error = None
+
+            frame_id += 1
+            frame = Frame(image, frame_id=frame_id, timestamp=start)
+            with self._capture_condition:
+                self._capture_latest = frame
+                self._capture_condition.notify_all()
+            stop.wait(max(interval - (time.time() - start), 0))
+
+    def _screenshot_latest(self, max_staleness=None):
+        """Get the latest frame of continuous capture
+
+        Args:
+            max_staleness (float):
+
+        Returns:
+            np.ndarray: Screenshot image
+
+        Raises:
+            ScreenshotError: If no fresh frame within `capture_timeout`,
+                chained to the last error of the capture thread
+        """
+        def fresh():
+            if self._capture_latest is None:
+                return False
+            if max_staleness is None:
+                return True
+            return time.time() - self._capture_latest.timestamp <= max_staleness
+
+        with self._capture_condition:
+            if not self._capture_condition.wait_for(fresh, timeout=self.capture_timeout):
+                error = self._capture_error
+                raise ScreenshotError(f'No fresh frame from continuous capture in {self.capture_timeout}s, '
+                                      f'last error: {error!r}') from error
+            frame = self._capture_latest
+
+        self.frame = frame
+        self.image = frame.image
+        self.image_time = frame.timestamp
+        self.image_id = frame.frame_id
+        return frame.image
+
     def _screenshot_uiautomator2(self):
         """Screenshot using uiautomator2
 
@@ -68,6 +525,63 @@ class Screenshot:
             logger.debug(f'uiautomator2 screenshot error: {e}')
             return None
 
+    def _screenshot_uiautomator2_raw(self):
+        """Screenshot using uiautomator2, decoding the raw jpeg with OpenCV
+
+        Returns:
+            np.ndarray: Screenshot image
+        """
+        try:
+            data = self.u2.screenshot(format='raw')
+            if not data:
+                return None
+
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                return None
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        except Exception as e:
+            logger.debug(f'uiautomator2 raw screenshot error: {e}')
+            return None
+
+    def _screenshot_adb_raw(self):
+        """Screenshot using raw `adb exec-out screencap`
+
+        Pixels are streamed in a single round trip without PNG encoding,
+        and wrapped with np.frombuffer without copying.
+
+        Returns:
+            np.ndarray: Screenshot image, an RGB view over the received buffer
+        """
+        try:
+            stream = self.adb_exec_out('screencap')
+            try:
+                header = _recv_exactly(stream, bytearray(RAW_HEADER_SIZE))
+                width, height, pixel_format = struct.unpack('<III', header)
+                if pixel_format not in RAW_PIXEL_FORMATS:
+                    raise ScreenshotError(f'Unsupported screencap pixel format: {pixel_format}')
+
+                # Android 9+ appends a colorspace field to the header
+                size = width * height * 4
+                buffer = bytearray(size + 4)
+                received = _recv_into(stream, buffer)
+            finally:
+                stream.close()
+
+            if received == size + 4:
+                offset = 4
+            elif received == size:
+                offset = 0
+            else:
+                raise ScreenshotError(f'Incomplete screencap data: {received}/{size} bytes')
+
+            image = np.frombuffer(buffer, dtype=np.uint8, count=size, offset=offset)
+            image = image.reshape((height, width, 4))
+            return image[:, :, :3]
+        except Exception as e:
+            logger.debug(f'ADB raw screenshot error: {e}')
+            return None
+
     def _screenshot_adb(self):
         """Screenshot using ADB screencap
 
@@ -0,0 +1,314 @@
+"""Touch input by writing raw input events to the touchscreen device"""
+import re
+
+import numpy as np
+
+from module.logger import logger
+
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+SYN_REPORT = 0x00
+SYN_MT_REPORT = 0x02
+BTN_TOUCH = 0x14a
+ABS_MT_SLOT = 0x2f
+ABS_MT_TOUCH_MAJOR = 0x30
+ABS_MT_POSITION_X = 0x35
+ABS_MT_POSITION_Y = 0x36
+ABS_MT_TRACKING_ID = 0x39
+ABS_MT_PRESSURE = 0x3a
+
+# Octal escape of every byte, printf on device turns them back to binary
+_OCTAL = np.array([f'\\{b:03o}' for b in range(256)])
+
+
+def parse_getevent(output):
+    """
+    Args:
+        output (str): Output of `getevent -p`
+
+    Returns:
+        list[dict]: Devices, each with 'path', 'name', 'keys' (set[int])
+            and 'abs' ({code: (min, max)})
+    """
+    devices = []
+    device = None
+    section = None
+    for line in output.splitlines():
+        res = re.match(r'add device \d+: (\S+)', line)
+        if res:
+            device = {'path': res.group(1), 'name': '', 'keys': set(), 'abs': {}}
+            devices.append(device)
+            section = None
+            continue
+        if device is None:
+            continue
+        res = re.match(r'\s*name:\s*"(.*)"', line)
+        if res:
+            device['name'] = res.group(1)
+            continue
+        res = re.match(r'\s*([A-Z]+) \(([0-9a-f]{4})\):(.*)', line)
+        if res:
+            section = res.group(1)
+            line = res.group(3)
+        elif not line.startswith(' ' * 8):
+            section = None
+            continue
+        if section == 'KEY':
+            device['keys'].update(int(code, 16) for code in re.findall(r'\b([0-9a-f]{4})\b', line))
+        elif section == 'ABS':
+            res = re.search(r'([0-9a-f]{4})\s*: value -?\d+, min (-?\d+), max (-?\d+)', line)
+            if res:
+                device['abs'][int(res.group(1), 16)] = (int(res.group(2)), int(res.group(3)))
+    return devices
+
+
+def read_orientation(shell):
+    """
+    Args:
+        shell (callable): Runs a shell command on device and returns its output
+
+    Returns:
+        int: Display rotation, 0 to 3 in 90 degree steps
+    """
+    res = re.search(r'SurfaceOrientation:\s*(\d)', shell('dumpsys input | grep SurfaceOrientation'))
+    return int(res.group(1)) if res else 0
+
+
+class Touchscreen:
+    def __init__(self, path, abs_ranges, keys=(), size=(1080, 1920), orientation=0, abi64=True):
+        """Touchscreen found once per device, with its axis ranges cached.
+        Orientation follows the display, see refresh_orientation().
+        Touches are built as numpy event arrays and rendered into one shell script
+        that writes raw input events, skipping the JVM start of `input tap`.
+
+        Args:
+            path (str): Device file, such as /dev/input/event2
+            abs_ranges (dict): {code: (min, max)} of ABS axes
+            keys (set[int]): Supported key codes
+            size (tuple): Display size in natural orientation (width, height)
+            orientation (int): Display rotation, 0 to 3 in 90 degree steps
+            abi64 (bool): True if input_event has 64-bit timeval
+        """
+        self.path = path
+        self.abs_ranges = abs_ranges
+        self.keys = set(keys)
+        self.size = size
+        self.orientation = orientation
+        self.type_b = ABS_MT_TRACKING_ID in abs_ranges
+        self.event_dtype = np.dtype([
+            ('sec', '<i8' if abi64 else '<i4'),
+            ('usec', '<i8' if abi64 else '<i4'),
+            ('type', '<u2'),
+            ('code', '<u2'),
+            ('value', '<i4'),
+        ])
+        self._tracking_id = 0
+
+    def __str__(self):
+        return f'Touchscreen({self.path}, size={self.size}, orientation={self.orientation})'
+
+    __repr__ = __str__
+
+    @classmethod
+    def from_device(cls, shell):
+        """
+        Args:
+            shell (callable): Runs a shell command on device and returns its output
+
+        Returns:
+            Touchscreen:
+
+        Raises:
+            RuntimeError: If no multi-touch device found
+        """
+        devices = [
+            d for d in parse_getevent(shell('getevent -p'))
+            if ABS_MT_POSITION_X in d['abs'] and ABS_MT_POSITION_Y in d['abs']
+        ]
+        if not devices:
+            raise RuntimeError('No multi-touch input device found')
+        device = devices[0]
+
+        # Override size is what apps and screenshots see
+        output = shell('wm size')
+        sizes = re.findall(r'(\d+)x(\d+)', output)
+        size = tuple(int(v) for v in sizes[-1]) if sizes else (1080, 1920)
+        orientation = read_orientation(shell)
+        abi64 = '64' in shell('getprop ro.product.cpu.abi')
+
+        touchscreen = cls(device['path'], device['abs'], keys=device['keys'],
+                          size=size, orientation=orientation, abi64=abi64)
+        logger.info(f'Found {touchscreen}, name="{device["name"]}"')
+        return touchscreen
+
+    def refresh_orientation(self, shell):
+        """Re-read display rotation, device and axis ranges stay as found
+
+        Args:
+            shell (callable): Runs a shell command on device and returns its output
+
+        Returns:
+            bool: True if orientation changed
+        """
+        orientation = read_orientation(shell)
+        if orientation == self.orientation:
+            return False
+        logger.info(f'Touchscreen orientation {self.orientation} -> {orientation}')
+        self.orientation = orientation
+        return True
+
+    @property
+    def screen_size(self):
+        """
+        Returns:
+            tuple: (width, height) in the current orientation, as screenshots see it
+        """
+        width, height = self.size
+        return (height, width) if self.orientation % 2 else (width, height)
+
+    def to_axis(self, points):
+        """Map screen points to touchscreen axis values
+
+        Args:
+            points (np.ndarray): Shape (n, 2), (x, y) on screenshot
+
+        Returns:
+            np.ndarray: Shape (n, 2), int
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        width, height = self.size
+        x, y = points[:, 0], points[:, 1]
+        # Screenshot coordinates back to the natural orientation
+        if self.orientation == 1:
+            x, y = width - y, x
+        elif self.orientation == 2:
+            x, y = width - x, height - y
+        elif self.orientation == 3:
+            x, y = y, height - x
+        x_min, x_max = self.abs_ranges[ABS_MT_POSITION_X]
+        y_min, y_max = self.abs_ranges[ABS_MT_POSITION_Y]
+        ax = x_min + x / width * (x_max - x_min)
+        ay = y_min + y / height * (y_max - y_min)
+        return np.stack([
+            np.clip(np.round(ax), x_min, x_max),
+            np.clip(np.round(ay), y_min, y_max),
+        ], axis=1).astype(np.int64)
+
+    def _mid(self, code):
+        low, high = self.abs_ranges[code]
+        return (low + high) // 2
+
+    def down(self, point):
+        """
+        Args:
+            point (np.ndarray): Axis values (x, y)
+
+        Returns:
+            np.ndarray: Shape (n, 3), (type, code, value) of one frame
+        """
+        events = []
+        if self.type_b:
+            if ABS_MT_SLOT in self.abs_ranges:
+                events.append((EV_ABS, ABS_MT_SLOT, 0))
+            self._tracking_id = (self._tracking_id + 1) % 0x7fff
+            events.append((EV_ABS, ABS_MT_TRACKING_ID, self._tracking_id))
+        if BTN_TOUCH in self.keys:
+            events.append((EV_KEY, BTN_TOUCH, 1))
+        events.append((EV_ABS, ABS_MT_POSITION_X, int(point[0])))
+        events.append((EV_ABS, ABS_MT_POSITION_Y, int(point[1])))
+        for code in (ABS_MT_TOUCH_MAJOR, ABS_MT_PRESSURE):
+            if code in self.abs_ranges:
+                events.append((EV_ABS, code, self._mid(code)))
+        if not self.type_b:
+            events.append((EV_SYN, SYN_MT_REPORT, 0))
+        events.append((EV_SYN, SYN_REPORT, 0))
+        return np.array(events, dtype=np.int64)
+
+    def moves(self, points):
+        """
+        Args:
+            points (np.ndarray): Shape (n, 2), axis values
+
+        Returns:
+            np.ndarray: Shape (n, k, 3), one frame per point
+        """
+        n = len(points)
+        columns = [
+            np.stack([np.full(n, EV_ABS), np.full(n, ABS_MT_POSITION_X), points[:, 0]], axis=1),
+            np.stack([np.full(n, EV_ABS), np.full(n, ABS_MT_POSITION_Y), points[:, 1]], axis=1),
+        ]
+        if not self.type_b:
+            columns.append(np.tile([EV_SYN, SYN_MT_REPORT, 0], (n, 1)))
+        columns.append(np.tile([EV_SYN, SYN_REPORT, 0], (n, 1)))
+        return np.stack(columns, axis=1).astype(np.int64)
+
+    def up(self):
+        """
+        Returns:
+            np.ndarray: Shape (n, 3), (type, code, value) of one frame
+        """
+        events = []
+        if self.type_b:
+            events.append((EV_ABS, ABS_MT_TRACKING_ID, -1))
+        if BTN_TOUCH in self.keys:
+            events.append((EV_KEY, BTN_TOUCH, 0))
+        if not self.type_b:
+            events.append((EV_SYN, SYN_MT_REPORT, 0))
+        events.append((EV_SYN, SYN_REPORT, 0))
+        return np.array(events, dtype=np.int64)
+
+    def encode(self, events):
+        """
+        Args:
+            events (np.ndarray): Shape (n, 3), (type, code, value)
+
+        Returns:
+            str: printf format writing the raw input_event structs
+        """
+        data = np.zeros(len(events), dtype=self.event_dtype)
+        data['type'] = events[:, 0]
+        data['code'] = events[:, 1]
+        data['value'] = events[:, 2]
+        return ''.join(_OCTAL[np.frombuffer(data.tobytes(), dtype=np.uint8)])
+
+    def render(self, frames):
+        """
+        Args:
+            frames (list[tuple[np.ndarray, float]]): Events of each frame and the seconds to wait after it
+
+        Returns:
+            str: Shell script
+        """
+        lines = [f'exec 3>{self.path}']
+        for events, wait in frames:
+            lines.append(f"printf '{self.encode(events)}' >&3")
+            if wait > 0:
+                lines.append(f'sleep {wait:.3f}')
+        lines.append('exec 3>&-')
+        return '\n'.join(lines)
+
+    def tap(self, x, y, hold=0.05):
+        """
+        Returns:
+            str: Shell script
+        """
+        point = self.to_axis([(x, y)])[0]
+        return self.render([(self.down(point), hold), (self.up(), 0)])
+
+    def swipe(self, points, duration):
+        """
+        Args:
+            points (np.ndarray): Shape (n, 2), path on screenshot, at least 2 points
+            duration (float): Seconds from the first point to the last
+
+        Returns:
+            str: Shell script
+        """
+        points = self.to_axis(points)
+        interval = duration / max(len(points) - 1, 1)
+        frames = [(self.down(points[0]), interval)]
+        frames += [(events, interval) for events in self.moves(points[1:])]
+        frames[-1] = (frames[-1][0], 0)
+        frames.append((self.up(), 0))
+        return self.render(frames)
@@ -0,0 +1,42 @@
+"""Human-like swipe trajectories"""
+import numpy as np
+
+
+def human_trajectory(p1, p2, duration, interval=0.01, curve=0.12, jitter=1.0, rng=None):
+    """Generate a curved, eased and jittered swipe path in one vectorized pass.
+
+    The path is a quadratic Bezier bent sideways by a random control point,
+    walked with a skewed ease-in-out so the finger accelerates and settles
+    like a real one. Jitter fades out at both ends, so p1 and p2 are exact.
+
+    Args:
+        p1 (tuple): Start point (x, y)
+        p2 (tuple): End point (x, y)
+        duration (float): Seconds from p1 to p2
+        interval (float): Seconds between points
+        curve (float): Max sideways bend, ratio to the swipe distance
+        jitter (float): Standard deviation of hand shake in pixels
+        rng (np.random.Generator, int): Generator or seed for reproducible paths,
+            None for a fresh one
+
+    Returns:
+        np.ndarray: Shape (n, 2), float, one point every `interval` seconds
+    """
+    rng = np.random.default_rng(rng)
+    p1 = np.asarray(p1, dtype=np.float64)
+    p2 = np.asarray(p2, dtype=np.float64)
+    n = max(int(round(duration / interval)), 1) + 1
+    t = np.linspace(0, 1, n)
+
+    # Skewed ease-in-out, progress along the curve
+    s = (1 - np.cos(np.pi * t ** rng.uniform(0.8, 1.25))) / 2
+
+    vector = p2 - p1
+    distance = np.linalg.norm(vector)
+    normal = np.array([-vector[1], vector[0]]) / max(distance, 1e-6)
+    control = p1 + vector * rng.uniform(0.3, 0.7) + normal * distance * rng.uniform(-curve, curve)
+
+    s = s[:, None]
+    points = (1 - s) ** 2 * p1 + 2 * (1 - s) * s * control + s ** 2 * p2
+    points += rng.normal(0, jitter, (n, 2)) * np.sin(np.pi * t)[:, None]
+    return points
@@ -26,6 +26,12 @@ logger.addHandler(console_handler)
 logger.addHandler(file_handler)
 
 
+def console_to_stderr():
+    """Send console logs to stderr, for processes whose stdout is a protocol stream,
+    such as the MCP server on stdio transport"""
+    console_handler.setStream(sys.stderr)
+
+
 def hr(title='', level=0):
     """Print horizontal rule with title"""
     length = 60
@@ -0,0 +1,144 @@
+"""Content-addressed OCR result cache"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from module.logger import logger
+from module.ocr.result import OcrLine, OcrResult
+
+
+def region_key(image, config=''):
+    """Hash the pixels of a cropped region together with the OCR config.
+
+    Args:
+        image (np.ndarray): Cropped region.
+        config (str): Anything that changes OCR output, such as model and language.
+
+    Returns:
+        str: 32 hex chars
+    """
+    image = np.ascontiguousarray(image)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f'{image.shape}|{image.dtype}|{config}'.encode('utf-8'))
+    h.update(image.data)
+    return h.hexdigest()
+
+
+def _result_nbytes(result):
+    """Rough memory size of an OcrResult"""
+    return result.polys.nbytes + result.scores.nbytes + sum(len(t) * 4 + 64 for t in result.texts) + 256
+
+
+def _dump(result):
+    return json.dumps({
+        'texts': result.texts,
+        'polys': result.polys.tolist(),
+        'scores': result.scores.tolist(),
+    }, ensure_ascii=False)
+
+
+def _load(value):
+    data = json.loads(value)
+    return OcrResult([
+        OcrLine(text, np.array(poly, dtype=np.float32), float(score))
+        for text, poly, score in zip(data['texts'], data['polys'], data['scores'])
+    ])
+
+
+class OcrCache:
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, file=None):
+        """LRU cache of OCR results, bounded by entries and bytes,
+        with an optional SQLite tier that persists across runs.
+
+        Args:
+            max_entries (int):
+            max_bytes (int):
+            file (str): SQLite database file, None to keep in memory only.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.file = file
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if file is not None:
+            self._db = sqlite3.connect(file, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS ocr_cache (key TEXT PRIMARY KEY, value TEXT)')
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __str__(self):
+        return f'OcrCache(entries={len(self)}, bytes={self._bytes}, hits={self.hits}, misses={self.misses})'
+
+    __repr__ = __str__
+
+    def get(self, key):
+        """
+        Args:
+            key (str): From region_key()
+
+        Returns:
+            OcrResult: None if not cached
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key][0]
+
+            if self._db is not None:
+                row = self._db.execute('SELECT value FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    result = _load(row[0])
+                    self._put_memory(key, result)
+                    self.hits += 1
+                    return result
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        """
+        Args:
+            key (str): From region_key()
+            result (OcrResult):
+        """
+        with self._lock:
+            self._put_memory(key, result)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO ocr_cache (key, value) VALUES (?, ?)', (key, _dump(result)))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f'OCR cache write failed: {e}')
+
+    def _put_memory(self, key, result):
+        if key in self._memory:
+            self._bytes -= self._memory.pop(key)[1]
+        nbytes = _result_nbytes(result)
+        self._memory[key] = (result, nbytes)
+        self._bytes += nbytes
+        while self._memory and (len(self._memory) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._bytes -= evicted
+
+    def clear(self):
+        """Clear memory tier, the SQLite tier is kept"""
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
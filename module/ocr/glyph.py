@@ -0,0 +1,212 @@
+"""Glyph template OCR for digits and other text in a fixed font"""
+import hashlib
+
+import cv2
+import numpy as np
+
+from module.ocr.ocr import OcrBackend
+
+
+class GlyphOCR(OcrBackend):
+    # Glyphs are normalized to this size (width, height) before matching
+    glyph_size = (12, 16)
+    # Components smaller than this amount of pixels are noise
+    min_area = 2
+
+    def __init__(self, letter=None, threshold=128, min_score=0.75):
+        """Segment characters by connected components and match each one against
+        a learned glyph set, in one matrix product. Reads a short numeric field
+        in well under a millisecond.
+
+        Args:
+            letter (tuple): RGB color of the text, None to take the minority
+                of an Otsu threshold as text
+            threshold (int): Color distance to `letter` treated as text, used if letter is set
+            min_score (float): Fields matched below this are read again by PaddleOCR
+        """
+        self.letter = letter
+        self.threshold = threshold
+        self.min_score = min_score
+        self.labels = []
+        # Shape (n, h * w), zero mean and unit norm rows
+        self.vectors = np.zeros((0, self.glyph_size[0] * self.glyph_size[1]), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __str__(self):
+        return f'GlyphOCR({"".join(sorted(set(self.labels)))})'
+
+    __repr__ = __str__
+
+    @property
+    def name(self):
+        """
+        Returns:
+            str: Changes when glyphs or binarization change, used in cache keys
+        """
+        h = hashlib.blake2b(digest_size=8)
+        h.update(f'{self.letter}|{self.threshold}|{self.labels}'.encode('utf-8'))
+        h.update(self.vectors.tobytes())
+        return f'glyph-{h.hexdigest()}'
+
+    def binarize(self, image):
+        """
+        Args:
+            image (np.ndarray): RGB or gray
+
+        Returns:
+            np.ndarray: uint8, 255 on text
+        """
+        image = np.asarray(image)
+        if self.letter is not None and image.ndim == 3:
+            diff = np.abs(image[:, :, :3].astype(np.int16) - np.array(self.letter, dtype=np.int16)).max(axis=2)
+            return np.where(diff <= self.threshold, 255, 0).astype(np.uint8)
+
+        gray = cv2.cvtColor(image[:, :, :3], cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        if np.count_nonzero(binary) > binary.size // 2:
+            binary = 255 - binary
+        return binary
+
+    def segment(self, binary):
+        """Split a binarized line into characters, left to right.
+        Components overlapping in x are one character, such as ':' or 'i'.
+
+        Args:
+            binary (np.ndarray): From binarize()
+
+        Returns:
+            list[tuple]: Character boxes (x1, y1, x2, y2)
+        """
+        _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        stats = stats[1:]
+        stats = stats[stats[:, 4] >= self.min_area]
+        if not len(stats):
+            return []
+        stats = stats[np.argsort(stats[:, 0])]
+
+        boxes = []
+        for x, y, w, h, _ in stats:
+            if boxes and x < boxes[-1][2]:
+                x1, y1, x2, y2 = boxes[-1]
+                boxes[-1] = (x1, min(y1, y), max(x2, x + w), max(y2, y + h))
+            else:
+                boxes.append((x, y, x + w, y + h))
+        return boxes
+
+    def _vectors(self, binary, boxes):
+        """
+        Returns:
+            np.ndarray: Shape (len(boxes), h * w), zero mean and unit norm rows
+        """
+        if not boxes:
+            return np.zeros((0, self.vectors.shape[1]), dtype=np.float32)
+        # Characters keep their position in the line height, so '-' differs from '_'
+        y1 = min(box[1] for box in boxes)
+        y2 = max(box[3] for box in boxes)
+        # Narrow characters are padded to the glyph aspect ratio instead of stretched,
+        # so '1' is not a filled block
+        width = int(round((y2 - y1) * self.glyph_size[0] / self.glyph_size[1]))
+        glyphs = []
+        for x1, _, x2, _ in boxes:
+            char = binary[y1:y2, x1:x2]
+            pad = width - (x2 - x1)
+            if pad > 0:
+                char = cv2.copyMakeBorder(char, 0, 0, pad // 2, pad - pad // 2, cv2.BORDER_CONSTANT, value=0)
+            glyphs.append(cv2.resize(char, self.glyph_size, interpolation=cv2.INTER_AREA))
+        glyphs = np.stack(glyphs).reshape(len(boxes), -1).astype(np.float32)
+        glyphs -= glyphs.mean(axis=1, keepdims=True)
+        norm = np.linalg.norm(glyphs, axis=1, keepdims=True)
+        return glyphs / np.maximum(norm, 1e-6)
+
+    def learn(self, image, text):
+        """Add glyphs from an image of a known text
+
+        Args:
+            image (np.ndarray): Single-line image
+            text (str): Its text, spaces are ignored
+
+        Returns:
+            bool: False if the amount of characters found does not match the text
+        """
+        text = text.replace(' ', '')
+        binary = self.binarize(image)
+        boxes = self.segment(binary)
+        if len(boxes) != len(text):
+            return False
+        self.labels.extend(text)
+        self.vectors = np.concatenate([self.vectors, self._vectors(binary, boxes)])
+        return True
+
+    @classmethod
+    def from_font(cls, font, chars='0123456789', **kwargs):
+        """Learn glyphs by rendering a font
+
+        Args:
+            font (str, ImageFont): Font file or a PIL font
+            chars (str): Characters to learn
+            **kwargs: Passed to GlyphOCR()
+
+        Returns:
+            GlyphOCR:
+        """
+        from PIL import Image, ImageDraw, ImageFont
+        if isinstance(font, str):
+            font = ImageFont.truetype(font, 32)
+        glyph = cls(**kwargs)
+        # Render all at once, so every glyph keeps its place in the line height
+        image = Image.new('RGB', (len(chars) * 64 + 32, 96), color='white')
+        draw = ImageDraw.Draw(image)
+        for index, char in enumerate(chars):
+            draw.text((16 + index * 64, 16), char, fill='black', font=font)
+        if not glyph.learn(np.array(image), chars):
+            raise ValueError(f'Failed to segment {chars} rendered by {font}')
+        return glyph
+
+    def recognize(self, image):
+        """
+        Args:
+            image (np.ndarray): Single-line image
+
+        Returns:
+            tuple[str, float]: Text and the lowest character score
+        """
+        if not len(self.labels):
+            return '', 0.
+        binary = self.binarize(image)
+        boxes = self.segment(binary)
+        if not boxes:
+            return '', 0.
+        scores = self._vectors(binary, boxes) @ self.vectors.T
+        best = scores.argmax(axis=1)
+        text = ''.join(self.labels[i] for i in best)
+        return text, float(scores[np.arange(len(best)), best].min())
+
+    def recognize_batch(self, images):
+        return [self.recognize(image) for image in images]
+
+    def save(self, file):
+        """
+        Args:
+            file (str): .npz file
+        """
+        np.savez(file, labels=np.array(self.labels), vectors=self.vectors,
+                 letter=np.array(self.letter if self.letter is not None else ()), threshold=self.threshold)
+
+    @classmethod
+    def load(cls, file, **kwargs):
+        """
+        Args:
+            file (str): From save()
+            **kwargs: Passed to GlyphOCR()
+
+        Returns:
+            GlyphOCR:
+        """
+        data = np.load(file)
+        letter = tuple(int(v) for v in data['letter']) or None
+        glyph = cls(letter=letter, threshold=int(data['threshold']), **kwargs)
+        glyph.labels = [str(label) for label in data['labels']]
+        glyph.vectors = data['vectors'].astype(np.float32)
+        return glyph
@@ -0,0 +1,193 @@
+"""Incremental OCR, re-reading only the regions that changed since the last frame"""
+import cv2
+import numpy as np
+
+from module.ocr.ocr import OCR
+from module.ocr.result import OcrResult
+
+
+def _overlap(boxes, regions):
+    """
+    Args:
+        boxes (np.ndarray): Shape (n, 4), (x1, y1, x2, y2)
+        regions (np.ndarray): Shape (m, 4)
+
+    Returns:
+        np.ndarray: Shape (n, m), True if box n overlaps region m
+    """
+    boxes = boxes[:, None, :]
+    regions = regions[None, :, :]
+    return (boxes[..., 0] < regions[..., 2]) & (boxes[..., 2] > regions[..., 0]) \
+        & (boxes[..., 1] < regions[..., 3]) & (boxes[..., 3] > regions[..., 1])
+
+
+def _merge(regions):
+    """Merge overlapping regions until none overlap
+
+    Args:
+        regions (np.ndarray): Shape (m, 4)
+
+    Returns:
+        np.ndarray:
+    """
+    regions = [list(r) for r in regions]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                a, b = regions[i], regions[j]
+                if a[0] < b[2] and a[2] > b[0] and a[1] < b[3] and a[3] > b[1]:
+                    regions[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del regions[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return np.array(regions, dtype=np.float32).reshape(-1, 4)
+
+
+class IncrementalOCR:
+    def __init__(self, area=None, tile=64, threshold=16, margin=8, full_ratio=0.5, ocr=None):
+        """Full screen OCR that diffs each frame against the previous one in tiles,
+        keeps lines in unchanged tiles and only re-runs OCR on dirty regions.
+
+        Args:
+            area (tuple): Area to perform OCR on (x1, y1, x2, y2), None for the whole image
+            tile (int): Tile size in pixels
+            threshold (int): Max pixel difference of a tile considered unchanged
+            margin (int): Pixels added around dirty regions, so text on the edge is detected
+            full_ratio (float): Run full OCR if more than this ratio of tiles changed
+            ocr (OCR): OCR instance to run on dirty regions
+        """
+        self.area = area
+        self.tile = tile
+        self.threshold = threshold
+        self.margin = margin
+        self.full_ratio = full_ratio
+        self.ocr_model = ocr if ocr is not None else OCR()
+        # Ratio of tiles changed in the last call, 1. on full OCR
+        self.dirty_ratio = 1.
+        self._last = None
+        self._result = None
+
+    def reset(self):
+        """Forget the previous frame, so the next call runs full OCR"""
+        self._last = None
+        self._result = None
+
+    def dirty_tiles(self, image):
+        """
+        Args:
+            image (np.ndarray): Same shape as the previous frame
+
+        Returns:
+            np.ndarray: Shape (rows, cols), True if the tile changed
+        """
+        diff = cv2.absdiff(self._last, image)
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        h, w = diff.shape
+        rows = np.arange(0, h, self.tile)
+        cols = np.arange(0, w, self.tile)
+        tiles = np.maximum.reduceat(np.maximum.reduceat(diff, rows, axis=0), cols, axis=1)
+        return tiles > self.threshold
+
+    def dirty_regions(self, dirty, shape):
+        """Turn dirty tiles into OCR regions. Regions are grown to cover previous lines
+        they touch, so a partly changed line is re-read as a whole.
+
+        Args:
+            dirty (np.ndarray): From dirty_tiles()
+            shape (tuple): Image shape
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Regions in shape (m, 4),
+                and a mask of previous lines to drop
+        """
+        h, w = shape[:2]
+        _, _, stats, _ = cv2.connectedComponentsWithStats(dirty.astype(np.uint8), connectivity=8)
+        stats = stats[1:, :4].astype(np.float32) * self.tile
+        regions = np.stack([
+            stats[:, 0] - self.margin,
+            stats[:, 1] - self.margin,
+            stats[:, 0] + stats[:, 2] + self.margin,
+            stats[:, 1] + stats[:, 3] + self.margin,
+        ], axis=1)
+
+        boxes = self._result.boxes
+        while True:
+            regions = np.clip(regions, 0, [w, h, w, h])
+            hit = _overlap(boxes, regions)
+            grown = regions.copy()
+            for index in range(len(regions)):
+                touched = boxes[hit[:, index]]
+                if len(touched):
+                    grown[index, :2] = np.minimum(grown[index, :2], touched[:, :2].min(axis=0))
+                    grown[index, 2:] = np.maximum(grown[index, 2:], touched[:, 2:].max(axis=0))
+            grown = _merge(grown)
+            if grown.shape == regions.shape and np.array_equal(grown, regions):
+                return regions, hit.any(axis=1)
+            regions = grown
+
+    def ocr_detail(self, image):
+        """
+        Args:
+            image (np.ndarray, Frame):
+
+        Returns:
+            OcrResult: Polygons are on the full image
+        """
+        image = np.asarray(image)
+        if self.area is not None:
+            x1, y1, x2, y2 = self.area
+            image = image[y1:y2, x1:x2]
+
+        # Failed regions come back as None. Stored as empty, they would look like
+        # no text and be reused until their pixels change.
+        failed = False
+        if self._last is None or self._last.shape != image.shape:
+            result = self.ocr_model.ocr_many(image, [None], strict=True)[0]
+            self.dirty_ratio = 1.
+        else:
+            dirty = self.dirty_tiles(image)
+            self.dirty_ratio = float(dirty.mean())
+            if not dirty.any():
+                result = self._result
+            elif self.dirty_ratio > self.full_ratio:
+                result = self.ocr_model.ocr_many(image, [None], strict=True)[0]
+            else:
+                regions, drop = self.dirty_regions(dirty, image.shape)
+                areas = [tuple(int(v) for v in region) for region in regions]
+                kept = [line for line, d in zip(self._result, drop) if not d]
+                for new in self.ocr_model.ocr_many(image, areas, strict=True):
+                    if new is None:
+                        failed = True
+                        continue
+                    kept.extend(new)
+                # Reading order, top to bottom then left to right
+                kept.sort(key=lambda line: (line.area[1], line.area[0]))
+                result = OcrResult(kept)
+
+        if result is None:
+            failed = True
+            result = OcrResult()
+        if failed:
+            # Keep what was read this time, run full OCR on the next frame
+            self.reset()
+        else:
+            self._last = image.copy()
+            self._result = result
+        if self.area is not None:
+            return result.offset(self.area[:2])
+        return result
+
+    def ocr(self, image):
+        """
+        Args:
+            image (np.ndarray, Frame):
+
+        Returns:
+            str: Recognized text
+        """
+        return self.ocr_detail(image).text
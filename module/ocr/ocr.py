@@ -1,18 +1,80 @@
 """OCR functionality using PaddleOCR"""
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+
 import numpy as np
 from module.logger import logger
 from module.base.utils import crop
+from module.ocr.cache import OcrCache, region_key
+from module.ocr.result import OcrLine, OcrResult, to_quad
+
+
+# `OCR.lang` to the standalone PaddleOCR 3.x recognition model, None for the default model.
+# Other languages use the full pipeline, which resolves the model by itself.
+REC_MODEL_NAMES = {
+    'ch': None,
+    'chinese_cht': None,
+    'japan': None,
+    'en': 'en_PP-OCRv5_mobile_rec',
+    'korean': 'korean_PP-OCRv5_mobile_rec',
+    'latin': 'latin_PP-OCRv5_mobile_rec',
+    'eslav': 'eslav_PP-OCRv5_mobile_rec',
+}
+
+
+class OcrBackend(ABC):
+    """Interface of a text recognition engine that replaces PaddleOCR
+    on known single-line areas, see OCR(backend=...).
+
+    Results scored below `min_score` are recognized again by PaddleOCR.
+    """
+    # Part of the cache key, must change when the engine would give different output
+    name = 'backend'
+    min_score = 0.
+
+    @abstractmethod
+    def recognize_batch(self, images):
+        """
+        Args:
+            images (list[np.ndarray]): Cropped single-line images, RGB
+
+        Returns:
+            list[tuple[str, float]]: (text, score) of each image
+        """
 
 
 class OCR:
     """OCR text recognition"""
 
     _ocr_model = None
+    _rec_model = None
+    _det_model = None
+    # Shared result cache, see enable_cache()
+    cache = None
+    # Language of the PaddleOCR model, part of the cache key
+    lang = 'ch'
+    # Shared OCR server client, see use_server()
+    server = None
+    # Model loading is guarded, so callers wait for a running warmup instead of loading twice
+    _init_lock = threading.Lock()
+    _warmup = None
+    # Guards starting and resetting `_warmup`, so concurrent warmup() calls start one load
+    _warmup_lock = threading.Lock()
 
     @classmethod
-    def _init_ocr(cls):
-        """Initialize PaddleOCR model (lazy loading)"""
-        if cls._ocr_model is None:
+    def _init_ocr(cls, warmup=False):
+        """Initialize PaddleOCR model (lazy loading)
+
+        Args:
+            warmup (bool): Run one dummy inference before publishing the model
+        """
+        if cls._ocr_model is not None:
+            return cls._ocr_model
+
+        with cls._init_lock:
+            if cls._ocr_model is not None:
+                return cls._ocr_model
             try:
                 from paddleocr import PaddleOCR
                 logger.info('Initializing PaddleOCR model...')
@@ -22,9 +84,12 @@ class OCR:
 
                 # Initialize PaddleOCR with compatible parameters
                 # Note: Using older-style API without document preprocessor
-                cls._ocr_model = PaddleOCR(
-                    lang='ch'  # Chinese + English support
+                ocr_model = PaddleOCR(
+                    lang=cls.lang  # Chinese + English support
                 )
+                if warmup:
+                    cls._ocr_batch(ocr_model, [np.full((48, 160, 3), 255, dtype=np.uint8)])
+                cls._ocr_model = ocr_model
                 logger.info('PaddleOCR initialized successfully')
             except Exception as e:
                 logger.error(f'Failed to initialize PaddleOCR: {e}')
@@ -32,83 +97,589 @@ class OCR:
 
         return cls._ocr_model
 
-    def __init__(self, area=None):
+    @classmethod
+    def warmup(cls, background=True, recognizer=True, detector=True):
+        """Load the models and run one dummy inference, so the first real OCR call
+        does not pay for imports, weight loading and kernel initialization.
+
+        OCR calls made before warmup finishes wait for it instead of loading again,
+        later calls never wait. Nothing is loaded if an OCR server is used.
+
+        Args:
+            background (bool): True to warm up in a daemon thread and return immediately
+            recognizer (bool): Also load the recognition-only model,
+                used by recognize_many() and ocr_single_line(detect=False)
+            detector (bool): Also load the detection-only model,
+                used by two-stage preprocessing (Preprocess.det_max_side)
+
+        Returns:
+            Future: Resolves to True when ready, or holds the loading error.
+                Calling warmup() again returns the same future.
+        """
+        with cls._warmup_lock:
+            if cls._warmup is not None:
+                return cls._warmup
+            future = Future()
+            cls._warmup = future
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                if cls.server is None:
+                    cls._init_ocr(warmup=True)
+                    if recognizer:
+                        cls._init_recognizer()
+                    if detector:
+                        cls._init_detector()
+                future.set_result(True)
+                logger.info('OCR warmup finished')
+            except Exception as e:
+                logger.warning(f'OCR warmup failed: {e}')
+                future.set_exception(e)
+                # Allow another try
+                with cls._warmup_lock:
+                    if cls._warmup is future:
+                        cls._warmup = None
+
+        if background:
+            threading.Thread(target=run, name='ocr_warmup', daemon=True).start()
+        else:
+            run()
+        return future
+
+    @classmethod
+    def _init_recognizer(cls):
+        """Initialize text recognition model without detection (lazy loading)
+
+        PaddleOCR 3.x provides a standalone TextRecognition model,
+        on 2.x, or for a language without a known standalone model,
+        the full pipeline is reused.
+        """
+        if cls._rec_model is not None:
+            return cls._rec_model
+        try:
+            from paddleocr import TextRecognition
+        except ImportError:
+            TextRecognition = None
+        if TextRecognition is None or cls.lang not in REC_MODEL_NAMES:
+            if TextRecognition is not None:
+                logger.info(f'No standalone recognition model for lang={cls.lang}, using the full pipeline')
+            model = cls._init_ocr()
+            with cls._init_lock:
+                if cls._rec_model is None:
+                    cls._rec_model = model
+            return cls._rec_model
+
+        with cls._init_lock:
+            if cls._rec_model is not None:
+                return cls._rec_model
+            try:
+                logger.info(f'Initializing PaddleOCR recognition model, lang={cls.lang}...')
+                cls._rec_model = TextRecognition(model_name=REC_MODEL_NAMES[cls.lang])
+                logger.info('PaddleOCR recognition model initialized successfully')
+            except Exception as e:
+                logger.error(f'Failed to initialize PaddleOCR recognition model: {e}')
+                raise
+
+        return cls._rec_model
+
+    @classmethod
+    def _init_detector(cls):
+        """Initialize text detection model without recognition (lazy loading)
+
+        PaddleOCR 3.x provides a standalone TextDetection model,
+        its default PP-OCRv5 detector covers every language.
+        On 2.x the full pipeline, loaded with `cls.lang`, is reused with rec=False.
+        """
+        if cls._det_model is not None:
+            return cls._det_model
+        try:
+            from paddleocr import TextDetection
+        except ImportError:
+            model = cls._init_ocr()
+            with cls._init_lock:
+                if cls._det_model is None:
+                    cls._det_model = model
+            return cls._det_model
+
+        with cls._init_lock:
+            if cls._det_model is not None:
+                return cls._det_model
+            try:
+                logger.info('Initializing PaddleOCR detection model...')
+                cls._det_model = TextDetection()
+                logger.info('PaddleOCR detection model initialized successfully')
+            except Exception as e:
+                logger.error(f'Failed to initialize PaddleOCR detection model: {e}')
+                raise
+
+        return cls._det_model
+
+    @classmethod
+    def enable_cache(cls, max_entries=1024, max_bytes=64 * 1024 * 1024, file=None):
+        """Cache OCR results by the hash of the cropped region, so unchanged
+        regions such as menu titles are recognized once per session.
+
+        Args:
+            max_entries (int): Max results kept in memory
+            max_bytes (int): Max bytes kept in memory
+            file (str): SQLite file to persist results across runs, None to disable
+
+        Returns:
+            OcrCache:
+        """
+        cls.disable_cache()
+        cls.cache = OcrCache(max_entries=max_entries, max_bytes=max_bytes, file=file)
+        return cls.cache
+
+    @classmethod
+    def disable_cache(cls):
+        if cls.cache is not None:
+            cls.cache.close()
+            cls.cache = None
+
+    @classmethod
+    def use_server(cls, address=None, authkey=None):
+        """Send OCR requests to a shared OcrServer instead of loading
+        a model in this process. See module/ocr/server.py.
+
+        Args:
+            address (tuple, str): (host, port) or unix socket path of the server
+            authkey (bytes): None to read the key the server wrote, see server.load_authkey()
+
+        Returns:
+            OcrClient:
+        """
+        from module.ocr.server import DEFAULT_ADDRESS, OcrClient
+        cls.disable_server()
+        cls.server = OcrClient(
+            address=address if address is not None else DEFAULT_ADDRESS,
+            authkey=authkey,
+        )
+        return cls.server
+
+    @classmethod
+    def disable_server(cls):
+        if cls.server is not None:
+            cls.server.close()
+            cls.server = None
+
+    def _cache_config(self, backend=True):
+        """
+        Args:
+            backend (bool): True if `self.backend` is used, which is only on recognition
+
+        Returns:
+            str: Everything besides pixels that changes OCR output
+        """
+        config = f'paddleocr|{self.lang}'
+        if backend and self.backend is not None:
+            config = f'{self.backend.name}|{config}'
+        if self.preprocess is not None:
+            config = f'{config}|{self.preprocess.config}'
+        return config
+
+    def __init__(self, area=None, backend=None, preprocess=None):
         """
         Initialize OCR
 
         Args:
             area (tuple): Area to perform OCR on (x1, y1, x2, y2)
+            backend (OcrBackend): Engine for single-line recognition, such as GlyphOCR
+                for digits in a fixed font. None to use PaddleOCR.
+            preprocess (Preprocess): Downscale for detection, upscale small text,
+                binarize or normalize before OCR. None to send crops as they are.
         """
         self.area = area
+        self.backend = backend
+        self.preprocess = preprocess
 
     def ocr(self, image, area=None):
         """
         Perform OCR on image
 
         Args:
-            image (np.ndarray): Image to perform OCR on
+            image (np.ndarray, Frame): Image to perform OCR on
             area (tuple): Area to crop before OCR (x1, y1, x2, y2)
 
         Returns:
             str: Recognized text
         """
-        # Use specified area or default area
+        return self.ocr_detail(image, area).text
+
+    def ocr_detail(self, image, area=None):
+        """
+        Perform OCR on image, keeping position and confidence of each line
+
+        Args:
+            image (np.ndarray, Frame): Image to perform OCR on
+            area (tuple): Area to crop before OCR (x1, y1, x2, y2)
+
+        Returns:
+            OcrResult: Recognized lines, polygons are on the full image
+        """
         if area is None:
             area = self.area
+        return self.ocr_many(image, [area])[0]
+
+    def ocr_many(self, image, areas, strict=False):
+        """
+        Perform OCR on many areas of one image in one batched inference call
+
+        Areas are cropped as views without copying.
+
+        Args:
+            image (np.ndarray, Frame): Image to perform OCR on
+            areas (list[tuple]): Areas (x1, y1, x2, y2), None for the whole image
+            strict (bool): True to return None for areas whose inference failed,
+                False to return an empty OcrResult, which looks the same as no text.
+
+        Returns:
+            list[OcrResult]: In the same order as areas, polygons are on the full image
+        """
+        image = np.asarray(image)
+        crops = []
+        offsets = []
+        for area in areas:
+            if area is not None:
+                x1, y1, x2, y2 = area
+                crops.append(image[y1:y2, x1:x2])
+                offsets.append((x1, y1))
+            else:
+                crops.append(image)
+                offsets.append((0, 0))
+
+        results = [None] * len(crops)
+        keys = [None] * len(crops)
+        if self.cache is not None:
+            for i, region in enumerate(crops):
+                keys[i] = region_key(region, self._cache_config(backend=False))
+                results[i] = self.cache.get(keys[i])
 
-        # Crop image if area specified
-        if area is not None:
-            image = crop(image, area)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            if self.server is not None:
+                try:
+                    recognized = self.server.ocr_many(
+                        image, [areas[i] for i in pending], preprocess=self.preprocess)
+                except Exception as e:
+                    logger.warning(f'OCR server failed: {e}')
+                    recognized = [None] * len(pending)
+            else:
+                recognized = self._ocr_local([crops[i] for i in pending])
+
+            for i, result in zip(pending, recognized):
+                if result is None:
+                    # Failed, not cached so the next call tries again
+                    results[i] = None if strict else OcrResult()
+                    continue
+                results[i] = result
+                if keys[i] is not None:
+                    self.cache.put(keys[i], result)
+
+        return [
+            result.offset(offset) if result is not None and offset != (0, 0) else result
+            for result, offset in zip(results, offsets)
+        ]
+
+    def _ocr_local(self, images):
+        """
+        Args:
+            images (list[np.ndarray]): Cropped images
+
+        Returns:
+            list[OcrResult]: Polygons are on the cropped images, None if inference failed
+        """
+        if self.preprocess is not None and self.preprocess.det_max_side is not None:
+            return self._ocr_two_stage(images)
 
-        # Initialize OCR model
         ocr_model = self._init_ocr()
 
         # Perform OCR
         try:
-            # Note: cls parameter is handled via use_angle_cls in initialization
-            result = ocr_model.ocr(image)
-
-            # Extract text - handle different result formats
-            if result:
-                # PaddleOCR 3.2+ returns a list with dict containing 'rec_texts'
-                # For single image, use first element
-                page_result = result[0] if isinstance(result, list) and len(result) > 0 else result
-
-                # New format: dict with 'rec_texts' key
-                if isinstance(page_result, dict) and 'rec_texts' in page_result:
-                    texts = page_result['rec_texts']
-                    if texts:
-                        text = ' '.join(str(t) for t in texts)
-                        return text
-                # Old format: list of [bbox, (text, confidence)]
-                elif page_result and isinstance(page_result, list):
-                    texts = []
-                    for line in page_result:
-                        if line and len(line) > 1 and isinstance(line[1], (list, tuple)):
-                            texts.append(str(line[1][0]))
-
-                    if texts:
-                        text = ' '.join(texts)
-                        return text
-
-            return ''
+            scales = [1.] * len(images)
+            if self.preprocess is not None:
+                images, scales = zip(*[self.preprocess.upscale(image) for image in images])
+                images = [self.preprocess.enhance(image) for image in images]
+            pages = self._ocr_batch(ocr_model, images)
+            results = [OcrResult(self._parse_result(page)) for page in pages]
+            return [result.scale(1 / scale) if scale != 1. else result for result, scale in zip(results, scales)]
+        except Exception as e:
+            logger.warning(f'OCR failed: {e}')
+            return [None] * len(images)
+
+    def _ocr_two_stage(self, images):
+        """Detect text on downscaled copies, then recognize every line
+        on the full resolution images in one batch.
+
+        Args:
+            images (list[np.ndarray]): Cropped images
+
+        Returns:
+            list[OcrResult]: Polygons are on the cropped images, None if inference failed
+        """
+        try:
+            crops, owners, quads = [], [], []
+            for index, image in enumerate(images):
+                height, width = image.shape[:2]
+                small, scale = self.preprocess.downscale(image)
+                for poly in self._detect(self.preprocess.enhance(small)):
+                    quad = to_quad(poly) / np.float32(scale)
+                    x1, y1 = np.floor(quad.min(axis=0)).astype(int).clip(0, [width, height])
+                    x2, y2 = np.ceil(quad.max(axis=0)).astype(int).clip(0, [width, height])
+                    if x2 > x1 and y2 > y1:
+                        crops.append(image[y1:y2, x1:x2])
+                        owners.append(index)
+                        quads.append(quad)
+            recognized = self._recognize_paddle(crops) if crops else []
         except Exception as e:
             logger.warning(f'OCR failed: {e}')
-            return ''
+            return [None] * len(images)
+
+        lines = [[] for _ in images]
+        for owner, quad, (text, score) in zip(owners, quads, recognized):
+            if text:
+                lines[owner].append(OcrLine(text, quad, score))
+        return [OcrResult(image_lines) for image_lines in lines]
+
+    def _detect(self, image):
+        """
+        Args:
+            image (np.ndarray):
+
+        Returns:
+            list: Text polygons
+        """
+        model = self._init_detector()
+        if hasattr(model, 'predict') and not hasattr(model, 'ocr'):
+            # PaddleOCR 3.x TextDetection
+            output = list(model.predict(input=image))
+            return list(output[0]['dt_polys']) if output else []
+
+        # PaddleOCR 2.x
+        result = model.ocr(image, rec=False, cls=False)
+        page_result = result[0] if result else None
+        return list(page_result) if page_result else []
+
+    @staticmethod
+    def _ocr_batch(ocr_model, images):
+        """
+        Args:
+            ocr_model: PaddleOCR
+            images (list[np.ndarray]):
+
+        Returns:
+            list: Raw PaddleOCR output of each image
+        """
+        if len(images) > 1 and hasattr(ocr_model, 'predict'):
+            # PaddleOCR 3.x predicts a list of images as one batch
+            return [[page] for page in ocr_model.predict(images)]
+
+        # Note: cls parameter is handled via use_angle_cls in initialization
+        # PaddleOCR 2.x requires det=False for a list input, so run one by one
+        return [ocr_model.ocr(image) for image in images]
+
+    @staticmethod
+    def _parse_result(result):
+        """
+        Parse PaddleOCR output of a single image, handling different result formats
+
+        Args:
+            result: Output of PaddleOCR.ocr()
 
-    def ocr_single_line(self, image, area=None):
+        Returns:
+            list[OcrLine]:
+        """
+        if not result:
+            return []
+
+        # PaddleOCR 3.2+ returns a list with dict containing 'rec_texts'
+        # For single image, use first element
+        page_result = result[0] if isinstance(result, list) and len(result) > 0 else result
+
+        lines = []
+        # New format: dict with 'rec_texts' key
+        if isinstance(page_result, dict) and 'rec_texts' in page_result:
+            texts = page_result['rec_texts']
+            scores = page_result.get('rec_scores', [])
+            # rec_polys are aligned with rec_texts, dt_polys are before score filtering
+            polys = page_result.get('rec_polys')
+            if polys is None or len(polys) != len(texts):
+                polys = page_result.get('dt_polys', [])
+            for i, text in enumerate(texts):
+                poly = polys[i] if i < len(polys) else ()
+                score = scores[i] if i < len(scores) else 0.
+                lines.append(OcrLine(str(text), to_quad(poly), float(score)))
+        # Old format: list of [bbox, (text, confidence)]
+        elif page_result and isinstance(page_result, list):
+            for line in page_result:
+                if line and len(line) > 1 and isinstance(line[1], (list, tuple)):
+                    poly = to_quad(line[0])
+                    score = float(line[1][1]) if len(line[1]) > 1 else 0.
+                    lines.append(OcrLine(str(line[1][0]), poly, score))
+
+        return lines
+
+    def ocr_single_line(self, image, area=None, detect=True):
         """
         Perform OCR expecting single line of text
 
         Args:
-            image (np.ndarray): Image to perform OCR on
+            image (np.ndarray, Frame): Image to perform OCR on
             area (tuple): Area to crop before OCR
+            detect (bool): True to run full detection and keep the first line,
+                False to feed a known single-line area straight to the recognizer.
 
         Returns:
             str: Recognized text (single line)
+
+        Raises:
+            ValueError: If detect is False and neither `area` nor `self.area` is set
         """
+        if not detect:
+            if area is None:
+                area = self.area
+            if area is None:
+                raise ValueError('ocr_single_line(detect=False) requires an area')
+            return self.recognize(image, area).text.strip()
+
         text = self.ocr(image, area)
         # Return first line if multiple lines detected
         if '\n' in text:
             text = text.split('\n')[0]
         return text.strip()
+
+    def recognize(self, image, area=None):
+        """
+        Recognize a known single-line area, skipping text detection
+
+        Args:
+            image (np.ndarray, Frame): Image to perform OCR on
+            area (tuple): Area to crop before OCR (x1, y1, x2, y2)
+
+        Returns:
+            OcrLine: Polygon is the area itself
+        """
+        if area is None:
+            area = self.area
+        return self.recognize_many(image, [area])[0]
+
+    def recognize_many(self, image, areas):
+        """
+        Recognize many known single-line areas in one inference call,
+        such as reading all counters of a HUD.
+
+        Args:
+            image (np.ndarray, Frame): Image to perform OCR on
+            areas (list[tuple]): Areas (x1, y1, x2, y2), None for the whole image
+
+        Returns:
+            list[OcrLine]: In the same order as areas
+        """
+        image = np.asarray(image)
+        height, width = image.shape[:2]
+        areas = [area if area is not None else (0, 0, width, height) for area in areas]
+        crops = [crop(image, area) for area in areas]
+
+        results = [None] * len(crops)
+        keys = [None] * len(crops)
+        if self.cache is not None:
+            for i, region in enumerate(crops):
+                keys[i] = region_key(region, f'rec|{self._cache_config()}')
+                cached = self.cache.get(keys[i])
+                if cached is not None and cached:
+                    results[i] = (cached.texts[0], float(cached.scores[0]))
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            try:
+                recognized, uncertain = self._recognize_batch(
+                    image, [areas[i] for i in pending], [crops[i] for i in pending])
+            except Exception as e:
+                logger.warning(f'OCR recognition failed: {e}')
+                # Not cached so the next call tries again
+                recognized, uncertain = None, ()
+            for index, i in enumerate(pending):
+                if recognized is None:
+                    results[i] = ('', 0.)
+                    continue
+                text, score = recognized[index]
+                results[i] = (text, score)
+                if keys[i] is not None and index not in uncertain:
+                    self.cache.put(keys[i], OcrResult([OcrLine(text, to_quad([(0, 0), crops[i].shape[1::-1]]), score)]))
+
+        return [
+            OcrLine(text, to_quad([area[:2], area[2:]]), score)
+            for (text, score), area in zip(results, areas)
+        ]
+
+    def _recognize_batch(self, image, areas, images):
+        """
+        Args:
+            image (np.ndarray): Full image
+            areas (list[tuple]): Single-line areas (x1, y1, x2, y2)
+            images (list[np.ndarray]): Crops of the areas
+
+        Returns:
+            tuple[list[tuple[str, float]], set[int]]: (text, score) of each image,
+                and indexes of low-score backend results kept because the fallback failed,
+                which must not be cached
+        """
+        if self.backend is None:
+            return self._recognize_areas(image, areas, images), set()
+
+        results = self.backend.recognize_batch(images)
+        low = [i for i, (_, score) in enumerate(results) if score < self.backend.min_score]
+        if low:
+            try:
+                fallback = self._recognize_areas(image, [areas[i] for i in low], [images[i] for i in low])
+                for i, result in zip(low, fallback):
+                    results[i] = result
+            except Exception as e:
+                logger.warning(f'OCR fallback failed, keeping {self.backend.name} result: {e}')
+                return results, set(low)
+        return results, set()
+
+    def _recognize_areas(self, image, areas, images):
+        """Recognize with PaddleOCR, on the OCR server if configured
+
+        Args:
+            image (np.ndarray): Full image, shared with the server
+            areas (list[tuple]): Single-line areas (x1, y1, x2, y2)
+            images (list[np.ndarray]): Crops of the areas, recognized in this process
+
+        Returns:
+            list[tuple[str, float]]: (text, score) of each image
+        """
+        if self.server is not None:
+            return self.server.recognize_many(image, areas, preprocess=self.preprocess)
+        return self._recognize_paddle(images)
+
+    def _recognize_paddle(self, images):
+        """
+        Args:
+            images (list[np.ndarray]): Cropped single-line images
+
+        Returns:
+            list[tuple[str, float]]: (text, score) of each image
+        """
+        if self.preprocess is not None:
+            images = [self.preprocess.recognition(image) for image in images]
+        model = self._init_recognizer()
+        if hasattr(model, 'predict') and not hasattr(model, 'ocr'):
+            # PaddleOCR 3.x TextRecognition
+            output = model.predict(input=images, batch_size=len(images))
+            return [(str(res['rec_text']), float(res['rec_score'])) for res in output]
+        if hasattr(model, 'predict'):
+            # PaddleOCR 3.x pipeline, for a language without standalone model.
+            # Detection runs on each crop, lines are joined into one.
+            results = [OcrResult(self._parse_result(page)) for page in self._ocr_batch(model, images)]
+            return [
+                (''.join(result.texts), float(result.scores.mean()) if len(result) else 0.)
+                for result in results
+            ]
+
+        # PaddleOCR 2.x, a list of images in a list is recognized as one batch
+        result = model.ocr([images], det=False, cls=False)
+        page_result = result[0] if result else []
+        return [(str(text), float(score)) for text, score in page_result]
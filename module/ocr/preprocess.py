@@ -0,0 +1,99 @@
+"""Image preprocessing before OCR"""
+import cv2
+import numpy as np
+
+
+class Preprocess:
+    def __init__(self, det_max_side=None, min_height=None, target_height=48, binarize=False, normalize=False):
+        """Configurable preprocessing of OCR input, see OCR(preprocess=...)
+
+        Args:
+            det_max_side (int): Detect text on a copy downscaled to this longest side,
+                then recognize each line on the full resolution image. None to disable.
+            min_height (int): Upscale crops lower than this, so tiny fonts are readable.
+                None to disable.
+            target_height (int): Height of upscaled crops
+            binarize (bool): Convert to black text on white by Otsu threshold
+            normalize (bool): Equalize contrast by CLAHE on lightness
+        """
+        self.det_max_side = det_max_side
+        self.min_height = min_height
+        self.target_height = target_height
+        self.binarize = binarize
+        self.normalize = normalize
+
+    def __str__(self):
+        return f'Preprocess({self.config})'
+
+    __repr__ = __str__
+
+    @property
+    def config(self):
+        """
+        Returns:
+            str: Part of the cache key
+        """
+        return f'det{self.det_max_side}|min{self.min_height}|h{self.target_height}' \
+               f'|bin{int(self.binarize)}|norm{int(self.normalize)}'
+
+    def enhance(self, image):
+        """
+        Args:
+            image (np.ndarray): RGB
+
+        Returns:
+            np.ndarray: RGB, or the input itself if nothing to do
+        """
+        if not self.binarize and not self.normalize:
+            return image
+        gray = cv2.cvtColor(image[:, :, :3], cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+        if self.normalize:
+            gray = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        if self.binarize:
+            _, gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            # Text is the minority, make it black on white
+            if np.count_nonzero(gray) < gray.size // 2:
+                gray = 255 - gray
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+
+    def upscale(self, image):
+        """
+        Args:
+            image (np.ndarray):
+
+        Returns:
+            tuple[np.ndarray, float]: Image and its scale to the input
+        """
+        height = image.shape[0]
+        if self.min_height is None or height == 0 or height >= self.min_height:
+            return image, 1.
+        scale = self.target_height / height
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        return image, scale
+
+    def downscale(self, image):
+        """
+        Args:
+            image (np.ndarray):
+
+        Returns:
+            tuple[np.ndarray, float]: Image and its scale to the input
+        """
+        side = max(image.shape[:2])
+        if self.det_max_side is None or side <= self.det_max_side:
+            return image, 1.
+        scale = self.det_max_side / side
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return image, scale
+
+    def recognition(self, image):
+        """Prepare a single-line crop for the recognizer
+
+        Args:
+            image (np.ndarray):
+
+        Returns:
+            np.ndarray:
+        """
+        image, _ = self.upscale(image)
+        return self.enhance(image)
@@ -0,0 +1,286 @@
+"""Structured OCR results with a grid spatial index"""
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from module.ocr.text_index import TextIndex
+
+
+class OcrLine(namedtuple('OcrLine', ['text', 'poly', 'score'])):
+    """A recognized text line
+
+    Attributes:
+        text (str): Recognized text
+        poly (np.ndarray): Bounding polygon, shape (4, 2)
+        score (float): Recognition confidence
+    """
+    __slots__ = ()
+
+    @property
+    def center(self):
+        """
+        Returns:
+            tuple: (x, y)
+        """
+        x, y = self.poly.mean(axis=0)
+        return int(x), int(y)
+
+    @property
+    def area(self):
+        """
+        Returns:
+            tuple: Bounding box (x1, y1, x2, y2)
+        """
+        x1, y1 = self.poly.min(axis=0)
+        x2, y2 = self.poly.max(axis=0)
+        return int(x1), int(y1), int(x2), int(y2)
+
+
+def to_quad(poly):
+    """
+    Args:
+        poly: Polygon of any amount of points
+
+    Returns:
+        np.ndarray: Shape (4, 2), the polygon itself if it has 4 points,
+            otherwise its bounding rectangle
+    """
+    poly = np.asarray(poly, dtype=np.float32).reshape(-1, 2)
+    if poly.shape[0] == 4:
+        return poly
+    if poly.shape[0] == 0:
+        return np.zeros((4, 2), dtype=np.float32)
+    x1, y1 = poly.min(axis=0)
+    x2, y2 = poly.max(axis=0)
+    return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.float32)
+
+
+class OcrResult:
+    # Grid cell size of the spatial index in pixels
+    cell = 64
+
+    def __init__(self, lines=()):
+        """OCR lines backed by compact numpy arrays, with a grid spatial index
+        for position queries without another inference.
+
+        Args:
+            lines (list[OcrLine]):
+        """
+        lines = list(lines)
+        self.texts = [line.text for line in lines]
+        self.polys = np.array([line.poly for line in lines], dtype=np.float32).reshape(-1, 4, 2)
+        self.scores = np.array([line.score for line in lines], dtype=np.float32)
+        # (x1, y1, x2, y2)
+        self.boxes = np.concatenate([self.polys.min(axis=1), self.polys.max(axis=1)], axis=1)
+        self.centers = self.polys.mean(axis=1)
+
+        self._grid = defaultdict(list)
+        cells = np.floor_divide(self.boxes, self.cell).astype(int)
+        for index, (x1, y1, x2, y2) in enumerate(cells):
+            for gx in range(x1, x2 + 1):
+                for gy in range(y1, y2 + 1):
+                    self._grid[gx, gy].append(index)
+        self._index = None
+        if len(lines):
+            self._grid_range = (cells[:, 0].min(), cells[:, 1].min(), cells[:, 2].max(), cells[:, 3].max())
+        else:
+            self._grid_range = (0, 0, 0, 0)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __bool__(self):
+        return len(self.texts) > 0
+
+    def __getitem__(self, index):
+        return OcrLine(self.texts[index], self.polys[index], float(self.scores[index]))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __str__(self):
+        return f'OcrResult({self.texts})'
+
+    __repr__ = __str__
+
+    @property
+    def text(self):
+        """
+        Returns:
+            str: All lines joined by space
+        """
+        return ' '.join(self.texts)
+
+    def offset(self, offset):
+        """
+        Args:
+            offset: (x, y)
+
+        Returns:
+            OcrResult: A new result with all polygons moved
+        """
+        offset = np.asarray(offset, dtype=np.float32)
+        return OcrResult([line._replace(poly=line.poly + offset) for line in self])
+
+    def scale(self, ratio):
+        """
+        Args:
+            ratio (float):
+
+        Returns:
+            OcrResult: A new result with all polygons multiplied by ratio
+        """
+        return OcrResult([line._replace(poly=line.poly * np.float32(ratio)) for line in self])
+
+    def find(self, text):
+        """
+        Args:
+            text (str): Target text, matched if either contains the other
+
+        Returns:
+            list[OcrLine]: Matched lines in recognition order
+        """
+        return [self[i] for i, t in enumerate(self.texts) if text in t or t in text]
+
+    def find_one(self, text):
+        """
+        Returns:
+            OcrLine: The first matched line, or None
+        """
+        lines = self.find(text)
+        return lines[0] if lines else None
+
+    @property
+    def index(self):
+        """
+        Returns:
+            TextIndex: Fuzzy text lookup, built on first use
+        """
+        if self._index is None:
+            self._index = TextIndex(self)
+        return self._index
+
+    def match(self, text, max_distance=None):
+        """Fuzzy find, tolerating full-width characters, case and OCR confusions
+        such as O/0 and l/1.
+
+        Args:
+            text (str): Target text
+            max_distance (int): Max edit distance, None for 1 edit every 4 characters
+
+        Returns:
+            OcrLine: Best matched line ranked by edits, score and position, or None
+        """
+        return self.index.find_one(text, max_distance=max_distance)
+
+    def _distance(self, indexes, x, y):
+        """Distance from point to the bounding boxes, 0 if inside"""
+        boxes = self.boxes[indexes]
+        dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+        dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+        return np.hypot(dx, dy)
+
+    def nearest(self, x, y):
+        """Find the line nearest to a point, searching grid rings outwards
+
+        Args:
+            x (int, float):
+            y (int, float):
+
+        Returns:
+            OcrLine: None if no lines
+        """
+        if not self:
+            return None
+
+        cx, cy = int(x // self.cell), int(y // self.cell)
+        gx1, gy1, gx2, gy2 = self._grid_range
+        radius = max(abs(cx - gx1), abs(cx - gx2), abs(cy - gy1), abs(cy - gy2))
+        best, best_distance = None, np.inf
+        for r in range(radius + 1):
+            # Cells on ring r are at least (r - 1) cells away
+            if best_distance <= (r - 1) * self.cell:
+                break
+            indexes = set()
+            for gx in range(cx - r, cx + r + 1):
+                for gy in range(cy - r, cy + r + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) == r:
+                        indexes.update(self._grid.get((gx, gy), ()))
+            if not indexes:
+                continue
+            indexes = np.fromiter(indexes, dtype=int)
+            distance = self._distance(indexes, x, y)
+            i = int(np.argmin(distance))
+            if distance[i] < best_distance:
+                best, best_distance = int(indexes[i]), float(distance[i])
+
+        return self[best] if best is not None else None
+
+    def in_area(self, area):
+        """
+        Args:
+            area: (x1, y1, x2, y2)
+
+        Returns:
+            list[OcrLine]: Lines whose center is inside the area, in recognition order
+        """
+        x1, y1, x2, y2 = area
+        indexes = set()
+        for gx in range(int(x1 // self.cell), int(x2 // self.cell) + 1):
+            for gy in range(int(y1 // self.cell), int(y2 // self.cell) + 1):
+                indexes.update(self._grid.get((gx, gy), ()))
+        result = []
+        for i in sorted(indexes):
+            cx, cy = self.centers[i]
+            if x1 <= cx <= x2 and y1 <= cy <= y2:
+                result.append(self[i])
+        return result
+
+    def _label(self, label):
+        if isinstance(label, OcrLine):
+            return label
+        return self.find_one(label)
+
+    def right_of(self, label):
+        """Find the closest line on the right of a label on the same row,
+        such as the value of a "key: value" pair.
+
+        Args:
+            label (str, OcrLine):
+
+        Returns:
+            OcrLine: None if label or value not found
+        """
+        label = self._label(label)
+        if label is None or not self:
+            return None
+        x1, y1, x2, y2 = label.area
+        boxes = self.boxes
+        overlap = np.minimum(boxes[:, 3], y2) - np.maximum(boxes[:, 1], y1)
+        candidate = (overlap > 0) & (self.centers[:, 0] > x2)
+        if not candidate.any():
+            return None
+        gap = np.where(candidate, boxes[:, 0] - x2, np.inf)
+        return self[int(np.argmin(gap))]
+
+    def below(self, label):
+        """Find the closest line below a label in the same column.
+
+        Args:
+            label (str, OcrLine):
+
+        Returns:
+            OcrLine: None if label or value not found
+        """
+        label = self._label(label)
+        if label is None or not self:
+            return None
+        x1, y1, x2, y2 = label.area
+        boxes = self.boxes
+        overlap = np.minimum(boxes[:, 2], x2) - np.maximum(boxes[:, 0], x1)
+        candidate = (overlap > 0) & (self.centers[:, 1] > y2)
+        if not candidate.any():
+            return None
+        gap = np.where(candidate, boxes[:, 1] - y2, np.inf)
+        return self[int(np.argmin(gap))]
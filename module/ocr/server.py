@@ -0,0 +1,383 @@
+"""Out-of-process OCR service
+
+One server holds a few PaddleOCR replicas, device workers connect as clients.
+Frames are passed through shared memory, only areas and results go through the socket,
+so OCR memory grows with replicas instead of with devices.
+
+Start a server:
+    python -m module.ocr.server --port 22268 --replicas 2
+
+Then in each device worker:
+    OCR.use_server(('127.0.0.1', 22268))
+
+Both full OCR (`ocr_many`) and recognition-only requests (`recognize_many`,
+`ocr_single_line(detect=False)`) are sent to the server, clients never load a model.
+
+Requests are pickled, so only clients holding the server's authkey are accepted.
+The server generates a random key and writes it to a file readable by the same user only,
+local clients read it from there. Clients on other hosts set MOBILE_USE_OCR_AUTHKEY
+to the same hex key, which the server also takes instead of generating one.
+"""
+import argparse
+import multiprocessing
+import os
+import secrets
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from module.logger import logger
+
+DEFAULT_ADDRESS = ('127.0.0.1', 22268)
+# Hex authkey, overrides the key file on both server and clients
+AUTHKEY_ENV = 'MOBILE_USE_OCR_AUTHKEY'
+AUTHKEY_FOLDER = os.path.join(os.path.expanduser('~'), '.mobile_use')
+
+
+def authkey_file(address):
+    """
+    Args:
+        address (tuple, str): (host, port) or unix socket path of the server
+
+    Returns:
+        str: File holding the authkey of the server
+    """
+    name = address[1] if isinstance(address, tuple) else os.path.basename(str(address))
+    return os.path.join(AUTHKEY_FOLDER, f'ocr_server_{name}.key')
+
+
+def save_authkey(authkey, address):
+    """Write authkey to a file only the current user can read
+
+    Returns:
+        str: File path
+    """
+    os.makedirs(AUTHKEY_FOLDER, mode=0o700, exist_ok=True)
+    file = authkey_file(address)
+    fd = os.open(file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(authkey.hex())
+    # Mode of an existing file is not changed by os.open()
+    os.chmod(file, 0o600)
+    return file
+
+
+def load_authkey(address):
+    """
+    Args:
+        address (tuple, str): (host, port) or unix socket path of the server
+
+    Returns:
+        bytes: Authkey from AUTHKEY_ENV, or from the key file written by the server
+
+    Raises:
+        RuntimeError: If neither exists
+    """
+    env = os.environ.get(AUTHKEY_ENV)
+    if env:
+        return bytes.fromhex(env)
+    file = authkey_file(address)
+    try:
+        with open(file, encoding='utf-8') as f:
+            return bytes.fromhex(f.read().strip())
+    except FileNotFoundError:
+        raise RuntimeError(f'No OCR server authkey, set {AUTHKEY_ENV} or start the server on this host ({file})')
+
+
+def _attach(name):
+    """Attach to a shared memory block created by another process.
+
+    The block is owned by the client, so it must not be tracked by this process,
+    or the resource tracker would unlink it when this process exits.
+
+    Args:
+        name (str):
+
+    Returns:
+        shared_memory.SharedMemory:
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no `track`, and registers every attached block
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _worker_init():
+    from module.ocr.ocr import OCR
+    try:
+        OCR._init_ocr()
+    except Exception as e:
+        # Retried on the first request, an initializer that raises would respawn forever
+        logger.warning(f'OCR worker failed to load model: {e}')
+
+
+def _read_crops(name, shape, dtype, areas):
+    """
+    Args:
+        name (str): Shared memory block holding the frame
+        shape (tuple):
+        dtype (str):
+        areas (list[tuple]): Areas (x1, y1, x2, y2), None for the whole image
+
+    Returns:
+        list[np.ndarray]: Copies of the areas
+    """
+    shm = _attach(name)
+    try:
+        image = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        # Copy out only the areas, views on shm.buf would block shm.close()
+        crops = [(image[area[1]:area[3], area[0]:area[2]] if area is not None else image).copy() for area in areas]
+        del image
+    finally:
+        shm.close()
+    return crops
+
+
+def _worker_ocr(name, shape, dtype, areas, preprocess=None):
+    """Run in a replica process
+
+    Args:
+        name (str): Shared memory block holding the frame
+        shape (tuple):
+        dtype (str):
+        areas (list[tuple]): Areas (x1, y1, x2, y2), None for the whole image
+        preprocess (Preprocess): Preprocessing of the client's OCR
+
+    Returns:
+        list[OcrResult]: Polygons are on the cropped areas, None if inference failed
+    """
+    from module.ocr.ocr import OCR
+    crops = _read_crops(name, shape, dtype, areas)
+    return OCR(preprocess=preprocess)._ocr_local(crops)
+
+
+def _worker_recognize(name, shape, dtype, areas, preprocess=None):
+    """Run in a replica process, recognize known single-line areas without detection
+
+    Args:
+        name (str): Shared memory block holding the frame
+        shape (tuple):
+        dtype (str):
+        areas (list[tuple]): Areas (x1, y1, x2, y2)
+        preprocess (Preprocess): Preprocessing of the client's OCR
+
+    Returns:
+        list[tuple[str, float]]: (text, score) of each area
+    """
+    from module.ocr.ocr import OCR
+    crops = _read_crops(name, shape, dtype, areas)
+    return OCR(preprocess=preprocess)._recognize_paddle(crops)
+
+
+# Request method to the function run on a replica
+WORKER_METHODS = {
+    'ocr': _worker_ocr,
+    'recognize': _worker_recognize,
+}
+
+
+class OcrServer:
+    def __init__(self, address=DEFAULT_ADDRESS, replicas=1, authkey=None):
+        """
+        Args:
+            address (tuple, str): (host, port), or a unix socket path
+            replicas (int): Amount of model-holding processes
+            authkey (bytes): None to take AUTHKEY_ENV, or generate a random key.
+                The key is written to authkey_file(address) for local clients.
+        """
+        self.address = address
+        self.replicas = replicas
+        if authkey is None:
+            env = os.environ.get(AUTHKEY_ENV)
+            authkey = bytes.fromhex(env) if env else secrets.token_bytes(32)
+        self.authkey = authkey
+        self._key_file = None
+        self._pool = None
+        self._listener = None
+
+    def _open(self):
+        if self._listener is None:
+            context = multiprocessing.get_context('spawn')
+            self._pool = context.Pool(self.replicas, initializer=_worker_init)
+            self._listener = Listener(self.address, authkey=self.authkey)
+            self._key_file = save_authkey(self.authkey, self.address)
+            logger.info(f'OCR server listening on {self._listener.address}, replicas={self.replicas}, '
+                        f'authkey in {self._key_file}')
+
+    def serve_forever(self):
+        """Accept clients until close() is called, each client is served by a thread,
+        requests are queued to whichever replica is free."""
+        self._open()
+        listener = self._listener
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError:
+                    # Listener closed
+                    break
+                except Exception as e:
+                    logger.warning(f'OCR server rejected a client: {e}')
+                    continue
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def start(self):
+        """Serve in a background thread, returns once the server accepts clients
+
+        Returns:
+            threading.Thread:
+        """
+        self._open()
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def _serve_client(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    method, args = request[0], request[1:]
+                    results = self._pool.apply(WORKER_METHODS[method], args)
+                    conn.send(('ok', results))
+                except Exception as e:
+                    conn.send(('error', f'{type(e).__name__}: {e}'))
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        if self._key_file is not None:
+            try:
+                os.remove(self._key_file)
+            except OSError:
+                pass
+            self._key_file = None
+
+
+class SharedFrame:
+    def __init__(self):
+        """A shared memory block reused across frames, grown when a larger frame comes.
+        Readers attach with _attach() and get the frame from (name, shape, dtype)."""
+        self._shm = None
+
+    def write(self, image):
+        """
+        Args:
+            image (np.ndarray):
+
+        Returns:
+            tuple: (name, shape, dtype) to pass to other processes
+        """
+        image = np.ascontiguousarray(image)
+        nbytes = max(image.nbytes, 1)
+        if self._shm is None or self._shm.size < nbytes:
+            self.close()
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        np.ndarray(image.shape, dtype=image.dtype, buffer=self._shm.buf)[...] = image
+        return self._shm.name, image.shape, image.dtype.str
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class OcrClient:
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None):
+        """
+        Args:
+            address (tuple, str): Address of OcrServer
+            authkey (bytes): None to load with load_authkey() on connect
+        """
+        self.address = address
+        self.authkey = authkey
+        self._conn = None
+        self._frame = SharedFrame()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            authkey = self.authkey if self.authkey is not None else load_authkey(self.address)
+            self._conn = Client(self.address, authkey=authkey)
+        return self._conn
+
+    def ocr_many(self, image, areas, preprocess=None):
+        """
+        Args:
+            image (np.ndarray):
+            areas (list[tuple]): Areas (x1, y1, x2, y2), None for the whole image
+            preprocess (Preprocess): Applied by the server before OCR
+
+        Returns:
+            list[OcrResult]: Polygons are on the cropped areas, None if inference failed
+
+        Raises:
+            RuntimeError: If server failed to recognize
+        """
+        return self._request('ocr', image, areas, preprocess)
+
+    def recognize_many(self, image, areas, preprocess=None):
+        """
+        Args:
+            image (np.ndarray):
+            areas (list[tuple]): Known single-line areas (x1, y1, x2, y2)
+            preprocess (Preprocess): Applied by the server before recognition
+
+        Returns:
+            list[tuple[str, float]]: (text, score) of each area
+
+        Raises:
+            RuntimeError: If server failed to recognize
+        """
+        return self._request('recognize', image, areas, preprocess)
+
+    def _request(self, method, image, areas, preprocess):
+        areas = [tuple(int(v) for v in area) if area is not None else None for area in areas]
+        with self._lock:
+            name, shape, dtype = self._frame.write(image)
+            conn = self._connect()
+            try:
+                conn.send((method, name, shape, dtype, areas, preprocess))
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                # Server restarted, reconnect on next call
+                self._conn = None
+                raise
+        if status != 'ok':
+            raise RuntimeError(f'OCR server error: {payload}')
+        return payload
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._frame.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Shared OCR server')
+    parser.add_argument('--host', default=DEFAULT_ADDRESS[0])
+    parser.add_argument('--port', type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument('--replicas', type=int, default=1)
+    args = parser.parse_args()
+    OcrServer((args.host, args.port), replicas=args.replicas).serve_forever()
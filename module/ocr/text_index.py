@@ -0,0 +1,141 @@
+"""Fuzzy text lookup over OCR results"""
+import unicodedata
+from collections import defaultdict
+
+# Characters OCR commonly confuses, mapped to one representative.
+# Applied after NFKC and casefold, on both index keys and queries.
+CONFUSABLES = str.maketrans({
+    'o': '0',
+    'l': '1',
+    'i': '1',
+    '|': '1',
+    '!': '1',
+    '丨': '1',
+    '一': '-',
+    '—': '-',
+    '–': '-',
+    '口': '0',
+    '〇': '0',
+})
+
+
+def normalize_text(text):
+    """Normalize text so that visually equivalent OCR output gives the same key.
+    Full-width characters become half-width, case is folded,
+    confusable characters are unified and whitespace is removed.
+
+    Args:
+        text (str):
+
+    Returns:
+        str:
+    """
+    text = unicodedata.normalize('NFKC', text).casefold().translate(CONFUSABLES)
+    return ''.join(text.split())
+
+
+def substring_distance(query, text):
+    """Edit distance from query to its best matching substring of text,
+    so a target inside a longer line costs nothing extra.
+
+    Args:
+        query (str):
+        text (str):
+
+    Returns:
+        int:
+    """
+    if not query:
+        return 0
+    # Row of the DP table, a match may start anywhere in text so the first row is all 0
+    previous = [0] * (len(text) + 1)
+    for i, q in enumerate(query, start=1):
+        current = [i]
+        for j, t in enumerate(text, start=1):
+            current.append(min(previous[j - 1] + (q != t), previous[j] + 1, current[j - 1] + 1))
+        previous = current
+    return min(previous)
+
+
+class TextIndex:
+    def __init__(self, result, n=2):
+        """Index of OCR lines by normalized n-grams, finding a target
+        costs index lookups instead of another inference.
+
+        Args:
+            result (OcrResult):
+            n (int): Gram size
+        """
+        self.result = result
+        self.n = n
+        self.keys = [normalize_text(text) for text in result.texts]
+        self._grams = defaultdict(set)
+        for index, key in enumerate(self.keys):
+            for gram in self._split(key):
+                self._grams[gram].add(index)
+
+    def _split(self, key):
+        """
+        Returns:
+            set[str]: n-grams of key, the key itself if shorter than n
+        """
+        if len(key) <= self.n:
+            return {key} if key else set()
+        return {key[i:i + self.n] for i in range(len(key) - self.n + 1)}
+
+    def _candidates(self, query, max_distance):
+        """Lines sharing enough n-grams with the query to be within max_distance.
+        Each edit destroys at most n grams of the query.
+
+        Returns:
+            list[int]:
+        """
+        grams = self._split(query)
+        need = len(grams) - max_distance * self.n
+        if need <= 0 or len(query) < self.n:
+            return list(range(len(self.keys)))
+        count = defaultdict(int)
+        for gram in grams:
+            for index in self._grams.get(gram, ()):
+                count[index] += 1
+        return [index for index, c in count.items() if c >= need]
+
+    def search(self, text, max_distance=None):
+        """
+        Args:
+            text (str): Target text
+            max_distance (int): Max edit distance allowed,
+                None for 1 edit every 4 characters
+
+        Returns:
+            list[tuple[OcrLine, int]]: Matched lines and their distance,
+                best first: fewer edits, higher score, then top to bottom and left to right
+        """
+        query = normalize_text(text)
+        if not query or not self.keys:
+            return []
+        if max_distance is None:
+            max_distance = len(query) // 4
+
+        matches = []
+        for index in self._candidates(query, max_distance):
+            distance = substring_distance(query, self.keys[index])
+            if distance <= max_distance:
+                matches.append((index, distance))
+
+        boxes = self.result.boxes
+        scores = self.result.scores
+        matches.sort(key=lambda m: (m[1], -scores[m[0]], boxes[m[0], 1], boxes[m[0], 0]))
+        return [(self.result[index], distance) for index, distance in matches]
+
+    def find_one(self, text, max_distance=None):
+        """
+        Args:
+            text (str): Target text
+            max_distance (int): See search()
+
+        Returns:
+            OcrLine: Best matched line, or None
+        """
+        matches = self.search(text, max_distance=max_distance)
+        return matches[0][0] if matches else None
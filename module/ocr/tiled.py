@@ -0,0 +1,194 @@
+"""Tiled full-screen OCR, bands of a frame recognized in parallel processes"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+
+from module.logger import logger
+from module.ocr.result import OcrResult
+from module.ocr.server import SharedFrame, _worker_init, _worker_ocr
+
+
+def split_bands(height, band=640, overlap=96):
+    """Split image height into evenly spaced overlapping bands
+
+    Args:
+        height (int):
+        band (int): Max band height
+        overlap (int): Min overlap of neighbouring bands, should be taller than a text line
+
+    Returns:
+        list[tuple[int, int]]: (y1, y2) of each band
+    """
+    if height <= band:
+        return [(0, height)]
+    count = int(np.ceil((height - overlap) / (band - overlap)))
+    starts = np.linspace(0, height - band, count).round().astype(int)
+    return [(int(y), int(y) + band) for y in starts]
+
+
+def box_iou(boxes1, boxes2):
+    """
+    Args:
+        boxes1 (np.ndarray): Shape (n, 4), (x1, y1, x2, y2)
+        boxes2 (np.ndarray): Shape (m, 4)
+
+    Returns:
+        np.ndarray: Shape (n, m)
+    """
+    x1 = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+    y1 = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+    x2 = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+    y2 = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+    union = area1[:, None] + area2[None, :] - inter
+    return inter / np.maximum(union, 1e-6)
+
+
+def merge_bands(results, bands, height, iou=0.3, edge=2):
+    """Merge band results into one, dropping lines cut by a band edge
+    and duplicates recognized in both bands of an overlap.
+
+    Args:
+        results (list[OcrResult]): Results of each band, polygons on the full image
+        bands (list[tuple[int, int]]): From split_bands()
+        height (int): Image height
+        iou (float): Lines overlapping more than this are duplicates, the larger one is kept
+        edge (int): Lines within this distance to an inner band edge are cut
+
+    Returns:
+        OcrResult: Lines in reading order
+    """
+    lines = []
+    for result, (y1, y2) in zip(results, bands):
+        for line in result:
+            top, bottom = line.area[1], line.area[3]
+            # Cut lines are seen as a whole by the neighbouring band
+            if (y1 > 0 and top <= y1 + edge) or (y2 < height and bottom >= y2 - edge):
+                continue
+            lines.append(line)
+    if not lines:
+        return OcrResult()
+
+    merged = OcrResult(lines)
+    boxes = merged.boxes
+    size = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    # Larger boxes first, then higher scores
+    order = np.lexsort((-merged.scores, -size))
+    overlap = box_iou(boxes, boxes) > iou
+    keep = []
+    removed = np.zeros(len(lines), dtype=bool)
+    for index in order:
+        if removed[index]:
+            continue
+        keep.append(index)
+        removed |= overlap[index]
+
+    keep.sort(key=lambda i: (boxes[i, 1], boxes[i, 0]))
+    return OcrResult([merged[i] for i in keep])
+
+
+# Process count to its pool, so OCRs of different sizes never tear down each other's pool
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def ocr_pool(workers=None):
+    """
+    Args:
+        workers (int): Amount of processes, each holds its own model.
+            None to use up to 4 processes, limited by cores.
+
+    Returns:
+        ProcessPoolExecutor: Shared pool of this size, created on first use
+    """
+    if workers is None:
+        workers = min(4, os.cpu_count() or 1)
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=_worker_init)
+        return pool
+
+
+class TiledOCR:
+    def __init__(self, area=None, band=640, overlap=96, workers=None, iou=0.3, timeout=60.):
+        """Full-screen OCR that splits the frame into overlapping horizontal bands,
+        recognizes them in parallel processes and merges the overlaps.
+
+        Args:
+            area (tuple): Area to perform OCR on (x1, y1, x2, y2), None for the whole image
+            band (int): Max band height
+            overlap (int): Min overlap of neighbouring bands, should be taller than a text line
+            workers (int): Amount of model-holding processes, see ocr_pool()
+            iou (float): Box IoU above which lines in an overlap are duplicates
+            timeout (float): Seconds to wait for all bands, including model loading on first use
+        """
+        self.area = area
+        self.band = band
+        self.overlap = overlap
+        self.workers = workers
+        self.iou = iou
+        self.timeout = timeout
+        self._frame = SharedFrame()
+        self._lock = threading.Lock()
+
+    def ocr_detail(self, image):
+        """
+        Args:
+            image (np.ndarray, Frame):
+
+        Returns:
+            OcrResult: Polygons are on the full image
+        """
+        image = np.asarray(image)
+        if self.area is not None:
+            x1, y1, x2, y2 = self.area
+            image = image[y1:y2, x1:x2]
+        height, width = image.shape[:2]
+        bands = split_bands(height, band=self.band, overlap=self.overlap)
+
+        pool = ocr_pool(self.workers)
+        with self._lock:
+            name, shape, dtype = self._frame.write(image)
+            futures = [
+                pool.submit(_worker_ocr, name, shape, dtype, [(0, y1, width, y2)])
+                for y1, y2 in bands
+            ]
+            try:
+                _, not_done = wait(futures, timeout=self.timeout)
+                if not_done:
+                    raise TimeoutError(f'{len(not_done)}/{len(futures)} bands not done in {self.timeout}s')
+                results = [future.result()[0] for future in futures]
+                if any(result is None for result in results):
+                    raise RuntimeError('inference failed in a band')
+                results = [result.offset((0, y1)) for result, (y1, _) in zip(results, bands)]
+            except Exception as e:
+                logger.warning(f'Tiled OCR failed: {e}')
+                for future in futures:
+                    future.cancel()
+                return OcrResult()
+
+        result = merge_bands(results, bands, height, iou=self.iou)
+        if self.area is not None:
+            return result.offset(self.area[:2])
+        return result
+
+    def ocr(self, image):
+        """
+        Args:
+            image (np.ndarray, Frame):
+
+        Returns:
+            str: Recognized text
+        """
+        return self.ocr_detail(image).text
+
+    def close(self):
+        with self._lock:
+            self._frame.close()
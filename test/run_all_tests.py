@@ -64,13 +64,16 @@ def main():
         'test_connection.py',      # 1. 连接测试
         'test_screenshot.py',      # 2. 截图测试
         'test_utils.py',           # 3. 工具测试
+        'test_frame.py',           # 3. 帧视图测试
         'test_click.py',           # 4. 点击测试
         'test_swipe.py',           # 5. 滑动测试
         'test_long_click.py',      # 6. 长按测试
         'test_drag.py',            # 7. 拖拽测试
         'test_button.py',          # 8. 按钮测试
+        'test_template.py',        # 8. 模板匹配测试
         'test_ocr.py',             # 9. OCR测试
         'test_ocr_locate.py',      # 10. OCR定位测试
+        'test_mcp_server.py',      # 11. MCP服务测试
     ]
 
     results = []
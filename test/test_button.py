@@ -5,7 +5,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from module.base.button import Button
+from module.base.button import Button, ButtonSet
 from module.logger import logger
 import numpy as np
 from PIL import Image, ImageDraw
@@ -205,6 +205,42 @@ def test_button_area_validation():
         return False
 
 
+def test_button_set():
+    """测试按钮集合批量检测"""
+    logger.hr('测试按钮集合批量检测', level=0)
+
+    try:
+        # 红色按钮出现，绿色按钮区域实际是白色
+        red_area = (200, 150, 400, 250)
+        test_image = create_test_screen_with_button(red_area, (255, 0, 0))
+
+        buttons = ButtonSet([
+            Button(area=(600, 400, 700, 500), color=(0, 255, 0), name='GREEN'),
+            Button(area=red_area, color=(0, 0, 255), name='RED'),
+            Button(area=(0, 0, 100, 100), color=(255, 255, 255), name='WHITE'),
+            Button(area=(0, 0, 100, 100), name='NO_COLOR'),
+        ])
+
+        mask = buttons.appear_on(test_image)
+        expected = [button.appear_on(test_image) for button in buttons]
+        first = buttons.first_appear_on(test_image)
+
+        logger.info(f'批量检测: {mask.tolist()}')
+        logger.info(f'逐个检测: {expected}')
+        logger.info(f'首个出现: {first}')
+
+        if mask.tolist() == expected and mask.tolist() == [False, True, True, False] and first == 'RED':
+            logger.info('✅ 按钮集合检测正确')
+            return True
+        else:
+            logger.error('❌ 按钮集合检测结果不一致')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 按钮集合检测失败: {e}')
+        return False
+
+
 def test_button_with_real_device():
     """测试真实设备按钮检测（可选）"""
     logger.hr('测试真实设备（可选）', level=0)
@@ -250,6 +286,7 @@ if __name__ == '__main__':
     results.append(('多颜色检测', test_button_appear_with_different_colors()))
     results.append(('按钮不存在', test_button_not_appear()))
     results.append(('区域验证', test_button_area_validation()))
+    results.append(('按钮集合', test_button_set()))
     results.append(('真实设备', test_button_with_real_device()))
 
     # 输出测试结果
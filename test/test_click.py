@@ -6,9 +6,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from module.device.device import Device
+from module.device.control import Control
 from module.logger import logger
 import time
 
+import numpy as np
+
 
 def test_click_coordinate():
     """测试坐标点击"""
@@ -127,6 +130,165 @@ def test_click_boundary():
         return False
 
 
+def test_click_batch():
+    """测试批量点击（记录shell命令，不需要设备）"""
+    logger.hr('测试批量点击', level=0)
+
+    class RecordControl(Control):
+        def __init__(self):
+            self.scripts = []
+            self.fail = False
+
+        def _adb_shell(self, cmd, timeout=None):
+            self.scripts.append(cmd)
+            if self.fail:
+                raise ConnectionResetError('模拟连接断开')
+            return ''
+
+    try:
+        control = RecordControl()
+        with control.batch():
+            control.click((100, 200))
+            control.sleep((0.1, 0.2))
+            control.swipe((100, 500), (900, 500), duration=0.3)
+            with control.batch():
+                control.keyevent(4)
+
+        # 出错时不发送
+        try:
+            with control.batch():
+                control.click((1, 1))
+                raise ValueError('中断')
+        except ValueError:
+            pass
+
+        logger.info(f'发送脚本: {control.scripts}')
+        lines = control.scripts[0].split('\n') if control.scripts else []
+        sleep = float(lines[1].split()[1]) if len(lines) > 1 else 0
+        sent = len(control.scripts)
+
+        # 发送失败时抛出，不重发
+        control.fail = True
+        try:
+            with control.batch():
+                control.click((1, 1))
+            raised = False
+        except ConnectionResetError:
+            raised = True
+        once = raised and len(control.scripts) == sent + 1
+        logger.info(f'失败时抛出: {raised}, 只发送一次: {once}')
+
+        if sent == 1 and once and len(lines) == 4 and lines[0] == 'input tap 100 200' \
+                and 0.1 <= sleep <= 0.2 and lines[2] == 'input swipe 100 500 900 500 300' \
+                and lines[3] == 'input keyevent 4' and control._batch is None:
+            logger.info('✅ 批量点击合并为一次shell调用')
+            return True
+        else:
+            logger.error('❌ 批量点击脚本不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 批量点击失败: {e}')
+        return False
+
+
+GETEVENT = """add device 1: /dev/input/event1
+  name:     "gpio-keys"
+  events:
+    KEY (0001): 0072  0073  0074
+add device 2: /dev/input/event3
+  name:     "fts_ts"
+  events:
+    KEY (0001): 014a
+    ABS (0003): 002f  : value 0, min 0, max 9, fuzz 0, flat 0, resolution 0
+                0030  : value 0, min 0, max 255, fuzz 0, flat 0, resolution 0
+                0035  : value 0, min 0, max 4095, fuzz 0, flat 0, resolution 0
+                0036  : value 0, min 0, max 8191, fuzz 0, flat 0, resolution 0
+                0039  : value 0, min 0, max 65535, fuzz 0, flat 0, resolution 0
+  input props:
+    INPUT_PROP_DIRECT
+"""
+
+
+def test_click_sendevent():
+    """测试sendevent触摸（模拟getevent输出，不需要设备）"""
+    logger.hr('测试sendevent触摸', level=0)
+
+    class RecordControl(Control):
+        control_method = 'sendevent'
+
+        def __init__(self):
+            self.scripts = []
+            self.orientation = 0
+            self.orientation_reads = 0
+
+        def adb_shell(self, cmd, timeout=None):
+            if cmd == 'getevent -p':
+                return GETEVENT
+            if cmd == 'wm size':
+                return 'Physical size: 1080x2400\n'
+            if cmd.startswith('dumpsys input'):
+                self.orientation_reads += 1
+                return f'    SurfaceOrientation: {self.orientation}\n'
+            if cmd == 'getprop ro.product.cpu.abi':
+                return 'arm64-v8a\n'
+            self.scripts.append(cmd)
+            return ''
+
+    def decode(script, dtype):
+        events = []
+        for line in script.split('\n'):
+            if line.startswith('printf'):
+                data = bytes(int(o, 8) for o in line.split("'")[1].split('\\')[1:])
+                frame = np.frombuffer(data, dtype=dtype)
+                events.append([(int(e['type']), int(e['code']), int(e['value'])) for e in frame])
+        return events
+
+    try:
+        control = RecordControl()
+        control.click((540, 1200))
+        control.swipe((100, 1200), (900, 1200), duration=0.1)
+        touchscreen = control.touchscreen
+        dtype = touchscreen.event_dtype
+
+        tap = decode(control.scripts[0], dtype)
+        swipe = decode(control.scripts[1], dtype)
+        logger.info(f'{touchscreen}, 点击事件: {tap}')
+
+        down = dict(((t, c), v) for t, c, v in tap[0])
+        ok = dtype.itemsize == 24 and touchscreen.path == '/dev/input/event3'
+        ok = ok and control.scripts[0].startswith('exec 3>/dev/input/event3')
+        ok = ok and down[(3, 0x35)] == 2048 and down[(3, 0x36)] == 4096 and down[(1, 0x14a)] == 1
+        ok = ok and tap[1] == [(3, 0x39, -1), (1, 0x14a, 0), (0, 0, 0)]
+        # 10ms一个点，按下 + 10次移动 + 抬起
+        xs = [frame[0][2] for frame in swipe[1:-1]]
+        ok = ok and len(swipe) == 12 and xs[-1] == round(900 / 1080 * 4095)
+        ok = ok and control._touchscreen is touchscreen
+
+        # 屏幕旋转后截图尺寸变化，重新读取方向；尺寸一致时不再读取
+        control.orientation = 1
+        control.image = np.zeros((1080, 2400, 3), dtype=np.uint8)
+        control.click((600, 300))
+        reads = control.orientation_reads
+        control.click((600, 300))
+        rotated = dict(((t, c), v) for t, c, v in decode(control.scripts[-1], dtype)[0])
+        logger.info(f'旋转后: {touchscreen}, 读取方向次数: {reads} -> {control.orientation_reads}')
+        ok = ok and touchscreen.orientation == 1 and control.orientation_reads == reads
+        ok = ok and rotated[(3, 0x35)] == round((1080 - 300) / 1080 * 4095)
+        ok = ok and rotated[(3, 0x36)] == round(600 / 2400 * 8191)
+
+        if ok:
+            logger.info('✅ sendevent事件序列正确')
+            return True
+        else:
+            logger.error(f'❌ sendevent事件序列不正确: {control.scripts}')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ sendevent触摸失败: {e}')
+        return False
+
+
 if __name__ == '__main__':
     results = []
 
@@ -135,6 +297,8 @@ if __name__ == '__main__':
     results.append(('元组点击', test_click_tuple()))
     results.append(('连续点击', test_click_multiple()))
     results.append(('边界点击', test_click_boundary()))
+    results.append(('批量点击', test_click_batch()))
+    results.append(('sendevent触摸', test_click_sendevent()))
 
     # 输出测试结果
     logger.hr('测试结果汇总', level=0)
@@ -6,6 +6,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from module.device.device import Device
+from module.device.connection import Connection, ShellSession
+from module.device.control import Control
+from module.device.screenshot import Screenshot
 from module.logger import logger
 
 
@@ -54,6 +57,202 @@ def test_device_info():
         return False
 
 
+def test_shell_session():
+    """测试持久shell会话（本地sh模拟设备）"""
+    logger.hr('测试持久shell会话', level=0)
+
+    import socket
+    import subprocess
+    import time
+
+    try:
+        # 用socketpair连接本地sh，模拟 exec:sh 的流
+        local, remote = socket.socketpair()
+        process = subprocess.Popen(['sh'], stdin=remote, stdout=remote, stderr=subprocess.DEVNULL)
+        remote.close()
+        session = ShellSession(local)
+
+        output, code = session.run('echo hello')
+        multi, _ = session.run('printf "a\\nb"')
+        error, error_code = session.run('ls /not_exist_dir')
+        _, false_code = session.run('false')
+        # 默认不设超时，等待长命令结束
+        slow, _ = session.run('sleep 0.2; echo done')
+        # 每条命令在子shell中执行，目录和环境变量不带到下一条
+        session.run('cd /tmp; export MU_LEAK=1')
+        isolated, _ = session.run('pwd; echo "leak=$MU_LEAK"')
+        _, exit_code = session.run('exit 3')
+        alive, _ = session.run('echo alive')
+
+        start = time.time()
+        for i in range(100):
+            session.run(f'echo {i}')
+        cost = (time.time() - start) * 10
+
+        session.close()
+        process.wait(timeout=5)
+
+        logger.info(f'输出: {output!r}, 退出码: {code}')
+        logger.info(f'多行输出: {multi!r}')
+        logger.info(f'错误输出: {error!r}, 退出码: {error_code}')
+        logger.info(f'隔离: {isolated!r}, exit退出码: {exit_code}, 之后: {alive!r}')
+        logger.info(f'平均每条命令: {cost:.2f}ms')
+
+        if output == 'hello\n' and code == 0 and multi == 'a\nb' \
+                and error_code != 0 and error and false_code == 1 and slow == 'done\n' \
+                and isolated == f'{os.getcwd()}\nleak=\n' and exit_code == 3 and alive == 'alive\n':
+            logger.info('✅ 持久shell会话正常')
+            return True
+        else:
+            logger.error('❌ 持久shell会话输出不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 持久shell会话失败: {e}')
+        return False
+
+
+def test_exec_out_timeout():
+    """测试exec流读取超时（模拟卡住的screencap，不需要设备）"""
+    logger.hr('测试exec流读取超时', level=0)
+
+    import socket
+    import time
+
+    class FakeStream:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def send_command(self, cmd):
+            pass
+
+        def check_okay(self):
+            pass
+
+        def close(self):
+            self.conn.close()
+
+    class FakeClient:
+        def __init__(self):
+            self.peers = []
+
+        def _connect(self, timeout=None):
+            local, remote = socket.socketpair()
+            self.peers.append(remote)
+            if timeout:
+                local.settimeout(timeout)
+            return FakeStream(local)
+
+    try:
+        device = Connection.__new__(Connection)
+        device.serial = '127.0.0.1:5565'
+        device.adb_client = FakeClient()
+
+        # 对端不发送任何数据，读取应在超时后抛出而不是永久阻塞
+        stream = device._exec_out('screencap', timeout=0.2)
+        start = time.time()
+        try:
+            stream.recv(1)
+            timed_out = False
+        except socket.timeout:
+            timed_out = True
+        cost = time.time() - start
+        stream.close()
+        for peer in device.adb_client.peers:
+            peer.close()
+
+        logger.info(f'读取超时: {timed_out}, 耗时: {cost:.2f}s')
+        if timed_out and cost < 5:
+            logger.info('✅ 卡住的exec流会超时')
+            return True
+        else:
+            logger.error('❌ exec流没有超时')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ exec流超时测试失败: {e}')
+        return False
+
+
+def test_circuit_breaker():
+    """测试熔断器（模拟uiautomator2故障，不需要设备）"""
+    logger.hr('测试熔断器', level=0)
+
+    import time
+    import numpy as np
+
+    class FakeU2:
+        def __init__(self):
+            self.down = True
+            self.calls = 0
+
+        def click(self, x, y):
+            self.calls += 1
+            if self.down:
+                raise ConnectionError('ATX agent down')
+
+        def screenshot(self, format='pillow'):
+            self.calls += 1
+            if self.down:
+                raise ConnectionError('ATX agent down')
+            return None
+
+    class RecordDevice(Connection, Screenshot, Control):
+        def __init__(self):
+            self.u2 = FakeU2()
+            self.scripts = []
+
+        def adb_shell(self, cmd, timeout=None):
+            self.scripts.append(cmd)
+            return ''
+
+        def _screenshot_adb_raw(self):
+            return np.zeros((10, 10, 3), dtype=np.uint8)
+
+    try:
+        device = RecordDevice()
+        breaker = device.breaker('uiautomator2')
+        breaker.cooldown = 0.1
+
+        # 连续失败3次后熔断，之后的点击和截图直接走ADB
+        for _ in range(3):
+            device.click((100, 100))
+        opened = breaker.state
+        calls = device.u2.calls
+        device.click((100, 100))
+        image = device._screenshot_capture()
+        skipped = device.u2.calls == calls and image is not None and len(device.scripts) == 4
+
+        # 重连（失败也一样）不重置熔断状态
+        import threading
+        device._shell, device._shell_lock = None, threading.Lock()
+        device.serial = '127.0.0.1:1'
+        try:
+            device.adb_connect()
+        except Exception:
+            pass
+        kept = device.breaker('uiautomator2') is breaker and breaker.state == 'open'
+
+        # 冷却后半开探测，成功则恢复
+        time.sleep(0.15)
+        device.u2.down = False
+        device.click((100, 100))
+        closed = breaker.state
+        logger.info(f'熔断状态: {opened} -> {closed}, {device.breaker_stats()}')
+
+        if opened == 'open' and skipped and kept and closed == 'closed' \
+                and device.u2.calls == calls + 1 and len(device.scripts) == 4:
+            logger.info('✅ 熔断后直接使用ADB，探测成功后恢复')
+            return True
+        else:
+            logger.error('❌ 熔断器状态不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 熔断器测试失败: {e}')
+        return False
+
+
 if __name__ == '__main__':
     results = []
 
@@ -61,6 +260,9 @@ if __name__ == '__main__':
     results.append(('设备连接', test_device_connection()))
     results.append(('连接重试', test_connection_retry()))
     results.append(('设备信息', test_device_info()))
+    results.append(('持久shell会话', test_shell_session()))
+    results.append(('exec流超时', test_exec_out_timeout()))
+    results.append(('熔断器', test_circuit_breaker()))
 
     # 输出测试结果
     logger.hr('测试结果汇总', level=0)
@@ -0,0 +1,166 @@
+"""
+测试Frame派生视图 - 使用合成图片
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.device.screenshot import Frame
+from module.base.utils import crop, get_color, get_color_integral
+from module.logger import logger
+import cv2
+import numpy as np
+
+
+def create_test_frame(width=800, height=600, frame_id=1):
+    """
+    创建随机像素的测试帧
+
+    Args:
+        width: 宽度
+        height: 高度
+        frame_id: 帧序号
+
+    Returns:
+        Frame: RGB格式测试帧
+    """
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return Frame(image, frame_id=frame_id, timestamp=0.)
+
+
+def test_frame_views():
+    """测试灰度/HSV/金字塔视图"""
+    logger.hr('测试Frame派生视图', level=0)
+
+    try:
+        frame = create_test_frame()
+
+        gray = cv2.cvtColor(frame.image, cv2.COLOR_RGB2GRAY)
+        hsv = cv2.cvtColor(frame.image, cv2.COLOR_RGB2HSV)
+
+        logger.info(f'帧: {frame}')
+        logger.info(f'灰度尺寸: {frame.gray.shape}')
+        logger.info(f'半分辨率尺寸: {frame.half.shape}')
+
+        if not np.array_equal(frame.gray, gray):
+            logger.error('❌ 灰度视图不正确')
+            return False
+        if not np.array_equal(frame.hsv, hsv):
+            logger.error('❌ HSV视图不正确')
+            return False
+        if frame.half.shape[:2] != (300, 400) or frame.gray_pyramid(2).shape != (150, 200):
+            logger.error('❌ 金字塔尺寸不正确')
+            return False
+
+        logger.info('✅ Frame派生视图正确')
+        return True
+
+    except Exception as e:
+        logger.error(f'❌ Frame派生视图测试失败: {e}')
+        return False
+
+
+def test_frame_memoize():
+    """测试派生视图只计算一次"""
+    logger.hr('测试Frame缓存', level=0)
+
+    try:
+        frame = create_test_frame()
+
+        if frame.gray is not frame.gray or frame.integral is not frame.integral:
+            logger.error('❌ 派生视图被重复计算')
+            return False
+        if frame.pyramid(1) is not frame.half:
+            logger.error('❌ 金字塔被重复计算')
+            return False
+
+        logger.info('✅ 派生视图已缓存')
+        return True
+
+    except Exception as e:
+        logger.error(f'❌ Frame缓存测试失败: {e}')
+        return False
+
+
+def test_frame_as_array():
+    """测试Frame可以当作图片数组使用"""
+    logger.hr('测试Frame数组兼容', level=0)
+
+    try:
+        frame = create_test_frame()
+        area = (100, 200, 300, 400)
+
+        if not np.array_equal(crop(frame, area), crop(frame.image, area)):
+            logger.error('❌ 裁剪结果不一致')
+            return False
+        if np.asarray(frame) is not frame.image:
+            logger.error('❌ np.asarray 未返回原始像素')
+            return False
+
+        logger.info('✅ Frame数组兼容')
+        return True
+
+    except Exception as e:
+        logger.error(f'❌ Frame数组兼容测试失败: {e}')
+        return False
+
+
+def test_frame_get_color():
+    """测试积分图颜色与裁剪均值一致"""
+    logger.hr('测试积分图颜色', level=0)
+
+    try:
+        frame = create_test_frame()
+
+        test_cases = [
+            ((100, 200, 300, 400), '中心区域'),
+            ((0, 0, 800, 600), '全图'),
+            ((200, 150, 201, 151), '最小区域(1x1)'),
+            ((700, 500, 900, 700), '超出边界'),
+        ]
+
+        for area, desc in test_cases:
+            expected = get_color(frame.image, area)
+            detected = get_color(frame, area)
+            logger.info(f'{desc} {area}: 裁剪{tuple(int(c) for c in expected)} 积分图{detected}')
+            if tuple(expected) != detected:
+                logger.error(f'❌ {desc} 颜色不一致')
+                return False
+
+        if get_color_integral(frame.integral, (300, 300, 300, 400)) != (0, 0, 0):
+            logger.error('❌ 空区域颜色不正确')
+            return False
+
+        # 积分图用int32，内存是float64的一半
+        if frame.integral.dtype != np.int32:
+            logger.error(f'❌ 积分图类型不正确: {frame.integral.dtype}')
+            return False
+
+        logger.info('✅ 积分图颜色正确')
+        return True
+
+    except Exception as e:
+        logger.error(f'❌ 积分图颜色测试失败: {e}')
+        return False
+
+
+if __name__ == '__main__':
+    results = []
+
+    # 运行所有测试
+    results.append(('派生视图', test_frame_views()))
+    results.append(('视图缓存', test_frame_memoize()))
+    results.append(('数组兼容', test_frame_as_array()))
+    results.append(('积分图颜色', test_frame_get_color()))
+
+    # 输出测试结果
+    logger.hr('测试结果汇总', level=0)
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = '✅ 通过' if result else '❌ 失败'
+        logger.info(f'{name}: {status}')
+
+    logger.hr(f'总计: {passed}/{total} 通过', level=0)
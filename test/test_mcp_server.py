@@ -0,0 +1,145 @@
+"""
+测试MCP服务的stdio输出
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.logger import logger
+import json
+import subprocess
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_console_to_stderr():
+    """测试日志改为输出到stderr（不需要设备）"""
+    logger.hr('测试日志输出到stderr', level=0)
+
+    try:
+        code = (
+            'from module.logger import logger, console_to_stderr\n'
+            'console_to_stderr()\n'
+            'logger.info("mobile-use log line")\n'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=30)
+        logger.info(f'stdout: {result.stdout!r}')
+        logger.info(f'stderr: {result.stderr!r}')
+
+        if result.stdout == '' and 'mobile-use log line' in result.stderr:
+            logger.info('✅ 日志只输出到stderr')
+            return True
+        else:
+            logger.error('❌ 日志仍输出到stdout')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 日志输出测试失败: {e}')
+        return False
+
+
+def test_mcp_stdio_protocol():
+    """测试stdio模式下stdout只有JSON-RPC消息（需要mcp包，不需要设备）"""
+    logger.hr('测试MCP stdio输出', level=0)
+
+    try:
+        import mcp
+    except ImportError:
+        logger.warning('⚠️  未安装mcp，跳过MCP stdio测试')
+        return True
+
+    process = None
+    try:
+        process = subprocess.Popen(
+            [sys.executable, 'mcp_server.py'], cwd=ROOT,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        # 服务卡住时结束进程，readline随之返回
+        timer = threading.Timer(60, process.kill)
+        timer.start()
+
+        def send(message):
+            process.stdin.write(json.dumps(message) + '\n')
+            process.stdin.flush()
+
+        def receive(request_id):
+            lines = []
+            while True:
+                line = process.stdout.readline()
+                if not line:
+                    return lines, None
+                lines.append(line)
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    # 非协议内容，最后统一检查
+                    continue
+                if isinstance(message, dict) and message.get('id') == request_id:
+                    return lines, message
+
+        send({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {
+            'protocolVersion': '2024-11-05',
+            'capabilities': {},
+            'clientInfo': {'name': 'test', 'version': '0'},
+        }})
+        lines, initialized = receive(1)
+        send({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        # 等OCR后台预热输出日志（成功或失败），再请求工具列表
+        time.sleep(2)
+        send({'jsonrpc': '2.0', 'id': 2, 'method': 'tools/list'})
+        more, tools = receive(2)
+        lines += more
+
+        process.stdin.close()
+        lines += process.stdout.readlines()
+        process.wait(timeout=10)
+        timer.cancel()
+
+        # stdout每一行都必须是JSON-RPC消息
+        frames = 0
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                logger.error(f'❌ stdout出现非协议内容: {line!r}')
+                return False
+            if not isinstance(message, dict) or message.get('jsonrpc') != '2.0':
+                logger.error(f'❌ stdout出现非JSON-RPC消息: {line!r}')
+                return False
+            frames += 1
+
+        logger.info(f'stdout消息数: {frames}')
+        if initialized is not None and tools is not None and 'result' in tools:
+            logger.info('✅ stdout只有JSON-RPC消息')
+            return True
+        else:
+            logger.error('❌ MCP服务没有正确响应')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ MCP stdio测试失败: {e}')
+        return False
+    finally:
+        if process is not None and process.poll() is None:
+            process.kill()
+
+
+if __name__ == '__main__':
+    results = []
+
+    # 运行所有测试
+    results.append(('日志输出到stderr', test_console_to_stderr()))
+    results.append(('MCP stdio输出', test_mcp_stdio_protocol()))
+
+    # 输出测试结果
+    logger.hr('测试结果汇总', level=0)
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = '✅ 通过' if result else '❌ 失败'
+        logger.info(f'{name}: {status}')
+
+    logger.hr(f'总计: {passed}/{total} 通过', level=0)
@@ -6,6 +6,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from module.ocr.ocr import OCR
+from module.ocr.cache import OcrCache, region_key
+from module.ocr.result import OcrLine, OcrResult, to_quad
 from module.logger import logger
 from module.base.utils import load_image
 import numpy as np
@@ -53,6 +55,33 @@ def create_test_image(text, size=(400, 100), font_size=40):
     return img_bgr
 
 
+def test_ocr_warmup():
+    """测试后台预热OCR模型"""
+    logger.hr('测试后台预热OCR模型', level=0)
+
+    try:
+        import time
+        start = time.time()
+        ready = OCR.warmup()
+        logger.info(f'warmup() 返回耗时: {time.time() - start:.3f}s')
+
+        ready.result(timeout=600)
+        logger.info(f'模型就绪耗时: {time.time() - start:.1f}s')
+
+        # 仅识别和仅检测模型也一起加载，首次调用不再等待
+        loaded = OCR._ocr_model is not None and OCR._rec_model is not None and OCR._det_model is not None
+        if OCR.warmup() is ready and loaded:
+            logger.info('✅ OCR后台预热成功')
+            return True
+        else:
+            logger.error('❌ OCR预热状态不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ OCR预热失败: {e}')
+        return False
+
+
 def test_ocr_basic():
     """测试基本OCR识别 - 使用固定文字"""
     logger.hr('测试基本OCR识别', level=0)
@@ -141,6 +170,89 @@ def test_ocr_numbers():
         return False
 
 
+def test_ocr_recognize_many():
+    """测试仅识别模式批量读取固定区域"""
+    logger.hr('测试批量仅识别', level=0)
+
+    try:
+        # 三个固定位置的数字，纵向拼接
+        numbers = ['123', '4567', '89']
+        full_image = np.vstack([create_test_image(text, size=(300, 80), font_size=50) for text in numbers])
+        areas = [(0, 80 * i, 300, 80 * (i + 1)) for i in range(len(numbers))]
+
+        ocr = OCR()
+        lines = ocr.recognize_many(full_image, areas)
+
+        for text, line in zip(numbers, lines):
+            logger.info(f'预期: {text}, 识别: {line.text}, 置信度: {line.score:.3f}')
+
+        matched = sum(1 for text, line in zip(numbers, lines) if text in line.text)
+        if len(lines) == len(numbers) and matched > 0:
+            logger.info(f'✅ 批量仅识别成功 ({matched}/{len(numbers)})')
+            return True
+        else:
+            logger.error('❌ 批量仅识别未识别到数字')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 批量仅识别失败: {e}')
+        return False
+
+
+def test_glyph_ocr():
+    """测试字形模板OCR（不需要模型）"""
+    logger.hr('测试字形模板OCR', level=0)
+
+    try:
+        import time
+        from module.ocr.glyph import GlyphOCR
+
+        font = ImageFont.load_default(size=40)
+        glyph = GlyphOCR.from_font(font, '0123456789:')
+
+        def render(text):
+            img = Image.new('RGB', (40 * len(text) + 40, 80), color='white')
+            ImageDraw.Draw(img).text((20, 10), text, fill='black', font=font)
+            return np.array(img)
+
+        texts = ['9527', '12:30', '100', '8080808']
+        correct = 0
+        cost = 0.
+        for text in texts:
+            image = render(text)
+            start = time.perf_counter()
+            result, score = glyph.recognize(image)
+            cost += time.perf_counter() - start
+            logger.info(f'预期: {text}, 识别: {result}, 置信度: {score:.3f}')
+            correct += result == text
+        cost = cost / len(texts) * 1000
+        logger.info(f'平均耗时: {cost:.3f}ms')
+
+        # 作为OCR后端使用，高置信度时不会调用PaddleOCR
+        image = render('2048')
+        backend_text = OCR(backend=glyph).ocr_single_line(
+            image, area=(0, 0, image.shape[1], image.shape[0]), detect=False)
+        logger.info(f'后端识别: {backend_text}')
+
+        # 跳过检测时必须指定区域，不会把整张截图当成一行
+        try:
+            OCR(backend=glyph).ocr_single_line(image, detect=False)
+            no_area = False
+        except ValueError:
+            no_area = True
+
+        if correct == len(texts) and backend_text == '2048' and no_area and cost < 5:
+            logger.info('✅ 字形模板OCR识别正确')
+            return True
+        else:
+            logger.error('❌ 字形模板OCR识别错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 字形模板OCR失败: {e}')
+        return False
+
+
 def test_ocr_area():
     """测试区域OCR识别"""
     logger.hr('测试区域OCR识别', level=0)
@@ -178,6 +290,37 @@ def test_ocr_area():
         return False
 
 
+def test_ocr_many():
+    """测试多区域批量OCR"""
+    logger.hr('测试多区域批量OCR', level=0)
+
+    try:
+        texts = ['Start', 'Setting', 'Mail']
+        full_image = np.vstack([create_test_image(text, size=(400, 100)) for text in texts])
+        areas = [(0, 100 * i, 400, 100 * (i + 1)) for i in range(len(texts))]
+
+        ocr = OCR()
+        results = ocr.ocr_many(full_image, areas)
+
+        matched = 0
+        for text, area, result in zip(texts, areas, results):
+            logger.info(f'区域 {area}: 预期 {text}, 识别 {result.text}')
+            # 识别框应该落在各自区域内
+            if result and text.lower() in result.text.lower() and result.in_area(area):
+                matched += 1
+
+        if len(results) == len(texts) and matched > 0:
+            logger.info(f'✅ 多区域批量OCR成功 ({matched}/{len(texts)})')
+            return True
+        else:
+            logger.error('❌ 多区域批量OCR未识别到文字')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 多区域批量OCR失败: {e}')
+        return False
+
+
 def test_ocr_empty_image():
     """测试空白图片（负面测试）"""
     logger.hr('测试空白图片', level=0)
@@ -204,6 +347,500 @@ def test_ocr_empty_image():
         return False
 
 
+def test_ocr_result_index():
+    """测试OCR结果空间查询 - 使用构造的识别结果，不需要模型"""
+    logger.hr('测试OCR结果空间查询', level=0)
+
+    try:
+        result = OcrResult([
+            OcrLine('名称:', to_quad([[10, 10], [80, 40]]), 0.99),
+            OcrLine('张三', to_quad([[100, 12], [160, 38]]), 0.95),
+            OcrLine('年龄:', to_quad([[10, 60], [80, 90]]), 0.98),
+            OcrLine('18', to_quad([[100, 60], [130, 90]]), 0.97),
+        ])
+
+        value = result.right_of('名称')
+        below = result.below('名称')
+        nearest = result.nearest(125, 100)
+        inside = [line.text for line in result.in_area((0, 0, 200, 50))]
+
+        logger.info(f'"名称"右侧: {value.text if value else None}')
+        logger.info(f'"名称"下方: {below.text if below else None}')
+        logger.info(f'离(125, 100)最近: {nearest.text if nearest else None}')
+        logger.info(f'区域内: {inside}')
+
+        if (value is not None and value.text == '张三' and below.text == '年龄:'
+                and nearest.text == '18' and inside == ['名称:', '张三']):
+            logger.info('✅ OCR结果空间查询正确')
+            return True
+        else:
+            logger.error('❌ OCR结果空间查询错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ OCR结果空间查询失败: {e}')
+        return False
+
+
+def test_ocr_text_index():
+    """测试模糊文字查找（不需要模型）"""
+    logger.hr('测试模糊文字查找', level=0)
+
+    try:
+        from module.ocr.text_index import normalize_text
+
+        def line(text, y, score=0.9):
+            return OcrLine(text, to_quad([(100, y), (300, y + 30)]), score)
+
+        result = OcrResult([
+            line('百度一下，你就知道', 0),
+            line('Sett1ng', 100, 0.8),
+            line('ＬＯＧＩＮ', 200),
+            line('Setting', 300, 0.99),
+        ])
+
+        cases = [
+            ('百度一下', '百度一下，你就知道'),  # 包含
+            ('setting', 'Setting'),               # 大小写，同样命中时置信度高者优先
+            ('LOG1N', 'ＬＯＧＩＮ'),             # 全角和易混字符
+            ('Settng', 'Setting'),                # 编辑距离1
+            ('退出', None),
+        ]
+        ok = normalize_text('Ｌ ｏ Ｇ') == '10g'
+        for target, expected in cases:
+            found = result.match(target)
+            text = found.text if found is not None else None
+            logger.info(f'查找 "{target}": {text}')
+            ok = ok and text == expected
+
+        if ok:
+            logger.info('✅ 模糊文字查找正确')
+            return True
+        else:
+            logger.error('❌ 模糊文字查找结果不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 模糊文字查找失败: {e}')
+        return False
+
+
+def test_ocr_preprocess():
+    """测试OCR预处理（不需要模型）"""
+    logger.hr('测试OCR预处理', level=0)
+
+    try:
+        from module.ocr.preprocess import Preprocess
+
+        preprocess = Preprocess(det_max_side=960, min_height=32, target_height=48, binarize=True)
+        screen = np.full((2400, 1080, 3), 200, dtype=np.uint8)
+        small, det_scale = preprocess.downscale(screen)
+        tiny = np.full((16, 60, 3), 200, dtype=np.uint8)
+        tiny[4:12, 10:50] = 30
+        large, rec_scale = preprocess.upscale(tiny)
+        binary = preprocess.enhance(tiny)
+
+        logger.info(f'检测缩小: {screen.shape} -> {small.shape}, 比例 {det_scale:.3f}')
+        logger.info(f'小字放大: {tiny.shape} -> {large.shape}, 比例 {rec_scale:.3f}')
+        logger.info(f'二值化: 文字 {binary[8, 30].tolist()}, 背景 {binary[0, 0].tolist()}')
+
+        # 框坐标按比例映射回原图
+        mapped = OcrResult([OcrLine('a', to_quad([(0, 0), (480, 96)]), 1.)]).scale(1 / det_scale)
+
+        if max(small.shape[:2]) == 960 and large.shape[0] == 48 \
+                and binary[8, 30].tolist() == [0, 0, 0] and binary[0, 0].tolist() == [255, 255, 255] \
+                and mapped.boxes[0].tolist() == [0, 0, 1200, 240]:
+            logger.info('✅ OCR预处理正确')
+            return True
+        else:
+            logger.error('❌ OCR预处理结果不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ OCR预处理失败: {e}')
+        return False
+
+
+def test_ocr_cache():
+    """测试OCR结果缓存 - 不需要模型"""
+    logger.hr('测试OCR结果缓存', level=0)
+
+    try:
+        import tempfile
+
+        result = OcrResult([OcrLine('设置', to_quad([[0, 0], [40, 20]]), 0.99)])
+        title = create_test_image('Settings')
+        other = create_test_image('Mail')
+
+        key = region_key(title, 'paddleocr|ch')
+        if key != region_key(title.copy(), 'paddleocr|ch') or key == region_key(title, 'paddleocr|en'):
+            logger.error('❌ 缓存键不稳定')
+            return False
+
+        with tempfile.TemporaryDirectory() as folder:
+            file = os.path.join(folder, 'ocr_cache.db')
+            cache = OcrCache(max_entries=1, file=file)
+            cache.put(key, result)
+            cache.put(region_key(other), result)
+            evicted = len(cache) == 1
+            cache.close()
+
+            # 重新打开，从SQLite读取
+            cache = OcrCache(file=file)
+            cached = cache.get(key)
+            cache.close()
+
+        logger.info(f'缓存命中: {cached}')
+
+        if evicted and cached is not None and cached.texts == ['设置']:
+            logger.info('✅ OCR结果缓存正确')
+            return True
+        else:
+            logger.error('❌ OCR结果缓存错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ OCR结果缓存测试失败: {e}')
+        return False
+
+
+class FlakyModel:
+    """第一次调用抛出异常，之后正常返回的模拟PaddleOCR 2.x模型"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def ocr(self, image, det=True, rec=True, cls=True):
+        self.calls += 1
+        if self.calls == 1:
+            raise MemoryError('模拟显存不足')
+        if not det:
+            # 仅识别，image为[图片列表]
+            return [[('Hello', 0.9) for _ in image[0]]]
+        return [[[[[0, 0], [40, 0], [40, 20], [0, 20]], ('Hello', 0.9)]]]
+
+
+def test_ocr_failure_not_cached():
+    """测试识别失败不写入缓存 - 不需要模型"""
+    logger.hr('测试识别失败不写入缓存', level=0)
+
+    import tempfile
+
+    model, rec_model = OCR._ocr_model, OCR._rec_model
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            OCR.enable_cache(file=os.path.join(folder, 'ocr_cache.db'))
+            image = create_test_image('Hello')
+
+            OCR._ocr_model = FlakyModel()
+            first = OCR().ocr(image)
+            second = OCR().ocr(image)
+
+            OCR._rec_model = FlakyModel()
+            rec_first = OCR().recognize(image).text
+            rec_second = OCR().recognize(image).text
+
+            # 低置信度结果回退PaddleOCR失败时，保留的后端结果也不缓存
+            from module.ocr.ocr import OcrBackend
+
+            class UnsureBackend(OcrBackend):
+                name = 'unsure'
+                min_score = 0.5
+
+                def recognize_batch(self, images):
+                    return [('?', 0.1) for _ in images]
+
+            OCR._rec_model = FlakyModel()
+            fallback_first = OCR(backend=UnsureBackend()).recognize(image).text
+            fallback_second = OCR(backend=UnsureBackend()).recognize(image).text
+            OCR.disable_cache()
+
+        try:
+            OcrBackend()
+            abstract = False
+        except TypeError:
+            abstract = True
+
+        logger.info(f'检测识别: {first!r} -> {second!r}, 仅识别: {rec_first!r} -> {rec_second!r}, '
+                    f'回退: {fallback_first!r} -> {fallback_second!r}')
+
+        if first == '' and second == 'Hello' and rec_first == '' and rec_second == 'Hello' \
+                and fallback_first == '?' and fallback_second == 'Hello' and abstract:
+            logger.info('✅ 失败结果未缓存，下次调用重新识别')
+            return True
+        else:
+            logger.error('❌ 失败结果被缓存')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 识别失败缓存测试出错: {e}')
+        return False
+    finally:
+        OCR.disable_cache()
+        OCR._ocr_model, OCR._rec_model = model, rec_model
+
+
+def test_ocr_incremental():
+    """测试增量OCR（不需要模型）"""
+    logger.hr('测试增量OCR', level=0)
+
+    from module.ocr.incremental import IncrementalOCR
+
+    class RegionOCR:
+        """全屏时每180像素高返回一行，区域时返回一行，文字为像素均值"""
+        def __init__(self):
+            self.calls = []
+            self.fail = False
+
+        def ocr_many(self, image, areas, strict=False):
+            self.calls.append(areas)
+            h, w = image.shape[:2]
+            results = []
+            for area in areas:
+                if self.fail:
+                    results.append(None if strict else OcrResult())
+                    continue
+                boxes = [area] if area is not None else [(0, y, w, y + 180) for y in range(0, h, 180)]
+                results.append(OcrResult([
+                    OcrLine(str(int(image[y1:y2, x1:x2].mean())), to_quad([(x1, y1), (x2, y2)]), 1.)
+                    for x1, y1, x2, y2 in boxes
+                ]))
+            return results
+
+    try:
+        model = RegionOCR()
+        ocr = IncrementalOCR(ocr=model)
+        image = np.full((720, 1280, 3), 200, dtype=np.uint8)
+
+        first = ocr.ocr_detail(image)
+        same = ocr.ocr_detail(image.copy())
+        image[300:320, 600:700] = 0
+        changed = ocr.ocr_detail(image)
+        changed_ratio = ocr.dirty_ratio
+
+        # 识别失败不当作无文字保存，下一帧重新全屏识别
+        image[500:520, 600:700] = 0
+        model.fail = True
+        failed = ocr.ocr_detail(image)
+        model.fail = False
+        recovered = ocr.ocr_detail(image)
+        retried = model.calls[-1] == [None] and len(recovered) == len(first)
+        retried = retried and recovered.texts[2] != first.texts[2] and len(failed) < len(first)
+
+        logger.info(f'首帧: {first}, 调用 {model.calls[0]}')
+        logger.info(f'不变帧: {same}, 调用次数 {len(model.calls)}')
+        logger.info(f'局部变化: {changed}, 调用 {model.calls[1]}, 变化比例 {changed_ratio:.3f}')
+        logger.info(f'识别失败: {failed}, 恢复后: {recovered}, 调用 {model.calls[-1]}')
+
+        # 变化区域扩展到它碰到的整行，其他行沿用上一帧
+        ok = model.calls[0] == [None] and same is first and len(model.calls) == 4
+        ok = ok and model.calls[1] == [(0, 180, 1280, 360)]
+        ok = ok and changed.texts[0] == first.texts[0] and changed.texts[2:] == first.texts[2:]
+        ok = ok and changed.texts[1] != first.texts[1] and 0 < changed_ratio < 0.1 and retried
+        if ok:
+            logger.info('✅ 增量OCR只重新识别变化区域')
+            return True
+        else:
+            logger.error('❌ 增量OCR结果不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 增量OCR失败: {e}')
+        return False
+
+
+def test_tiled_merge():
+    """测试分带OCR结果合并（不需要模型）"""
+    logger.hr('测试分带OCR结果合并', level=0)
+
+    try:
+        from module.ocr.tiled import merge_bands, split_bands
+
+        bands = split_bands(1000, band=600, overlap=200)
+
+        def line(text, y1, y2, score=0.9):
+            return OcrLine(text, to_quad([(100, y1), (300, y2)]), score)
+
+        # 重叠区 400-600：两个带都识别到"重复"，上带里"截断"被边缘切开
+        upper = OcrResult([line('顶部', 50, 80), line('重复', 450, 480), line('截', 570, 600)])
+        lower = OcrResult([line('重复', 451, 481, 0.8), line('截断', 570, 610), line('底部', 900, 930)])
+        merged = merge_bands([upper, lower], bands, 1000)
+
+        logger.info(f'分带: {bands}')
+        logger.info(f'合并结果: {merged.texts}')
+
+        if bands == [(0, 600), (400, 1000)] and merged.texts == ['顶部', '重复', '截断', '底部'] \
+                and abs(merged[1].score - 0.9) < 1e-6:
+            logger.info('✅ 分带结果合并正确')
+            return True
+        else:
+            logger.error('❌ 分带结果合并错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 分带结果合并失败: {e}')
+        return False
+
+
+def test_tiled_pool():
+    """测试分带OCR进程池按进程数共享，结果超时返回空（不需要模型）"""
+    logger.hr('测试分带OCR进程池', level=0)
+
+    from concurrent.futures import Future
+    from module.ocr import tiled
+
+    class HangingPool:
+        def __init__(self):
+            self.futures = []
+
+        def submit(self, fn, *args):
+            # 模拟卡住的进程，结果永远不返回
+            future = Future()
+            self.futures.append(future)
+            return future
+
+    ocr_pool = tiled.ocr_pool
+    pools = []
+    try:
+        # 不同进程数各用一个池，互不关闭
+        pools = [tiled.ocr_pool(1), tiled.ocr_pool(2)]
+        shared = tiled.ocr_pool(1) is pools[0] and pools[0] is not pools[1]
+        alive = not pools[0]._shutdown_thread
+
+        hanging = HangingPool()
+        tiled.ocr_pool = lambda workers=None: hanging
+        image = np.zeros((1000, 100, 3), dtype=np.uint8)
+        ocr = tiled.TiledOCR(band=600, overlap=200, timeout=0.2)
+        try:
+            result = ocr.ocr_detail(image)
+        finally:
+            ocr.close()
+        timeout = len(result) == 0 and len(hanging.futures) == 2 \
+            and all(future.cancelled() for future in hanging.futures)
+
+        logger.info(f'共享: {shared}, 未关闭: {alive}, 超时: {timeout}')
+
+        if shared and alive and timeout:
+            logger.info('✅ 分带OCR进程池正确')
+            return True
+        else:
+            logger.error('❌ 分带OCR进程池错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 分带OCR进程池测试失败: {e}')
+        return False
+    finally:
+        tiled.ocr_pool = ocr_pool
+        with tiled._pool_lock:
+            for pool in pools:
+                pool.shutdown(wait=False)
+            tiled._pools.clear()
+
+
+def test_ocr_server():
+    """测试共享OCR服务"""
+    logger.hr('测试共享OCR服务', level=0)
+
+    from module.ocr.server import OcrServer
+    address = ('127.0.0.1', 22269)
+    server = OcrServer(address, replicas=1)
+    try:
+        server.start()
+        test_image = create_test_image('Server', size=(400, 100))
+        local = OCR().ocr(test_image)
+
+        # 预处理配置随请求发送到服务端
+        from module.ocr.preprocess import Preprocess
+        preprocess = Preprocess(min_height=200, target_height=240, binarize=True)
+        local_detail = OCR(preprocess=preprocess).ocr_detail(test_image)
+
+        area = (0, 20, 400, 100)
+        local_line = OCR().ocr_single_line(test_image, area=area, detect=False)
+
+        OCR.use_server(address)
+        remote = OCR().ocr(test_image)
+        remote_detail = OCR(preprocess=preprocess).ocr_detail(test_image)
+        # 仅识别模式也走服务端，客户端不加载识别模型，开启缓存时也发送整张图
+        rec_model, OCR._rec_model = OCR._rec_model, None
+        OCR.enable_cache()
+        try:
+            remote_line = OCR().ocr_single_line(test_image, area=area, detect=False)
+            loaded = OCR._rec_model is not None
+        finally:
+            OCR.disable_cache()
+            OCR._rec_model = rec_model
+        logger.info(f'本地识别: {local}, 服务识别: {remote}')
+        logger.info(f'预处理本地: {local_detail.boxes.tolist()}, 服务: {remote_detail.boxes.tolist()}')
+        logger.info(f'仅识别本地: {local_line}, 服务: {remote_line}, 客户端加载模型: {loaded}')
+
+        if remote and remote == local and remote_detail.texts == local_detail.texts \
+                and np.allclose(remote_detail.boxes, local_detail.boxes) \
+                and remote_line and remote_line == local_line and not loaded:
+            logger.info('✅ 共享OCR服务结果与本地一致')
+            return True
+        else:
+            logger.error('❌ 共享OCR服务结果不一致')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 共享OCR服务失败: {e}')
+        return False
+    finally:
+        OCR.disable_server()
+        server.close()
+
+
+def test_ocr_server_auth():
+    """测试共享OCR服务的认证 - 不需要模型"""
+    logger.hr('测试共享OCR服务认证', level=0)
+
+    import stat
+    from multiprocessing import AuthenticationError
+    from module.ocr.server import OcrClient, OcrServer, authkey_file, load_authkey
+
+    address = ('127.0.0.1', 22270)
+    server = OcrServer(address, replicas=1)
+    try:
+        server.start()
+        file = authkey_file(address)
+        mode = stat.S_IMODE(os.stat(file).st_mode)
+        same_key = load_authkey(address) == server.authkey
+
+        rejected = False
+        client = OcrClient(address, authkey=b'mobile-use-ocr')
+        try:
+            client.ocr_many(np.zeros((10, 10, 3), dtype=np.uint8), [None])
+        except AuthenticationError:
+            rejected = True
+        finally:
+            client.close()
+
+        # 服务不可用时返回空结果，且不写入缓存
+        OCR.enable_cache()
+        OCR.use_server(('127.0.0.1', 22271), authkey=server.authkey)
+        text = OCR().ocr(create_test_image('Server'))
+        cached = len(OCR.cache)
+
+        logger.info(f'密钥文件权限: {oct(mode)}, 错误密钥被拒绝: {rejected}, 失败缓存数: {cached}')
+
+        if mode == 0o600 and same_key and len(server.authkey) >= 32 and rejected \
+                and text == '' and cached == 0:
+            logger.info('✅ 随机密钥仅本用户可读，错误密钥被拒绝')
+            return True
+        else:
+            logger.error('❌ 共享OCR服务认证不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 共享OCR服务认证测试失败: {e}')
+        return False
+    finally:
+        OCR.disable_server()
+        OCR.disable_cache()
+        server.close()
+
+
 def test_ocr_real_screenshot():
     """测试真实截图（可选）"""
     logger.hr('测试真实截图（可选）', level=0)
@@ -240,11 +877,25 @@ if __name__ == '__main__':
     results = []
 
     # 运行所有测试
+    results.append(('后台预热', test_ocr_warmup()))
     results.append(('基本OCR', test_ocr_basic()))
     results.append(('中文识别', test_ocr_chinese()))
     results.append(('数字识别', test_ocr_numbers()))
+    results.append(('批量仅识别', test_ocr_recognize_many()))
+    results.append(('字形模板OCR', test_glyph_ocr()))
     results.append(('区域OCR', test_ocr_area()))
+    results.append(('多区域批量OCR', test_ocr_many()))
     results.append(('空白图片', test_ocr_empty_image()))
+    results.append(('结果空间查询', test_ocr_result_index()))
+    results.append(('模糊文字查找', test_ocr_text_index()))
+    results.append(('OCR预处理', test_ocr_preprocess()))
+    results.append(('结果缓存', test_ocr_cache()))
+    results.append(('失败不缓存', test_ocr_failure_not_cached()))
+    results.append(('增量OCR', test_ocr_incremental()))
+    results.append(('分带结果合并', test_tiled_merge()))
+    results.append(('分带进程池', test_tiled_pool()))
+    results.append(('共享OCR服务', test_ocr_server()))
+    results.append(('共享OCR服务认证', test_ocr_server_auth()))
     results.append(('真实截图', test_ocr_real_screenshot()))
 
     # 输出测试结果
@@ -6,7 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from module.logger import logger
-from paddleocr import PaddleOCR
+from module.ocr.ocr import OCR
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
@@ -61,26 +61,12 @@ def find_text_position(image, target_text):
     Returns:
         tuple: (center_x, center_y, bbox) 或 None
     """
-    ocr_model = PaddleOCR(lang='ch', show_log=False)
-    result = ocr_model.ocr(image)
-
-    if not result or len(result) == 0:
+    line = OCR().ocr_detail(image).find_one(target_text)
+    if line is None:
         return None
 
-    page_result = result[0]
-
-    if isinstance(page_result, dict):
-        rec_texts = page_result.get('rec_texts', [])
-        dt_polys = page_result.get('dt_polys', [])
-
-        for i, text in enumerate(rec_texts):
-            if target_text in text or text in target_text:
-                poly = dt_polys[i]
-                center_x = int(np.mean([p[0] for p in poly]))
-                center_y = int(np.mean([p[1] for p in poly]))
-                return (center_x, center_y, poly)
-
-    return None
+    center_x, center_y = line.center
+    return (center_x, center_y, line.poly)
 
 
 def test_locate_single_text():
@@ -141,34 +127,26 @@ def test_locate_multiple_texts():
         test_image, expected_positions = create_test_image_with_positions(texts, positions)
 
         # 使用OCR识别所有文字
-        ocr_model = PaddleOCR(lang='ch', show_log=False)
-        result = ocr_model.ocr(test_image)
-
-        if result and len(result) > 0:
-            page_result = result[0]
-            if isinstance(page_result, dict):
-                rec_texts = page_result.get('rec_texts', [])
-                dt_polys = page_result.get('dt_polys', [])
-
-                logger.info(f'识别到 {len(rec_texts)} 个文字区域')
-
-                found_count = 0
-                for i, text in enumerate(rec_texts):
-                    poly = dt_polys[i]
-                    center_x = int(np.mean([p[0] for p in poly]))
-                    center_y = int(np.mean([p[1] for p in poly]))
-                    logger.info(f'文字 "{text}" 在 ({center_x}, {center_y})')
-
-                    # 检查是否是我们放置的文字
-                    if any(expected_text in text or text in expected_text for expected_text in texts):
-                        found_count += 1
-
-                if found_count > 0:
-                    logger.info(f'✅ 定位多个文字成功 (找到 {found_count}/{len(texts)} 个)')
-                    return True
-                else:
-                    logger.error('❌ 未找到任何预期文字')
-                    return False
+        result = OCR().ocr_detail(test_image)
+
+        if result:
+            logger.info(f'识别到 {len(result)} 个文字区域')
+
+            found_count = 0
+            for line in result:
+                center_x, center_y = line.center
+                logger.info(f'文字 "{line.text}" 在 ({center_x}, {center_y})')
+
+                # 检查是否是我们放置的文字
+                if any(expected_text in line.text or line.text in expected_text for expected_text in texts):
+                    found_count += 1
+
+            if found_count > 0:
+                logger.info(f'✅ 定位多个文字成功 (找到 {found_count}/{len(texts)} 个)')
+                return True
+            else:
+                logger.error('❌ 未找到任何预期文字')
+                return False
         else:
             logger.error('❌ OCR未识别到任何文字')
             return False
@@ -269,21 +247,13 @@ def test_real_screenshot_locate():
             return True
 
         # 尝试找任意文字（不验证准确性）
-        ocr_model = PaddleOCR(lang='ch', show_log=False)
-        result = ocr_model.ocr(device.image)
-
-        if result and len(result) > 0:
-            page_result = result[0]
-            if isinstance(page_result, dict):
-                rec_texts = page_result.get('rec_texts', [])
-                if len(rec_texts) > 0:
-                    logger.info(f'真实截图识别到 {len(rec_texts)} 个文字')
-                    logger.info('✅ 真实截图定位功能正常')
-                else:
-                    logger.info('⚠️  真实截图未识别到文字（可能是空白屏幕）')
-                return True
+        result = OCR().ocr_detail(device.image)
 
-        logger.info('✅ 真实截图测试完成')
+        if result:
+            logger.info(f'真实截图识别到 {len(result)} 个文字')
+            logger.info('✅ 真实截图定位功能正常')
+        else:
+            logger.info('⚠️  真实截图未识别到文字（可能是空白屏幕）')
         return True
 
     except ImportError:
@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from module.device.device import Device
+from module.device.screenshot import Screenshot, ScreenshotBackend
 from module.logger import logger
 import numpy as np
 
@@ -121,6 +122,211 @@ def test_screenshot_format():
         return False
 
 
+def test_screenshot_adb_raw_parse():
+    """测试解析原始screencap数据（模拟数据流，不需要设备）"""
+    logger.hr('测试解析原始screencap数据', level=0)
+
+    import socket
+    import struct
+
+    class RawScreenshot(Screenshot):
+        def __init__(self, data):
+            self.data = data
+
+        def adb_exec_out(self, cmd):
+            local, remote = socket.socketpair()
+            remote.sendall(self.data)
+            remote.close()
+            return local
+
+    try:
+        width, height = 8, 4
+        rgba = np.arange(width * height * 4, dtype=np.uint8).reshape((height, width, 4))
+        header = struct.pack('<III', width, height, 1)
+
+        # 旧版12字节头
+        old = RawScreenshot(header + rgba.tobytes())._screenshot_adb_raw()
+        # Android 9+ 带colorspace的16字节头
+        new = RawScreenshot(header + struct.pack('<I', 1) + rgba.tobytes())._screenshot_adb_raw()
+        # 数据被截断
+        truncated = RawScreenshot(header + rgba.tobytes()[:-10])._screenshot_adb_raw()
+        # 头部不完整
+        short = RawScreenshot(header[:6])._screenshot_adb_raw()
+        # 不支持的像素格式
+        unsupported = RawScreenshot(struct.pack('<III', width, height, 4) + rgba.tobytes())._screenshot_adb_raw()
+
+        logger.info(f'12字节头: {None if old is None else old.shape}, 16字节头: {None if new is None else new.shape}')
+        logger.info(f'截断: {truncated}, 头部不完整: {short}, 不支持的格式: {unsupported}')
+
+        if old is not None and np.array_equal(old, rgba[:, :, :3]) \
+                and new is not None and np.array_equal(new, rgba[:, :, :3]) \
+                and truncated is None and short is None and unsupported is None:
+            logger.info('✅ 原始screencap解析正确')
+            return True
+        else:
+            logger.error('❌ 原始screencap解析错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 原始screencap解析失败: {e}')
+        return False
+
+
+def test_screenshot_route():
+    """测试截图方式路由：退避、延迟排序和重新探测（不需要设备）"""
+    logger.hr('测试截图方式路由', level=0)
+
+    import time
+
+    try:
+        # 退避时间每次失败翻倍，有上限
+        backend = ScreenshotBackend('adb', '_screenshot_adb')
+        backend.record_failure()
+        first = backend.demoted_until - backend.last_used
+        backend.record_failure()
+        second = backend.demoted_until - backend.last_used
+        for _ in range(10):
+            backend.record_failure()
+        capped = backend.demoted_until - backend.last_used
+        t = backend.last_used
+        backoff = (first, second, capped) == (2.0, 4.0, 120.0)
+        backoff = backoff and backend.demoted(now=t + 1) and not backend.probe_due(now=t + 1)
+        backoff = backoff and backend.probe_due(now=t + 121) and not backend.demoted(now=t + 121)
+
+        # 成功后恢复，长时间未使用时重新测量
+        backend.record_success(0.05)
+        t = backend.last_used
+        recovered = backend.fail_streak == 0 and not backend.demoted(now=t)
+        recovered = recovered and not backend.probe_due(now=t + 1) and backend.probe_due(now=t + 31)
+
+        # 按p50延迟排序，降级的放最后，到期探测的放最前
+        screenshot = Screenshot()
+        backends = screenshot.screenshot_backends
+        now = time.time()
+        for name, latencies in [('uiautomator2', [0.30, 0.35, 0.9]), ('uiautomator2_raw', [0.08, 0.09, 0.1]),
+                                ('adb_raw', [0.05, 0.06, 0.5]), ('adb', [0.2, 0.25, 0.3])]:
+            for latency in latencies:
+                backends[name].record_success(latency)
+            backends[name].last_used = now
+        order = [b.name for b in screenshot._screenshot_route()]
+
+        backends['adb_raw'].record_failure()
+        demoted = [b.name for b in screenshot._screenshot_route()]
+
+        backends['uiautomator2'].last_used = now - 60
+        probe = [b.name for b in screenshot._screenshot_route()]
+        logger.info(f'排序: {order}, 降级后: {demoted}, 探测: {probe}')
+
+        ranked = order == ['adb_raw', 'uiautomator2_raw', 'adb', 'uiautomator2']
+        ranked = ranked and demoted == ['uiautomator2_raw', 'adb', 'uiautomator2', 'adb_raw']
+        ranked = ranked and probe == ['uiautomator2', 'uiautomator2_raw', 'adb', 'adb_raw']
+        ranked = ranked and abs(backends['adb'].p50 - 0.25) < 1e-9 and backends['adb'].p95 > 0.29
+
+        if backoff and recovered and ranked:
+            logger.info('✅ 截图方式路由正确')
+            return True
+        else:
+            logger.error(f'❌ 截图方式路由错误: backoff={backoff}, recovered={recovered}, ranked={ranked}')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 截图方式路由测试失败: {e}')
+        return False
+
+
+def test_screenshot_capture_thread():
+    """测试后台连续截图：最新帧、max_staleness和停止（模拟截图，不需要设备）"""
+    logger.hr('测试后台连续截图', level=0)
+
+    import threading
+    import time
+    from module.exception import ScreenshotError
+
+    class StubScreenshot(Screenshot):
+        def __init__(self):
+            self.count = 0
+            self.fail = False
+            self.crash = False
+
+        def _screenshot_capture(self):
+            time.sleep(0.02)
+            if self.crash:
+                raise RuntimeError('模拟意外错误')
+            if self.fail:
+                raise ScreenshotError('模拟截图失败')
+            self.count += 1
+            return np.full((4, 4, 3), self.count % 256, dtype=np.uint8)
+
+    screenshot = StubScreenshot()
+    try:
+        screenshot.start_capture(interval=0.05)
+        first = screenshot.screenshot()
+        first_id = screenshot.image_id
+        thread = screenshot._capture_thread
+
+        # 不限新鲜度时直接返回槽中的最新帧，不触发截图
+        with screenshot._capture_condition:
+            slot = screenshot._capture_latest
+            again = screenshot.screenshot()
+        instant = again is slot.image and screenshot.image_id == slot.frame_id >= first_id
+
+        # 限制新鲜度时等待新帧
+        time.sleep(0.1)
+        screenshot.screenshot(max_staleness=0.03)
+        fresh = time.time() - screenshot.image_time <= 0.1 and screenshot.image_id > first_id
+        latest = screenshot.frame is not None and screenshot.frame.frame_id == screenshot.image_id
+
+        # 截图一直失败时，超时抛出ScreenshotError
+        screenshot.fail = True
+        screenshot.capture_timeout = 0.2
+        try:
+            screenshot.screenshot(max_staleness=0.01)
+            timeout = False
+        except ScreenshotError:
+            timeout = True
+        screenshot.fail = False
+
+        # 意外异常不会结束截图线程，超时错误带上最后的异常
+        screenshot.crash = True
+        # 失败后线程等待1秒再重试，超时要覆盖一次重试
+        screenshot.capture_timeout = 1.5
+        try:
+            screenshot.screenshot(max_staleness=0.01)
+            crashed = False
+        except ScreenshotError as e:
+            crashed = isinstance(e.__cause__, RuntimeError) and thread.is_alive()
+        screenshot.crash = False
+        screenshot.capture_timeout = 2.
+        screenshot.screenshot(max_staleness=0.5)
+        recovered = thread.is_alive()
+
+        screenshot.stop_capture()
+        stopped = not screenshot.capturing and not thread.is_alive() and screenshot._capture_thread is None
+        stopped = stopped and all(t.name != 'screenshot-capture' for t in threading.enumerate())
+
+        # 停止后直接截图，帧号继续递增
+        last_id = screenshot.image_id
+        screenshot.screenshot()
+        direct = screenshot.image_id == last_id + 1
+
+        logger.info(f'立即返回: {instant}, 新鲜帧: {fresh}, 最新帧: {latest}, 超时: {timeout}, '
+                    f'意外异常: {crashed}, 恢复: {recovered}, 已停止: {stopped}, 直接截图: {direct}')
+
+        if first is not None and instant and fresh and latest and timeout and crashed and recovered \
+                and stopped and direct:
+            logger.info('✅ 后台连续截图正确')
+            return True
+        else:
+            logger.error('❌ 后台连续截图错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 后台连续截图测试失败: {e}')
+        return False
+    finally:
+        screenshot.stop_capture()
+
+
 if __name__ == '__main__':
     results = []
 
@@ -129,6 +335,9 @@ if __name__ == '__main__':
     results.append(('保存截图', test_screenshot_save()))
     results.append(('连续截图', test_screenshot_multiple()))
     results.append(('截图格式', test_screenshot_format()))
+    results.append(('原始数据解析', test_screenshot_adb_raw_parse()))
+    results.append(('截图方式路由', test_screenshot_route()))
+    results.append(('后台连续截图', test_screenshot_capture_thread()))
 
     # 输出测试结果
     logger.hr('测试结果汇总', level=0)
@@ -6,9 +6,14 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from module.device.device import Device
+from module.device.connection import Connection
+from module.device.control import Control
+from module.device.trajectory import human_trajectory
 from module.logger import logger
 import time
 
+import numpy as np
+
 
 def test_swipe_horizontal():
     """测试水平滑动"""
@@ -148,6 +153,69 @@ def test_swipe_vector():
         return False
 
 
+def test_swipe_trajectory():
+    """测试人性化滑动轨迹（不需要设备）"""
+    logger.hr('测试人性化滑动轨迹', level=0)
+
+    class FakeU2:
+        def __init__(self):
+            self.calls = []
+
+        def swipe_points(self, points, duration=0.5):
+            self.calls.append((points, duration))
+
+    class RecordControl(Connection, Control):
+        def __init__(self):
+            self.u2 = FakeU2()
+            self.swipe_rng = np.random.default_rng(7)
+
+    try:
+        p1, p2 = (100, 1000), (900, 400)
+        path = human_trajectory(p1, p2, duration=0.3, rng=42)
+        same = human_trajectory(p1, p2, duration=0.3, rng=42)
+        other = human_trajectory(p1, p2, duration=0.3, rng=43)
+
+        # 偏离直线的距离不超过弯曲上限加抖动
+        vector = np.subtract(p2, p1)
+        normal = np.array([-vector[1], vector[0]]) / np.linalg.norm(vector)
+        offset = np.abs((path - p1) @ normal)
+        logger.info(f'轨迹点数: {len(path)}, 最大偏移: {offset.max():.1f}px')
+
+        ok = path.shape == (31, 2) and np.allclose(path[0], p1) and np.allclose(path[-1], p2)
+        ok = ok and np.array_equal(path, same) and not np.array_equal(path, other)
+        ok = ok and offset.max() < 0.12 * 1000 + 5
+
+        control = RecordControl()
+        control.swipe(p1, p2, duration=0.2)
+        points, duration = control.u2.calls[0]
+        ok = ok and len(control.u2.calls) == 1 and len(points) == 21
+        ok = ok and points[0] == list(p1) and points[-1] == list(p2)
+
+        # u2每段注入int(duration * 200)个5ms步，非整数时长下实际时长误差不超过半步
+        for requested in (0.237, 0.3, 0.181, 0.5124, 0.05):
+            control.swipe(p1, p2, duration=requested)
+            points, duration = control.u2.calls[-1]
+            actual = int(duration * 200) * (len(points) - 1) / 200
+            logger.info(f'请求时长: {requested}s, 实际时长: {actual}s')
+            ok = ok and abs(actual - requested) <= 0.0051
+
+        # 贴着屏幕边缘的弯曲轨迹不超出屏幕
+        control.image = np.zeros((400, 200, 3), dtype=np.uint8)
+        edge = control._swipe_path((199, 20), (199, 380), duration=0.5)
+        ok = ok and edge.min() >= 0 and edge[:, 0].max() <= 199 and edge[:, 1].max() <= 399
+
+        if ok:
+            logger.info('✅ 滑动轨迹弯曲、可复现，一次请求发送')
+            return True
+        else:
+            logger.error('❌ 滑动轨迹不正确')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 滑动轨迹测试失败: {e}')
+        return False
+
+
 if __name__ == '__main__':
     results = []
 
@@ -157,6 +225,7 @@ if __name__ == '__main__':
     results.append(('对角线滑动', test_swipe_diagonal()))
     results.append(('不同速度', test_swipe_speed()))
     results.append(('向量滑动', test_swipe_vector()))
+    results.append(('滑动轨迹', test_swipe_trajectory()))
 
     # 输出测试结果
     logger.hr('测试结果汇总', level=0)
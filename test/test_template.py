@@ -0,0 +1,257 @@
+"""
+测试模板匹配 - 使用合成图片
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.base.button import Button
+from module.base.template import Template, match_templates, match_first_template
+from module.device.screenshot import Frame
+from module.logger import logger
+import cv2
+import numpy as np
+
+
+def create_test_screen(size=(1280, 720)):
+    """
+    创建带纹理的测试屏幕，模板匹配需要非纯色图片
+
+    Args:
+        size: 屏幕尺寸 (width, height)
+
+    Returns:
+        np.ndarray: RGB格式测试图片
+    """
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    return cv2.GaussianBlur(image, (7, 7), 0)
+
+
+def test_template_locate():
+    """测试模板定位"""
+    logger.hr('测试模板定位', level=0)
+
+    try:
+        screen = create_test_screen()
+        area = (500, 300, 620, 380)
+        button = Button(area=area, file='ICON.png')
+        button.image = screen[area[1]:area[3], area[0]:area[2]].copy()
+
+        result = button.match(Frame(screen))
+        logger.info(f'匹配结果: {result}')
+
+        if result is not None and result.area == area:
+            logger.info('✅ 模板定位正确')
+            return True
+        else:
+            logger.error(f'❌ 模板定位错误, 期望 {area}')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 模板定位失败: {e}')
+        return False
+
+
+def test_template_search_area():
+    """测试限定搜索区域"""
+    logger.hr('测试限定搜索区域', level=0)
+
+    try:
+        screen = create_test_screen()
+        area = (500, 300, 620, 380)
+        template = Template(screen[area[1]:area[3], area[0]:area[2]].copy())
+
+        inside = template.match(screen, area=(400, 200, 800, 500))
+        outside = template.match(screen, area=(0, 0, 400, 300))
+        logger.info(f'区域内: {inside}')
+        logger.info(f'区域外: {outside}')
+
+        if inside.area == area and outside.score < 0.85:
+            logger.info('✅ 搜索区域限制正确')
+            return True
+        else:
+            logger.error('❌ 搜索区域限制错误')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 限定搜索区域测试失败: {e}')
+        return False
+
+
+def test_template_repeated():
+    """测试重复元素：缩小后相同的元素都在原图上精匹配"""
+    logger.hr('测试重复元素匹配', level=0)
+
+    try:
+        # 平滑底纹加细棋盘格，干扰项棋盘格相反，缩小后与模板一样
+        yy, xx = np.mgrid[0:64, 0:64]
+        blob = 128 + 80 * np.sin(xx / 9.) * np.cos(yy / 11.)
+        checker = (xx + yy) % 2 * 60 - 30
+        icon = np.clip(blob + checker, 0, 255).astype(np.uint8)
+        decoy = np.clip(blob - checker, 0, 255).astype(np.uint8)
+
+        screen = np.full((400, 600), 90, dtype=np.uint8)
+        screen[40:104, 40:104] = decoy
+        screen[40:104, 240:304] = decoy
+        screen[200:264, 440:504] = icon
+        screen = np.stack([screen] * 3, axis=-1)
+
+        template = Template(np.stack([icon] * 3, axis=-1))
+        result = template.match(Frame(screen))
+        logger.info(f'匹配结果: {result}')
+
+        if template.level > 0 and result.area == (440, 200, 504, 264):
+            logger.info('✅ 重复元素匹配正确')
+            return True
+        else:
+            logger.error('❌ 重复元素匹配到干扰项')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 重复元素匹配失败: {e}')
+        return False
+
+
+def test_template_cache():
+    """测试同一帧重复匹配使用缓存"""
+    logger.hr('测试匹配缓存', level=0)
+
+    try:
+        screen = create_test_screen()
+        frame = Frame(screen)
+        template = Template(screen[300:380, 500:620].copy())
+
+        first = template.match(frame)
+        second = template.match(frame)
+
+        if first is second:
+            logger.info('✅ 重复匹配命中缓存')
+            return True
+        else:
+            logger.error('❌ 重复匹配未命中缓存')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 匹配缓存测试失败: {e}')
+        return False
+
+
+def test_match_templates():
+    """测试线程池批量匹配"""
+    logger.hr('测试批量模板匹配', level=0)
+
+    try:
+        screen = create_test_screen()
+        other = create_test_screen()[::-1, ::-1].copy()
+
+        buttons = []
+        for i, (x, y) in enumerate([(100, 100), (500, 300), (900, 500), (200, 600)]):
+            button = Button(area=(x, y, x + 80, y + 60), name=f'ICON_{i}')
+            source = screen if i == 2 else other
+            button.image = source[y:y + 60, x:x + 80].copy()
+            buttons.append(button)
+
+        frame = Frame(screen)
+        results = match_templates(frame, buttons)
+        expected = [button.template.match(screen) for button in buttons]
+        first = match_first_template(frame, buttons)
+
+        for button, result in zip(buttons, results):
+            logger.info(f'{button}: {result}')
+        logger.info(f'首个匹配: {first}')
+
+        # 普通数组输入时，灰度图只在调用线程转换一次
+        import module.base.template as template_module
+        to_gray = template_module.to_gray
+        calls = []
+        template_module.to_gray = lambda image: calls.append(1) or to_gray(image)
+        try:
+            array_results = match_templates(screen, buttons)
+        finally:
+            template_module.to_gray = to_gray
+        logger.info(f'数组输入灰度转换次数: {len(calls)}')
+
+        same = all(r.area == e.area and abs(r.score - e.score) < 1e-6 for r, e in zip(results, expected))
+        same = same and all(r.area == e.area for r, e in zip(array_results, expected)) and len(calls) == 1
+        if same and first is not None and first[0] == 'ICON_2':
+            logger.info('✅ 批量模板匹配正确')
+            return True
+        else:
+            logger.error('❌ 批量模板匹配结果不一致')
+            return False
+
+    except Exception as e:
+        logger.error(f'❌ 批量模板匹配失败: {e}')
+        return False
+
+
+def test_asset_pack():
+    """测试模板资源包编译和内存映射加载"""
+    logger.hr('测试模板资源包', level=0)
+
+    try:
+        import tempfile
+        from module.base.assets import compile_assets, load_assets
+
+        screen = create_test_screen()
+        area = (500, 300, 620, 380)
+        icon = Button(area=area, file='ICON.png', search=(400, 200, 800, 500))
+        icon.image = screen[area[1]:area[3], area[0]:area[2]].copy()
+        color = Button(area=(0, 0, 100, 100), color=(255, 255, 255), name='WHITE')
+
+        with tempfile.TemporaryDirectory() as folder:
+            file = os.path.join(folder, 'assets.npy')
+            compile_assets([icon, color], file)
+            pack = load_assets(file)
+
+            loaded = pack['ICON']
+            result = loaded.match(Frame(screen))
+            logger.info(f'资源包: {pack}')
+            logger.info(f'匹配结果: {result}')
+
+            if (result is not None and result.area == area and loaded.search == icon.search
+                    and pack['WHITE'].color == color.color
+                    and np.array_equal(loaded.image, icon.image)):
+                logger.info('✅ 模板资源包正确')
+                success = True
+            else:
+                logger.error('❌ 模板资源包内容不一致')
+                success = False
+            del pack, loaded
+
+            # 未命名按钮都叫BUTTON，同名时编译报错而不是丢掉前面的按钮
+            try:
+                compile_assets([Button(area=(0, 0, 10, 10)), Button(area=(10, 10, 20, 20))], file)
+                logger.error('❌ 重名按钮没有报错')
+                success = False
+            except ValueError as e:
+                logger.info(f'重名按钮: {e}')
+            return success
+
+    except Exception as e:
+        logger.error(f'❌ 模板资源包测试失败: {e}')
+        return False
+
+
+if __name__ == '__main__':
+    results = []
+
+    # 运行所有测试
+    results.append(('模板定位', test_template_locate()))
+    results.append(('搜索区域', test_template_search_area()))
+    results.append(('重复元素', test_template_repeated()))
+    results.append(('匹配缓存', test_template_cache()))
+    results.append(('批量匹配', test_match_templates()))
+    results.append(('资源包', test_asset_pack()))
+
+    # 输出测试结果
+    logger.hr('测试结果汇总', level=0)
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = '✅ 通过' if result else '❌ 失败'
+        logger.info(f'{name}: {status}')
+
+    logger.hr(f'总计: {passed}/{total} 通过', level=0)